@@ -0,0 +1,109 @@
+"""
+Benchmark for `extract_json_fields` on synthetic risk evaluation results.
+
+Compares the bulk implementation with the previous row-by-row implementation
+(`iterrows` with per-cell `.loc` writes) and checks both produce the same output.
+
+Usage:
+    python -m benchmarks.bench_extract_json_fields
+    python -m benchmarks.bench_extract_json_fields --rows 10000 100000 --skip-legacy-above 20000
+"""
+
+import argparse
+import json
+import logging
+import random
+import time
+
+import pandas as pd
+
+from src.processing.json_processor import extract_json_fields
+
+_CRITERIA = [
+    'Data_Sensitivity', 'Scope_of_Impact', 'Configurational_Authority', 'External_Data_Exposure',
+    'Regulatory_Obligation', 'Segregation_of_Duties', 'Auditability', 'Reversibility'
+]
+_TIERS = ['General', 'Controlled', 'Sensitive', 'Restricted', 'Mission-Critical']
+
+_FIELDS = {
+    'risk_rating_tier': 'Risk Rating Tier',
+    'risk_rating_score': 'Risk Rating Score',
+    'weighted_score': 'Weighted Score',
+    'scores': 'Scores',
+    'rationale': 'Rationale',
+    'confidence': 'Confidence'
+}
+
+def make_results(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Builds a risk results DataFrame with fenced JSON evaluations like the LLM returns."""
+    rng = random.Random(seed)
+    evaluations = []
+    for i in range(rows):
+        tier = rng.randrange(5)
+        document = {
+            'risk_rating_tier': _TIERS[tier],
+            'risk_rating_score': str(tier + 1),
+            'weighted_score': round(rng.uniform(1, 5), 1),
+            'scores': {criterion: rng.randint(1, 5) for criterion in _CRITERIA},
+            'rationale': f"Permission {i} " + 'grants access to sensitive records. ' * 8,
+            'confidence': rng.choice(['High', 'Medium', 'Low'])
+        }
+        evaluations.append("```json\n" + json.dumps(document, indent=2) + "\n```")
+    return pd.DataFrame({
+        'Permission Name': [f"Permission {i}" for i in range(rows)],
+        'API Name': [f"Permission{i}" for i in range(rows)],
+        'Evaluation': evaluations
+    })
+
+def _clean_json_string_legacy(json_string: str) -> str:
+    for old, new in [("```json\n", ""), ("\n```", ""), ("```", ""), ("\n", "")]:
+        json_string = json_string.replace(old, new)
+    return json_string
+
+def extract_json_fields_legacy(df: pd.DataFrame, json_column: str = 'Evaluation') -> pd.DataFrame:
+    """The previous row-by-row implementation, kept as the baseline."""
+    results_df = df.copy()
+    for column in _FIELDS.values():
+        if column not in results_df.columns:
+            results_df[column] = None
+    results_df[json_column] = results_df[json_column].apply(_clean_json_string_legacy)
+    for index, row in results_df.iterrows():
+        eval_data = json.loads(row[json_column])
+        for json_key, df_column in _FIELDS.items():
+            value = eval_data.get(json_key, '')
+            if isinstance(value, (list, dict)):
+                value = str(value)
+            results_df.loc[index, df_column] = value
+    return results_df
+
+def _time(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--skip-legacy-above', type=int, default=None,
+                        help='Skip the slow baseline for row counts above this value')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'rows':>8} {'bulk (s)':>10} {'legacy (s)':>11} {'speedup':>8}")
+    for rows in args.rows:
+        df = make_results(rows)
+        bulk_df, bulk_time = _time(extract_json_fields, df, debug=False)
+
+        if args.skip_legacy_above is not None and rows > args.skip_legacy_above:
+            print(f"{rows:>8} {bulk_time:>10.2f} {'skipped':>11} {'':>8}")
+            continue
+
+        legacy_df, legacy_time = _time(extract_json_fields_legacy, df)
+        pd.testing.assert_frame_equal(
+            bulk_df[list(_FIELDS.values())].astype(str),
+            legacy_df[list(_FIELDS.values())].astype(str)
+        )
+        print(f"{rows:>8} {bulk_time:>10.2f} {legacy_time:>11.2f} {legacy_time / bulk_time:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
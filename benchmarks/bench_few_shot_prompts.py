@@ -0,0 +1,62 @@
+"""
+Benchmark of prompt sizes for the full and the compact few-shot templates.
+
+Renders the prompt of every permission with the current template and with the
+compact template filled by `FewShotSelector`, and reports characters and
+estimated tokens per call. With prior results of the stage (`--results`), the
+labeled permissions are split into an example pool and a held-out set, and the
+share of held-out permissions whose own label is among their examples is reported
+as well. Without them, placeholder labels are used and only sizes are measured.
+
+Usage:
+    python -m benchmarks.bench_few_shot_prompts
+    python -m benchmarks.bench_few_shot_prompts --stage cloud --k 5
+    python -m benchmarks.bench_few_shot_prompts --results data/output/category_results.csv
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.few_shot import STAGE_LABEL_COLUMNS, FewShotSelector, load_template, measure_prompt_sizes
+from src.processing.eval_schemas import extract_typed_fields
+
+_DEFAULT_INPUT = 'data/input/user_permission_reference_data__full_list.csv'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--stage', choices=['category', 'cloud'], default='category')
+    parser.add_argument('--input', default=_DEFAULT_INPUT, help='Permissions to render prompts for')
+    parser.add_argument('--results', help='Prior results of the stage with an Evaluation column')
+    parser.add_argument('--k', type=int, default=3, help='Examples per prompt')
+    parser.add_argument('--holdout', type=float, default=0.2, help='Share of labeled permissions held out')
+    args = parser.parse_args()
+
+    label_columns = STAGE_LABEL_COLUMNS[args.stage]
+    if args.results:
+        labeled_df = extract_typed_fields(pd.read_csv(args.results), args.stage, score_columns=False)
+        labeled_df = labeled_df.dropna(subset=label_columns).reset_index(drop=True)
+    else:
+        labeled_df = pd.read_csv(args.input).assign(**{col: 'UNLABELED' for col in label_columns})
+
+    held_out = np.random.default_rng(0).random(len(labeled_df)) < args.holdout
+    selector = FewShotSelector(labeled_df[~held_out], label_columns, k=args.k)
+    query_df = labeled_df[held_out] if args.results else labeled_df[held_out].drop(columns=label_columns)
+
+    full_template = load_template(f"prompt_user_perm_{args.stage}.md")
+    compact_template = load_template(f"prompt_user_perm_{args.stage}_compact.md")
+    sizes = measure_prompt_sizes(query_df, full_template, compact_template, selector)
+
+    full_tokens = sizes['Full Tokens'].mean()
+    compact_tokens = sizes['Compact Tokens'].mean()
+    print(f"stage: {args.stage}, k: {args.k}, permissions: {len(sizes)}, example pool: {len(selector.index)}")
+    print(f"{'template':>10} {'chars/call':>11} {'tokens/call':>12}")
+    print(f"{'full':>10} {sizes['Full Chars'].mean():>11.0f} {full_tokens:>12.0f}")
+    print(f"{'compact':>10} {sizes['Compact Chars'].mean():>11.0f} {compact_tokens:>12.0f}")
+    print(f"Input tokens saved per call: {1 - compact_tokens / full_tokens:.0%}")
+    if 'Label Covered' in sizes.columns:
+        print(f"Held-out permissions with their label among the examples: {sizes['Label Covered'].mean():.0%}")
+
+if __name__ == '__main__':
+    main()
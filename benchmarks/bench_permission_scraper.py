@@ -0,0 +1,73 @@
+"""
+Benchmark for the `extract_permission_data` parser backends on synthetic permission pages.
+
+Builds HTML shaped like a Salesforce user permission export (one table row per
+permission with a label, anchor, help bubble and description span), parses it with
+the html.parser and lxml backends and checks both return the same DataFrame.
+
+Usage:
+    python -m benchmarks.bench_permission_scraper
+    python -m benchmarks.bench_permission_scraper --rows 2000 20000
+"""
+
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from src.scraping.permission_scraper import extract_permission_data
+
+_ROW_TEMPLATE = '''
+<tr class="permRow">
+  <td class="labelCol"><label class="permRowLabel" for="perm{i}">{name}</label>
+    <a name="{api_name}"></a>
+    <div class="mouseOverInfoOuter"><img class="infoIcon" src="/s.gif" alt="">
+      <div class="mouseOverInfo"><div class="body">{requirement}</div></div>
+    </div>
+  </td>
+  <td class="pc_checkboxColumnWithIcons"><input type="checkbox" title="{api_name}" disabled="disabled"></td>
+  <td width="75%"><span class="permRowLabel">{description}</span></td>
+</tr>'''
+
+def make_page(rows: int, seed: int = 0) -> str:
+    """Builds a permission page with the given number of permission rows."""
+    rng = random.Random(seed)
+    words = ['records', 'reports', 'setup', 'users', 'data', 'apex', 'flows', 'objects', 'fields', 'cloud']
+    body = []
+    for i in range(rows):
+        phrase = ' '.join(rng.choice(words) for _ in range(3))
+        body.append(_ROW_TEMPLATE.format(
+            i=i,
+            name=f"Manage {phrase.title()} {i}",
+            api_name=f"Manage{phrase.title().replace(' ', '')}{i}",
+            requirement='Requires &quot;View Setup&quot; and ' + rng.choice(words),
+            description=f"Allows users to manage {phrase} &amp; related settings. " * rng.randint(1, 4)
+        ))
+    return (
+        '<html><head><title>Permissions</title></head><body><table class="detailList">'
+        '<tr><th>Label</th><th>API Name</th><th>Description</th></tr>'
+        + ''.join(body) + '</table></body></html>'
+    )
+
+def _time(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[2000, 10000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'size (MB)':>10} {'html.parser (s)':>16} {'lxml (s)':>9} {'speedup':>8}")
+    for rows in args.rows:
+        page = make_page(rows)
+        soup_df, soup_time = _time(extract_permission_data, page, parser='html.parser')
+        lxml_df, lxml_time = _time(extract_permission_data, page, parser='lxml')
+        pd.testing.assert_frame_equal(soup_df, lxml_df)
+        size = len(page.encode('utf-8')) / 1e6
+        print(f"{rows:>8} {size:>10.1f} {soup_time:>16.2f} {lxml_time:>9.2f} {soup_time / lxml_time:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,28 @@
 """
 Analysis module for risk classification and evaluation.
 """
- 
-__all__ = []  # Add any remaining analysis module exports here 
\ No newline at end of file
+
+from .assignment_engine import AssignmentEngine, pack_bits, unpack_bits
+from .sod_detector import ConflictDetector, load_conflict_rules, seed_conflict_rules
+from .similarity_index import SimilarityIndex
+from .few_shot import FewShotSelector, load_template, measure_prompt_sizes, render_prompt
+from .risk_rollup import RiskRollup, compute_weighted_scores, parse_criterion_weights, parse_score_tiers, score_ratings
+
+__all__ = [
+    'AssignmentEngine',
+    'pack_bits',
+    'unpack_bits',
+    'ConflictDetector',
+    'load_conflict_rules',
+    'seed_conflict_rules',
+    'RiskRollup',
+    'compute_weighted_scores',
+    'parse_criterion_weights',
+    'parse_score_tiers',
+    'score_ratings',
+    'SimilarityIndex',
+    'FewShotSelector',
+    'load_template',
+    'measure_prompt_sizes',
+    'render_prompt'
+]
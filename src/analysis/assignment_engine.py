@@ -0,0 +1,343 @@
+"""
+Bitset engine connecting users to the permissions they effectively hold.
+
+Users get permissions through the permission sets and profiles assigned to them. The
+engine interns every permission's normalized API Name to a bit position and stores
+each permission set as a packed row of 64-bit words, so a set with a thousand
+permissions takes 128 bytes. A user's effective permissions are the OR of the rows of
+their assigned sets, computed for all users at once with `np.bitwise_or.reduceat`
+over the assignment list sorted by user.
+
+Inputs are local exports:
+    - set memberships: one row per (permission set, permission), e.g. the output of
+      `extract_metadata_permissions` ('Permission Set', 'API Name')
+    - user assignments: one row per (user, permission set or profile), e.g. a
+      PermissionSetAssignment export joined with user profiles ('User', 'Permission Set')
+
+Example:
+    >>> engine = AssignmentEngine.from_files('data/input/user_assignments.csv',
+    ...                                      'data/output/permission_set_membership.csv')
+    >>> engine.users_with('ModifyAllData')
+    >>> engine.permission_user_counts().sort_values(ascending=False).head()
+"""
+
+import logging
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from ..scraping.permission_catalog import normalize_api_name
+from ..utils.data_utils import iter_data_chunks
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Bits per packed word
+WORD_BITS = 64
+
+def pack_bits(matrix: np.ndarray) -> np.ndarray:
+    """
+    Packs a boolean matrix into rows of little-endian 64-bit words.
+
+    Args:
+        matrix (np.ndarray): Boolean matrix of shape (rows, bits)
+
+    Returns:
+        np.ndarray: uint64 matrix of shape (rows, ceil(bits / 64)); bit j of a row is
+            bit j % 64 of word j // 64
+    """
+    matrix = np.asarray(matrix, dtype=bool)
+    n_words = max(1, -(-matrix.shape[1] // WORD_BITS))
+    packed = np.packbits(matrix, axis=1, bitorder='little')
+    padded = np.zeros((matrix.shape[0], n_words * 8), dtype=np.uint8)
+    padded[:, :packed.shape[1]] = packed
+    return padded.view('<u8')
+
+def unpack_bits(words: np.ndarray, n_bits: int) -> np.ndarray:
+    """
+    Unpacks rows of 64-bit words into a boolean matrix.
+
+    Args:
+        words (np.ndarray): uint64 matrix from `pack_bits`
+        n_bits (int): Number of bits per row
+
+    Returns:
+        np.ndarray: Boolean matrix of shape (rows, n_bits)
+    """
+    as_bytes = np.ascontiguousarray(words, dtype='<u8').view(np.uint8)
+    return np.unpackbits(as_bytes, axis=1, count=n_bits, bitorder='little').astype(bool)
+
+def _intern(values: pd.Series) -> tuple:
+    """Interns names by normalized key; returns codes and the first spelling of each name."""
+    codes, _ = pd.factorize(normalize_api_name(values))
+    # Codes follow first appearance, so the first index of each code is in code order
+    _, first_positions = np.unique(codes[codes >= 0], return_index=True)
+    names = values.astype(object).str.strip().to_numpy()[codes >= 0][first_positions]
+    return codes, list(names)
+
+def _enabled(values: pd.Series) -> pd.Series:
+    """Reads an 'Enabled' column as booleans, accepting bools, 0/1 and 'True'/'false' strings."""
+    return values.astype(str).str.strip().str.lower().isin(['true', '1'])
+
+class AssignmentEngine:
+    """
+    Packed bit matrices of permission sets and the users assigned to them.
+
+    Build it with `from_frames` or `from_files`. Permissions are columns (bit positions)
+    in the order they are first seen, permission sets and users are rows.
+
+    Args:
+        permissions (List[str]): API Name of each bit position
+        permission_sets (List[str]): Name of each permission set row
+        users (List[str]): Identifier of each user
+        set_bits (np.ndarray): uint64 matrix (permission sets x words)
+        user_ptr (np.ndarray): Offsets of each user's assignments in `assigned_sets`
+            (length users + 1)
+        assigned_sets (np.ndarray): Permission set rows assigned to users, grouped by user
+    """
+
+    def __init__(
+        self,
+        permissions: List[str],
+        permission_sets: List[str],
+        users: List[str],
+        set_bits: np.ndarray,
+        user_ptr: np.ndarray,
+        assigned_sets: np.ndarray
+    ):
+        self.permissions = list(permissions)
+        self.permission_sets = list(permission_sets)
+        self.users = list(users)
+        self.set_bits = set_bits
+        self.user_ptr = user_ptr
+        self.assigned_sets = assigned_sets
+
+        keys = normalize_api_name(pd.Series(self.permissions, dtype=object))
+        self._permission_lookup = {key: i for i, key in enumerate(keys)}
+        self._set_lookup = {name: i for i, name in enumerate(self.permission_sets)}
+        self._user_lookup = {user: i for i, user in enumerate(self.users)}
+        self._user_bits = None
+
+    @classmethod
+    def from_frames(
+        cls,
+        user_assignments: pd.DataFrame,
+        set_permissions: pd.DataFrame,
+        user_column: str = 'User',
+        set_column: str = 'Permission Set',
+        permission_column: str = 'API Name'
+    ) -> 'AssignmentEngine':
+        """
+        Builds the engine from assignment and membership DataFrames.
+
+        Args:
+            user_assignments (pd.DataFrame): One row per (user, permission set or profile)
+            set_permissions (pd.DataFrame): One row per (permission set, permission). Rows
+                whose 'Enabled' is False, 0 or 'false' (any case) are ignored when the
+                column is present
+            user_column (str): User identifier column of `user_assignments`
+            set_column (str): Permission set column of both DataFrames
+            permission_column (str): API Name column of `set_permissions`
+
+        Returns:
+            AssignmentEngine: The engine
+        """
+        if 'Enabled' in set_permissions.columns:
+            set_permissions = set_permissions[_enabled(set_permissions['Enabled'])]
+
+        permission_codes, permissions = _intern(set_permissions[permission_column])
+
+        # Permission sets from both inputs share one row index
+        set_names = pd.concat([set_permissions[set_column], user_assignments[set_column]], ignore_index=True)
+        set_codes, permission_sets = pd.factorize(set_names.astype(object).str.strip())
+        membership_set_codes = set_codes[:len(set_permissions)]
+        assignment_set_codes = set_codes[len(set_permissions):]
+
+        valid = (permission_codes >= 0) & (membership_set_codes >= 0)
+        dense = np.zeros((len(permission_sets), len(permissions)), dtype=bool)
+        dense[membership_set_codes[valid], permission_codes[valid]] = True
+        set_bits = pack_bits(dense)
+
+        user_codes, users = pd.factorize(user_assignments[user_column].astype(object).str.strip())
+        valid = (user_codes >= 0) & (assignment_set_codes >= 0)
+        pairs = np.unique(np.stack([user_codes[valid], assignment_set_codes[valid]], axis=1), axis=0)
+        counts = np.bincount(pairs[:, 0], minlength=len(users)) if len(pairs) else np.zeros(len(users), dtype=np.int64)
+        user_ptr = np.concatenate([[0], np.cumsum(counts)])
+
+        logger.info(f"Loaded {len(users)} users, {len(permission_sets)} permission sets, "
+                    f"{len(permissions)} permissions and {len(pairs)} assignments")
+        assigned_sets = pairs[:, 1] if len(pairs) else np.zeros(0, dtype=np.int64)
+        return cls(permissions, list(permission_sets), list(users), set_bits, user_ptr, assigned_sets)
+
+    @classmethod
+    def from_files(
+        cls,
+        assignments_path: Union[str, Path],
+        membership_path: Union[str, Path],
+        user_column: str = 'User',
+        set_column: str = 'Permission Set',
+        permission_column: str = 'API Name',
+        chunksize: int = 100000
+    ) -> 'AssignmentEngine':
+        """
+        Builds the engine from assignment and membership files.
+
+        Only the needed columns are read, in chunks (CSV, JSON Lines, Parquet or Arrow).
+
+        Args:
+            assignments_path (str): File with one row per (user, permission set or profile)
+            membership_path (str): File with one row per (permission set, permission)
+            user_column (str): User identifier column
+            set_column (str): Permission set column
+            permission_column (str): API Name column
+            chunksize (int): Rows read per chunk
+
+        Returns:
+            AssignmentEngine: The engine
+        """
+        assignments = pd.concat(iter_data_chunks(
+            assignments_path, chunksize=chunksize,
+            required_columns=[user_column, set_column], columns=[user_column, set_column]
+        ), ignore_index=True)
+
+        membership_columns = [set_column, permission_column]
+        membership_chunks = []
+        for chunk in iter_data_chunks(membership_path, chunksize=chunksize, required_columns=membership_columns):
+            if 'Enabled' in chunk.columns:
+                chunk = chunk[_enabled(chunk['Enabled'])]
+            membership_chunks.append(chunk[membership_columns])
+        membership = pd.concat(membership_chunks, ignore_index=True)
+
+        return cls.from_frames(assignments, membership, user_column, set_column, permission_column)
+
+    @property
+    def n_words(self) -> int:
+        return self.set_bits.shape[1]
+
+    def permission_position(self, api_name: str) -> int:
+        """
+        Returns the bit position of a permission.
+
+        Args:
+            api_name (str): API Name, matched case-insensitively
+
+        Returns:
+            int: Bit position
+
+        Raises:
+            KeyError: If the permission is not in any permission set
+        """
+        return self._permission_lookup[api_name.strip().casefold()]
+
+    def user_bits(self) -> np.ndarray:
+        """
+        Returns every user's effective permissions as packed words.
+
+        Computed once with a vectorized OR over each user's assigned permission sets and cached.
+
+        Returns:
+            np.ndarray: uint64 matrix (users x words)
+        """
+        if self._user_bits is None:
+            n_users = len(self.users)
+            bits = np.zeros((n_users, self.n_words), dtype=np.uint64)
+            counts = np.diff(self.user_ptr)
+            has_sets = counts > 0
+            if has_sets.any():
+                rows = self.set_bits[self.assigned_sets]
+                bits[has_sets] = np.bitwise_or.reduceat(rows, self.user_ptr[:-1][has_sets], axis=0)
+            self._user_bits = bits
+        return self._user_bits
+
+    def user_matrix(self, users: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        Returns effective permissions as a boolean matrix (users x permissions).
+
+        Args:
+            users (Sequence[int], optional): User rows to unpack. Defaults to all users
+
+        Returns:
+            np.ndarray: Boolean matrix
+        """
+        bits = self.user_bits() if users is None else self.user_bits()[np.asarray(users)]
+        return unpack_bits(bits, len(self.permissions))
+
+    def set_matrix(self) -> np.ndarray:
+        """
+        Returns permission set memberships as a boolean matrix (permission sets x permissions).
+
+        Returns:
+            np.ndarray: Boolean matrix
+        """
+        return unpack_bits(self.set_bits, len(self.permissions))
+
+    def _holders(self, bits: np.ndarray, api_name: str) -> np.ndarray:
+        position = self.permission_position(api_name)
+        word, bit = divmod(position, WORD_BITS)
+        return ((bits[:, word] >> np.uint64(bit)) & np.uint64(1)) == 1
+
+    def users_with(self, api_name: str) -> List[str]:
+        """
+        Lists the users effectively holding a permission.
+
+        Args:
+            api_name (str): API Name of the permission
+
+        Returns:
+            List[str]: User identifiers
+        """
+        return [self.users[i] for i in np.flatnonzero(self._holders(self.user_bits(), api_name))]
+
+    def sets_with(self, api_name: str) -> List[str]:
+        """
+        Lists the permission sets and profiles granting a permission.
+
+        Args:
+            api_name (str): API Name of the permission
+
+        Returns:
+            List[str]: Permission set names
+        """
+        return [self.permission_sets[i] for i in np.flatnonzero(self._holders(self.set_bits, api_name))]
+
+    def effective_permissions(self, user: str) -> List[str]:
+        """
+        Lists the permissions a user effectively holds.
+
+        Args:
+            user (str): User identifier
+
+        Returns:
+            List[str]: API Names in bit order
+        """
+        row = self.user_bits()[self._user_lookup[user]][np.newaxis, :]
+        return [self.permissions[i] for i in np.flatnonzero(unpack_bits(row, len(self.permissions))[0])]
+
+    def set_permissions(self, permission_set: str) -> List[str]:
+        """
+        Lists the permissions a permission set or profile grants.
+
+        Args:
+            permission_set (str): Permission set name
+
+        Returns:
+            List[str]: API Names in bit order
+        """
+        row = self.set_bits[self._set_lookup[permission_set]][np.newaxis, :]
+        return [self.permissions[i] for i in np.flatnonzero(unpack_bits(row, len(self.permissions))[0])]
+
+    def permission_user_counts(self) -> pd.Series:
+        """
+        Counts the users effectively holding each permission.
+
+        Returns:
+            pd.Series: User count indexed by API Name
+        """
+        counts = np.zeros(len(self.permissions), dtype=np.int64)
+        bits = self.user_bits()
+        # Unpack in blocks of users to bound memory
+        for start in range(0, len(self.users), 65536):
+            counts += unpack_bits(bits[start:start + 65536], len(self.permissions)).sum(axis=0)
+        return pd.Series(counts, index=pd.Index(self.permissions, name='API Name'), name='Users')
@@ -0,0 +1,304 @@
+"""
+Retrieval-based few-shot example selection for the classification prompts.
+
+The category and cloud templates carry a long definition of every label in every
+call (about 16 KB each). The compact templates (`prompt_user_perm_category_compact.md`,
+`prompt_user_perm_cloud_compact.md`) keep the rubric and output schema but shorten
+the definitions to one sentence and add a `{few_shot_examples}` placeholder. The
+selector fills it per permission with the k most similar already-labeled
+permissions from prior outputs, found with the TF-IDF `SimilarityIndex`.
+
+`measure_prompt_sizes` compares the rendered prompts of the full and compact
+templates over the same permissions, and reports how often the known label of a
+permission appears among its retrieved examples.
+
+Example:
+    >>> selector = FewShotSelector.from_results(category_results_df, 'category', k=3)
+    >>> compact_prompt = load_template('prompt_user_perm_category_compact.md')
+    >>> results = classify_category(df, compact_prompt, client=client, few_shot=selector)
+    >>> sizes_df = measure_prompt_sizes(df, full_prompt, compact_prompt, selector)
+    >>> sizes_df[['Full Tokens', 'Compact Tokens']].sum()
+"""
+
+import logging
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .similarity_index import SimilarityIndex, TEXT_COLUMNS
+from ..llms.prompt_utils import FEW_SHOT_PLACEHOLDER, NO_EXAMPLES_TEXT
+from ..processing.eval_schemas import TEMPLATES_DIR, extract_typed_fields
+from ..scraping.permission_catalog import normalize_api_name
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Label columns shown in the examples of each stage, as extracted by `extract_typed_fields`
+STAGE_LABEL_COLUMNS = {
+    'category': ['Permission Category Label'],
+    'cloud': ['Permission Cloud Label'],
+    'risk': ['Risk Rating Tier']
+}
+
+# Rough characters per token of English prompt text, for size estimates without a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Template variables filled from each permission record
+_PROMPT_FIELDS = {
+    'permission_name': 'Permission Name',
+    'permission_api_name': 'API Name',
+    'permission_description': 'Description',
+    'permission_expanded_description': 'Expanded Description'
+}
+
+def load_template(template_name: str) -> str:
+    """
+    Reads a prompt template from the templates directory.
+
+    Args:
+        template_name (str): File name, e.g. 'prompt_user_perm_category_compact.md'
+
+    Returns:
+        str: Template text
+    """
+    return (TEMPLATES_DIR / template_name).read_text(encoding='utf-8')
+
+def _escape(text: str) -> str:
+    """Escapes braces so text survives the template's str.format call."""
+    return text.replace('{', '{{').replace('}', '}}')
+
+def _text(value) -> str:
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return ''
+    return str(value).strip()
+
+class FewShotSelector:
+    """
+    Picks the most similar labeled permissions as prompt examples.
+
+    Args:
+        labeled_df (pd.DataFrame): Labeled permissions with the text columns and `label_columns`;
+            rows missing a label are skipped
+        label_columns (List[str]): Columns shown as each example's answer
+        k (int): Examples per prompt
+        text_columns (Sequence[str]): Columns used for similarity
+        key_column (str): Identifier column; a permission is never its own example
+        min_similarity (float): Minimum cosine similarity of an example
+        max_description_chars (int): Length the example descriptions are cut to
+
+    Raises:
+        ValueError: If a label column is missing
+    """
+
+    def __init__(
+        self,
+        labeled_df: pd.DataFrame,
+        label_columns: List[str],
+        k: int = 3,
+        text_columns: Sequence[str] = TEXT_COLUMNS,
+        key_column: str = 'API Name',
+        min_similarity: float = 0.0,
+        max_description_chars: int = 300
+    ):
+        missing = [col for col in label_columns if col not in labeled_df.columns]
+        if missing:
+            raise ValueError(f"Labeled DataFrame missing label columns: {missing}")
+        labeled_df = labeled_df.dropna(subset=label_columns)
+
+        self.label_columns = list(label_columns)
+        self.k = k
+        self.key_column = key_column
+        self.min_similarity = min_similarity
+        self.max_description_chars = max_description_chars
+        self.index = SimilarityIndex(labeled_df, text_columns=text_columns, key_column=key_column)
+        self._keys = normalize_api_name(self.index.labeled_df[key_column]).to_numpy(dtype=object) \
+            if key_column in self.index.labeled_df.columns else np.full(len(self.index), None, dtype=object)
+
+    @classmethod
+    def from_results(cls, results_df: pd.DataFrame, stage: str, **options) -> 'FewShotSelector':
+        """
+        Builds a selector from a stage's prior results.
+
+        The evaluation JSON is extracted with `extract_typed_fields` and its label field
+        becomes the example answer, so labels read as in the template (e.g. 'Data Admin').
+
+        Args:
+            results_df (pd.DataFrame): Results DataFrame of the stage with an 'Evaluation' column
+            stage (str): 'category', 'cloud' or 'risk'
+            **options: `FewShotSelector` options, e.g. `k=5`
+
+        Returns:
+            FewShotSelector: The selector
+        """
+        typed_df = extract_typed_fields(results_df, stage, score_columns=False)
+        return cls(typed_df, STAGE_LABEL_COLUMNS[stage], **options)
+
+    def select_many(self, df: pd.DataFrame) -> List[pd.DataFrame]:
+        """
+        Selects the examples of every row.
+
+        Args:
+            df (pd.DataFrame): Permissions with the text columns
+
+        Returns:
+            List[pd.DataFrame]: Up to k labeled rows per input row, most similar first,
+                with a 'Similarity' column
+        """
+        # One extra neighbor leaves room for dropping the permission itself
+        matches = self.index.nearest(df, k=self.k + 1)
+        if matches.empty:
+            return [self.index.labeled_df.iloc[:0].assign(Similarity=[]) for _ in range(len(df))]
+
+        keep = (matches['Similarity'] >= self.min_similarity).to_numpy() & (matches['Similarity'] > 0).to_numpy()
+        if self.key_column in df.columns:
+            query_keys = normalize_api_name(df[self.key_column]).to_numpy(dtype=object)[matches['Query']]
+            keep &= query_keys != self._keys[matches['Neighbor']]
+        matches = matches[keep]
+        matches = matches[matches.groupby('Query').cumcount() < self.k]
+
+        grouped = dict(tuple(matches.groupby('Query')))
+        examples = []
+        for query in range(len(df)):
+            rows = grouped.get(query)
+            if rows is None:
+                examples.append(self.index.labeled_df.iloc[:0].assign(Similarity=[]))
+                continue
+            selected = self.index.labeled_df.iloc[rows['Neighbor'].to_numpy()]
+            examples.append(selected.assign(Similarity=rows['Similarity'].to_numpy()))
+        return examples
+
+    def select(self, record: pd.Series) -> pd.DataFrame:
+        """
+        Selects the examples of one permission.
+
+        Args:
+            record (pd.Series): Permission with the text columns
+
+        Returns:
+            pd.DataFrame: Up to k labeled rows, most similar first
+        """
+        return self.select_many(record.to_frame().T)[0]
+
+    def format_examples(self, examples: pd.DataFrame) -> str:
+        """
+        Renders examples as the markdown list inserted into the prompt.
+
+        Args:
+            examples (pd.DataFrame): Rows from `select`
+
+        Returns:
+            str: Numbered examples, or `NO_EXAMPLES_TEXT`
+        """
+        if examples.empty:
+            return NO_EXAMPLES_TEXT
+        blocks = []
+        for number, (_, row) in enumerate(examples.iterrows(), start=1):
+            description = _text(row.get('Description')) or _text(row.get('Expanded Description'))
+            if len(description) > self.max_description_chars:
+                description = description[:self.max_description_chars].rstrip() + '...'
+            lines = [f"{number}. **Permission Name:** {_text(row.get('Permission Name'))}"]
+            if description:
+                lines.append(f"   **Permission Description:** {description}")
+            for col in self.label_columns:
+                lines.append(f"   **{col}:** {_text(row.get(col))}")
+            blocks.append('\n'.join(lines))
+        return '\n'.join(blocks)
+
+    def fill_prompt(self, template: str, record: pd.Series) -> str:
+        """
+        Inserts the examples of a permission into a template's `{few_shot_examples}` placeholder.
+
+        The result is still a template: the permission fields are filled by the evaluator.
+
+        Args:
+            template (str): Prompt template with the placeholder
+            record (pd.Series): Permission being classified
+
+        Returns:
+            str: Template with the examples in place
+        """
+        return template.replace(FEW_SHOT_PLACEHOLDER, _escape(self.format_examples(self.select(record))))
+
+def render_prompt(template: str, record: pd.Series, selector: Optional[FewShotSelector] = None, examples: Optional[pd.DataFrame] = None) -> str:
+    """
+    Renders the prompt sent for one permission.
+
+    Args:
+        template (str): Prompt template
+        record (pd.Series): Permission with the 'Permission Name', 'API Name',
+            'Description' and 'Expanded Description' fields (missing fields render empty)
+        selector (FewShotSelector, optional): Selector filling `{few_shot_examples}`
+        examples (pd.DataFrame, optional): Already selected examples for `record`
+
+    Returns:
+        str: The prompt text
+    """
+    if FEW_SHOT_PLACEHOLDER in template:
+        if selector is not None:
+            if examples is None:
+                examples = selector.select(record)
+            text = selector.format_examples(examples)
+        else:
+            text = NO_EXAMPLES_TEXT
+        template = template.replace(FEW_SHOT_PLACEHOLDER, _escape(text))
+    return template.format(**{field: _text(record.get(column)) for field, column in _PROMPT_FIELDS.items()})
+
+def measure_prompt_sizes(
+    df: pd.DataFrame,
+    full_template: str,
+    compact_template: str,
+    selector: FewShotSelector
+) -> pd.DataFrame:
+    """
+    Compares the prompts of the full and the compact few-shot template.
+
+    Token counts are estimated as characters / `CHARS_PER_TOKEN`. When `df` carries the
+    selector's label columns (e.g. held-out labeled permissions), 'Label Covered' tells
+    whether the permission's own label is among its examples, a cheap proxy for whether
+    the compact prompt still shows the model the right answer's neighborhood.
+
+    Args:
+        df (pd.DataFrame): Permissions to render prompts for
+        full_template (str): Current template, e.g. prompt_user_perm_category.md
+        compact_template (str): Compact template with `{few_shot_examples}`
+        selector (FewShotSelector): Example selector
+
+    Returns:
+        pd.DataFrame: Per permission 'API Name', 'Full Chars', 'Compact Chars', 'Full Tokens',
+            'Compact Tokens', 'Examples' and, with labels, 'Label Covered'
+    """
+    examples = selector.select_many(df)
+    records = [row for _, row in df.iterrows()]
+    full_chars = np.array([len(render_prompt(full_template, record)) for record in records], dtype=np.int64)
+    compact_chars = np.array([
+        len(render_prompt(compact_template, record, selector, selected))
+        for record, selected in zip(records, examples)
+    ], dtype=np.int64)
+
+    sizes = pd.DataFrame({
+        'API Name': df['API Name'].to_numpy(dtype=object) if 'API Name' in df.columns else None,
+        'Full Chars': full_chars,
+        'Compact Chars': compact_chars,
+        'Full Tokens': -(-full_chars // CHARS_PER_TOKEN),
+        'Compact Tokens': -(-compact_chars // CHARS_PER_TOKEN),
+        'Examples': [len(selected) for selected in examples]
+    })
+    if all(col in df.columns for col in selector.label_columns):
+        sizes['Label Covered'] = [
+            _covers(record, selected, selector.label_columns) for record, selected in zip(records, examples)
+        ]
+
+    saved = 1 - sizes['Compact Chars'].sum() / max(sizes['Full Chars'].sum(), 1)
+    logger.info(f"Compact prompts are {saved:.0%} smaller over {len(sizes)} permissions")
+    return sizes
+
+def _covers(record: pd.Series, examples: pd.DataFrame, label_columns: List[str]) -> bool:
+    """Whether any example carries the record's labels."""
+    if examples.empty:
+        return False
+    labels = {col: _text(record.get(col)).casefold() for col in label_columns}
+    matches = np.ones(len(examples), dtype=bool)
+    for col, label in labels.items():
+        matches &= examples[col].map(lambda value: _text(value).casefold() == label).to_numpy()
+    return bool(matches.any())
@@ -0,0 +1,359 @@
+"""
+Local risk scoring and vectorized risk roll-ups.
+
+The risk stage returns a 1-5 score per criterion and a `weighted_score` that the
+model computes from the "Criterion Weights" table of the risk prompt template.
+Recomputing that score locally from the extracted criterion scores makes the weights
+a policy setting instead of a prompt change: a what-if on the weights re-scores the
+whole catalog with one matrix-vector product and no model calls.
+
+Permission scores then roll up to permission sets and users through the packed
+assignment matrices of an `AssignmentEngine`:
+
+    score sum = (holders x permissions) @ (permissions,)
+    max       = row-wise max over held scores
+    top-k     = mean of the k highest held scores (np.partition)
+
+Example:
+    >>> risk_df = extract_typed_fields(risk_results_df, 'risk')
+    >>> rollup = RiskRollup(engine, risk_df)
+    >>> rollup.user_rollup().sort_values('Max Score', ascending=False).head()
+    >>> what_if = rollup.with_weights({**rollup.weights, 'External_Data_Exposure': 0.3})
+"""
+
+import re
+import copy
+import logging
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .assignment_engine import AssignmentEngine, unpack_bits
+from ..processing.eval_schemas import TEMPLATES_DIR
+from ..scraping.permission_catalog import normalize_api_name
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Risk prompt template holding the weights and the score rubric
+RISK_TEMPLATE_PATH = TEMPLATES_DIR / 'prompt_user_perm_risk_rating.md'
+
+# Decimal places of the weighted score, as instructed in the template
+SCORE_DECIMALS = 1
+
+def _markdown_tables(text: str) -> List[Tuple[List[str], List[List[str]]]]:
+    """Returns the header and body rows of every markdown table in a text."""
+    tables = []
+    lines = text.splitlines()
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        is_separator = i + 1 < len(lines) and re.fullmatch(r'\|[\s:|-]+\|', lines[i + 1].strip())
+        if line.startswith('|') and is_separator:
+            header = [cell.strip() for cell in line.strip('|').split('|')]
+            rows = []
+            i += 2
+            while i < len(lines) and lines[i].strip().startswith('|'):
+                rows.append([cell.strip() for cell in lines[i].strip().strip('|').split('|')])
+                i += 1
+            tables.append((header, rows))
+        else:
+            i += 1
+    return tables
+
+def _find_table(template_path: Union[str, Path], columns: List[str]) -> List[Dict[str, str]]:
+    text = Path(template_path).read_text(encoding='utf-8')
+    for header, rows in _markdown_tables(text):
+        if all(column in header for column in columns):
+            return [dict(zip(header, row)) for row in rows]
+    raise ValueError(f"No table with columns {columns} found in {template_path}")
+
+def parse_criterion_weights(template_path: Union[str, Path] = RISK_TEMPLATE_PATH) -> pd.Series:
+    """
+    Parses the criterion weights table of a prompt template.
+
+    Args:
+        template_path (str): Prompt template with a "| Criterion | Weight |" table
+
+    Returns:
+        pd.Series: Weight indexed by criterion name, in template order
+
+    Raises:
+        ValueError: If the template has no weights table
+    """
+    rows = _find_table(template_path, ['Criterion', 'Weight'])
+    weights = pd.Series(
+        [float(row['Weight']) for row in rows],
+        index=pd.Index([row['Criterion'] for row in rows], name='Criterion'),
+        name='Weight'
+    )
+    return weights
+
+def parse_score_tiers(template_path: Union[str, Path] = RISK_TEMPLATE_PATH) -> pd.DataFrame:
+    """
+    Parses the rubric mapping weighted scores to risk ratings.
+
+    Args:
+        template_path (str): Prompt template with a "| Weighted Score Range | Risk Rating |
+            Risk Rating Tier |" table
+
+    Returns:
+        pd.DataFrame: 'Lower Bound', 'Risk Rating' and 'Risk Rating Tier', lowest tier first
+
+    Raises:
+        ValueError: If the template has no rubric table
+    """
+    rows = _find_table(template_path, ['Weighted Score Range', 'Risk Rating', 'Risk Rating Tier'])
+    tiers = pd.DataFrame({
+        'Lower Bound': [float(re.search(r'\d+(?:\.\d+)?', row['Weighted Score Range']).group(0)) for row in rows],
+        'Risk Rating': [int(row['Risk Rating']) for row in rows],
+        'Risk Rating Tier': [row['Risk Rating Tier'] for row in rows]
+    })
+    return tiers.sort_values('Lower Bound', kind='stable').reset_index(drop=True)
+
+def _weight_vector(weights: Optional[Mapping[str, float]]) -> pd.Series:
+    if weights is None:
+        return parse_criterion_weights()
+    weights = pd.Series(dict(weights), dtype='float64', name='Weight')
+    weights.index.name = 'Criterion'
+    if (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError("Criterion weights must be non-negative with a positive total")
+    return weights
+
+def _weighted_scores(scores: np.ndarray, weights: np.ndarray, decimals: int) -> np.ndarray:
+    """Weighted mean of each row's scores; criteria missing in a row are left out."""
+    present = ~np.isnan(scores)
+    totals = np.where(present, scores, 0) @ weights
+    weight_totals = present @ weights
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weighted = np.where(weight_totals > 0, totals / weight_totals, np.nan)
+    # Round half up like the template's "round to one decimal place"; the epsilon absorbs float error
+    scale = 10 ** decimals
+    return np.floor(weighted * scale + 0.5 + 1e-9) / scale
+
+def score_ratings(weighted_scores: Union[pd.Series, np.ndarray], tiers: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Maps weighted scores to risk ratings with the template rubric.
+
+    Args:
+        weighted_scores (pd.Series): Weighted scores on the 1-5 scale
+        tiers (pd.DataFrame, optional): Rubric from `parse_score_tiers`. Defaults to the
+            risk template's rubric
+
+    Returns:
+        pd.DataFrame: 'Risk Rating Score' (nullable Int16) and 'Risk Rating Tier'
+            (ordered categorical, lowest tier first); missing for scores below the rubric
+    """
+    tiers = parse_score_tiers() if tiers is None else tiers
+    index = weighted_scores.index if isinstance(weighted_scores, pd.Series) else None
+    values = np.asarray(weighted_scores, dtype='float64')
+    positions = np.searchsorted(tiers['Lower Bound'].to_numpy(), values, side='right') - 1
+    valid = ~np.isnan(values) & (positions >= 0)
+
+    ratings = pd.array(np.where(valid, tiers['Risk Rating'].to_numpy()[positions.clip(0)], 0), dtype='Int16')
+    ratings[~valid] = pd.NA
+    labels = list(tiers['Risk Rating Tier'])
+    codes = np.where(valid, positions, -1)
+    return pd.DataFrame({
+        'Risk Rating Score': ratings,
+        'Risk Rating Tier': pd.Categorical.from_codes(codes, categories=labels, ordered=True)
+    }, index=index)
+
+def compute_weighted_scores(
+    risk_df: pd.DataFrame,
+    weights: Optional[Mapping[str, float]] = None,
+    tiers: Optional[pd.DataFrame] = None,
+    decimals: int = SCORE_DECIMALS
+) -> pd.DataFrame:
+    """
+    Computes the weighted risk score and rating of each permission from its criterion scores.
+
+    Weights are normalized to sum to one, so the score stays on the 1-5 scale and a
+    weight of zero drops a criterion. A criterion missing for a permission is left out
+    of that permission's weighted mean.
+
+    Args:
+        risk_df (pd.DataFrame): Risk results with one numeric column per criterion, e.g.
+            from `extract_typed_fields(df, 'risk')`
+        weights (Mapping[str, float], optional): Weight of each criterion. Defaults to
+            the template's Criterion Weights table
+        tiers (pd.DataFrame, optional): Rubric from `parse_score_tiers`
+        decimals (int): Decimal places of the weighted score
+
+    Returns:
+        pd.DataFrame: 'Weighted Score', 'Risk Rating Score' and 'Risk Rating Tier' with
+            the index of `risk_df`
+
+    Raises:
+        ValueError: If criterion columns are missing or the weights are invalid
+
+    Example:
+        >>> risk_df = extract_typed_fields(risk_results_df, 'risk')
+        >>> local_df = compute_weighted_scores(risk_df, weights={**default_weights, 'Auditability': 0.2})
+        >>> (local_df['Risk Rating Tier'] != risk_df['Risk Rating Tier']).sum()
+    """
+    weights = _weight_vector(weights)
+    missing = [criterion for criterion in weights.index if criterion not in risk_df.columns]
+    if missing:
+        raise ValueError(f"Missing criterion score columns: {missing}")
+
+    scores = risk_df[list(weights.index)].apply(pd.to_numeric, errors='coerce').to_numpy(dtype='float64')
+    weighted = _weighted_scores(scores, weights.to_numpy(), decimals)
+    ratings = score_ratings(pd.Series(weighted, index=risk_df.index), tiers)
+    return pd.concat([pd.Series(weighted, index=risk_df.index, name='Weighted Score'), ratings], axis=1)
+
+class RiskRollup:
+    """
+    Rolls permission risk scores up to permission sets and users.
+
+    Criterion scores are aligned to the engine's permissions once; changing the weights
+    with `with_weights` only redoes the weighted sums. Permissions without a risk result
+    score zero and do not count as scored.
+
+    Args:
+        engine (AssignmentEngine): Assignments to roll up over
+        risk_df (pd.DataFrame): Risk results with 'API Name' and one numeric column per criterion
+        weights (Mapping[str, float], optional): Weight of each criterion. Defaults to
+            the template's Criterion Weights table
+        api_column (str): API Name column of `risk_df`
+        decimals (int): Decimal places of the weighted score
+
+    Raises:
+        ValueError: If criterion columns are missing or the weights are invalid
+    """
+
+    def __init__(
+        self,
+        engine: AssignmentEngine,
+        risk_df: pd.DataFrame,
+        weights: Optional[Mapping[str, float]] = None,
+        api_column: str = 'API Name',
+        decimals: int = SCORE_DECIMALS
+    ):
+        self.engine = engine
+        self.decimals = decimals
+        weights = _weight_vector(weights)
+        missing = [criterion for criterion in weights.index if criterion not in risk_df.columns]
+        if missing:
+            raise ValueError(f"Missing criterion score columns: {missing}")
+
+        # Align the last result of each permission to the engine's bit positions
+        keys = normalize_api_name(risk_df[api_column])
+        results = risk_df.assign(_key=keys.to_numpy()).dropna(subset=['_key']).drop_duplicates('_key', keep='last')
+        engine_keys = normalize_api_name(pd.Series(engine.permissions, dtype=object))
+        aligned = results.set_index('_key')[list(weights.index)].reindex(engine_keys.to_numpy())
+        self.criterion_scores = aligned.apply(pd.to_numeric, errors='coerce').to_numpy(dtype='float64')
+
+        unscored = int(np.isnan(self.criterion_scores).all(axis=1).sum())
+        if unscored:
+            logger.info(f"{unscored} of {len(engine.permissions)} permissions have no risk scores")
+        self._set_weights(weights)
+
+    def _set_weights(self, weights: pd.Series) -> None:
+        self.weights = weights.to_dict()
+        self.permission_scores = _weighted_scores(self.criterion_scores, weights.to_numpy(), self.decimals)
+        self._scores = np.nan_to_num(self.permission_scores, nan=0.0).astype(np.float32)
+
+    def with_weights(self, weights: Mapping[str, float]) -> 'RiskRollup':
+        """
+        Returns a roll-up re-scored with other criterion weights, sharing the aligned scores.
+
+        Args:
+            weights (Mapping[str, float]): Weight of each criterion
+
+        Returns:
+            RiskRollup: The re-scored roll-up
+
+        Raises:
+            ValueError: If a criterion has no scores or the weights are invalid
+        """
+        weights = _weight_vector(weights)
+        unknown = set(weights.index) - set(self.weights)
+        if unknown:
+            raise ValueError(f"No scores for criteria: {sorted(unknown)}")
+        rollup = copy.copy(self)
+        positions = [list(self.weights).index(criterion) for criterion in weights.index]
+        rollup.criterion_scores = self.criterion_scores[:, positions]
+        rollup._set_weights(weights)
+        return rollup
+
+    def permission_risk(self) -> pd.DataFrame:
+        """
+        Returns the weighted score and rating of every permission in the engine.
+
+        Returns:
+            pd.DataFrame: 'Weighted Score', 'Risk Rating Score' and 'Risk Rating Tier'
+                indexed by API Name
+        """
+        index = pd.Index(self.engine.permissions, name='API Name')
+        weighted = pd.Series(self.permission_scores, index=index, name='Weighted Score')
+        return pd.concat([weighted, score_ratings(weighted)], axis=1)
+
+    def _rollup(self, bits: np.ndarray, names: List[str], index_name: str, top_k: int, block_size: int) -> pd.DataFrame:
+        n_holders = len(bits)
+        n_permissions = len(self.engine.permissions)
+        k = max(1, min(top_k, n_permissions)) if n_permissions else 0
+        scored = (self._scores > 0).astype(np.float32)
+
+        max_scores = np.zeros(n_holders, dtype=np.float32)
+        max_positions = np.full(n_holders, -1, dtype=np.int64)
+        sums = np.zeros(n_holders, dtype=np.float32)
+        counts = np.zeros(n_holders, dtype=np.float32)
+        top_sums = np.zeros(n_holders, dtype=np.float32)
+        for start in range(0, n_holders, block_size):
+            held = unpack_bits(bits[start:start + block_size], n_permissions).astype(np.float32)
+            end = start + len(held)
+            sums[start:end] = held @ self._scores
+            counts[start:end] = held @ scored
+            if not k:
+                continue
+            held_scores = held * self._scores
+            max_positions[start:end] = held_scores.argmax(axis=1)
+            max_scores[start:end] = held_scores.max(axis=1)
+            top_sums[start:end] = np.partition(held_scores, n_permissions - k, axis=1)[:, n_permissions - k:].sum(axis=1)
+
+        permissions = np.array(self.engine.permissions + [None], dtype=object)
+        has_score = max_scores > 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            top_means = np.where(has_score, top_sums / np.minimum(counts, k), np.nan)
+
+        df = pd.DataFrame({
+            'Scored Permissions': counts.astype(np.int64),
+            'Max Score': np.where(has_score, self.permission_scores[max_positions.clip(0)], np.nan),
+            'Max Permission': permissions[np.where(has_score, max_positions, -1)],
+            'Score Sum': np.round(sums.astype('float64'), self.decimals),
+            f"Top {top_k} Mean": np.round(top_means.astype('float64'), self.decimals)
+        }, index=pd.Index(names, name=index_name))
+        ratings = score_ratings(df['Max Score'])
+        df['Max Risk Rating'] = ratings['Risk Rating Score']
+        df['Max Risk Rating Tier'] = ratings['Risk Rating Tier']
+        return df
+
+    def set_rollup(self, top_k: int = 3, block_size: int = 16384) -> pd.DataFrame:
+        """
+        Rolls permission scores up to every permission set and profile.
+
+        Args:
+            top_k (int): Number of highest scores averaged in the 'Top k Mean' column
+            block_size (int): Permission sets unpacked per matrix product, bounding memory
+
+        Returns:
+            pd.DataFrame: 'Scored Permissions', 'Max Score', 'Max Permission', 'Score Sum',
+                'Top k Mean', 'Max Risk Rating' and 'Max Risk Rating Tier' indexed by Permission Set
+        """
+        return self._rollup(self.engine.set_bits, self.engine.permission_sets, 'Permission Set', top_k, block_size)
+
+    def user_rollup(self, top_k: int = 3, block_size: int = 16384) -> pd.DataFrame:
+        """
+        Rolls permission scores up to every user's effective permissions.
+
+        Args:
+            top_k (int): Number of highest scores averaged in the 'Top k Mean' column
+            block_size (int): Users unpacked per matrix product, bounding memory
+
+        Returns:
+            pd.DataFrame: The columns of `set_rollup` indexed by User
+        """
+        return self._rollup(self.engine.user_bits(), self.engine.users, 'User', top_k, block_size)
@@ -0,0 +1,189 @@
+"""
+TF-IDF similarity index over permission texts for classification reuse.
+
+Many permissions are near-duplicates of each other, e.g. the "Allows user access
+to ..." family, yet every one of them is sent to the model on its own. The index
+vectorizes the name, description and expanded description of already-classified
+permissions with TF-IDF and answers nearest-neighbor queries by cosine similarity
+(a sparse matrix product of L2-normalized rows). A permission whose nearest
+classified neighbor is at least as similar as a threshold can take over that
+neighbor's result instead of calling the model:
+
+    - in a classification job, pass `reuse_index=index` (and optionally
+      `reuse_threshold`) to `classify_risk_rating`, `classify_category` or
+      `classify_cloud`; reused rows name their source in a 'Reused From' column
+    - up front, `propagate` splits permissions into rows answered by a neighbor
+      and rows still needing the model
+
+Example:
+    >>> index = SimilarityIndex(risk_results_df)
+    >>> index.nearest(unlabeled_df, k=3)
+    >>> reused_df, remaining_df = index.propagate(unlabeled_df, ['Risk Rating', 'Evaluation'], threshold=0.9)
+"""
+
+import logging
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Permission columns combined into the indexed text
+TEXT_COLUMNS = ['Permission Name', 'Description', 'Expanded Description']
+
+# Cosine similarity above which a neighbor's result is reused by default
+DEFAULT_REUSE_THRESHOLD = 0.9
+
+def _document_text(df: pd.DataFrame, text_columns: Sequence[str]) -> pd.Series:
+    """Joins the available text columns of each row into one document."""
+    columns = [col for col in text_columns if col in df.columns]
+    if not columns:
+        raise ValueError(f"DataFrame has none of the text columns {list(text_columns)}")
+    parts = df[columns].astype(object).where(df[columns].notna(), '').astype(str)
+    return parts.apply(lambda row: ' '.join(value.strip() for value in row if value.strip()), axis=1)
+
+class SimilarityIndex:
+    """
+    Nearest-neighbor index of classified permissions by TF-IDF cosine similarity.
+
+    Rows whose 'Evaluation' is an error ("Error: ...") are not indexed, so failures
+    are never reused.
+
+    Args:
+        labeled_df (pd.DataFrame): Classified permissions, e.g. a stage's results DataFrame
+        text_columns (Sequence[str]): Columns combined into the indexed text; missing columns are skipped
+        key_column (str): Identifier column reported for neighbors
+        **vectorizer_options: `TfidfVectorizer` options. Defaults to word unigrams and
+            bigrams with sublinear term frequency
+
+    Raises:
+        ValueError: If `labeled_df` has none of the text columns
+    """
+
+    def __init__(
+        self,
+        labeled_df: pd.DataFrame,
+        text_columns: Sequence[str] = TEXT_COLUMNS,
+        key_column: str = 'API Name',
+        **vectorizer_options
+    ):
+        if 'Evaluation' in labeled_df.columns:
+            is_error = labeled_df['Evaluation'].astype(str).str.startswith('Error: ')
+            labeled_df = labeled_df[~is_error.to_numpy()]
+        self.labeled_df = labeled_df.reset_index(drop=True)
+        self.text_columns = list(text_columns)
+        self.key_column = key_column
+
+        options = {'ngram_range': (1, 2), 'sublinear_tf': True}
+        options.update(vectorizer_options)
+        self.vectorizer = TfidfVectorizer(**options)
+        documents = _document_text(self.labeled_df, self.text_columns)
+        if len(documents):
+            self.matrix = self.vectorizer.fit_transform(documents)
+        else:
+            self.matrix = None
+        logger.info(f"Indexed {len(self.labeled_df)} classified permissions")
+
+    def __len__(self) -> int:
+        return len(self.labeled_df)
+
+    def _similarities(self, df: pd.DataFrame):
+        """Returns the sparse (queries x indexed rows) cosine similarity matrix."""
+        return self.vectorizer.transform(_document_text(df, self.text_columns)) @ self.matrix.T
+
+    def nearest(self, df: pd.DataFrame, k: int = 1, block_size: int = 4096) -> pd.DataFrame:
+        """
+        Finds the k most similar classified permissions of each row.
+
+        Args:
+            df (pd.DataFrame): Permissions to look up, with the text columns
+            k (int): Neighbors per row
+            block_size (int): Rows compared per sparse matrix product, bounding memory
+
+        Returns:
+            pd.DataFrame: k rows per input row (fewer when the index is smaller) with 'Query'
+                (position in `df`), 'Rank', 'Neighbor' (row of `labeled_df`), the neighbor's
+                key column as 'Neighbor <key_column>' and 'Similarity', most similar first
+        """
+        key_name = f"Neighbor {self.key_column}"
+        k = min(k, len(self))
+        if not k or df.empty:
+            return pd.DataFrame({'Query': [], 'Rank': [], 'Neighbor': [], key_name: [], 'Similarity': []})
+
+        queries, neighbors, similarities = [], [], []
+        for start in range(0, len(df), block_size):
+            scores = self._similarities(df.iloc[start:start + block_size]).toarray()
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind='stable')
+            neighbors.append(np.take_along_axis(top, order, axis=1))
+            similarities.append(np.take_along_axis(top_scores, order, axis=1))
+            queries.append(np.arange(start, start + len(scores)))
+
+        neighbors = np.concatenate(neighbors).ravel()
+        keys = self.labeled_df[self.key_column].to_numpy(dtype=object) if self.key_column in self.labeled_df.columns \
+            else np.full(len(self), None, dtype=object)
+        return pd.DataFrame({
+            'Query': np.repeat(np.concatenate(queries), k),
+            'Rank': np.tile(np.arange(1, k + 1), len(df)),
+            'Neighbor': neighbors,
+            key_name: keys[neighbors],
+            'Similarity': np.concatenate(similarities).ravel()
+        })
+
+    def best_match(self, record: pd.Series, threshold: float = DEFAULT_REUSE_THRESHOLD) -> Optional[Tuple[pd.Series, float]]:
+        """
+        Returns the most similar classified permission if it reaches the threshold.
+
+        Args:
+            record (pd.Series): Permission with the text columns
+            threshold (float): Minimum cosine similarity (0-1)
+
+        Returns:
+            Optional[Tuple[pd.Series, float]]: The neighbor's row of `labeled_df` and its
+                similarity, or None below the threshold
+        """
+        if self.matrix is None:
+            return None
+        scores = self._similarities(record.to_frame().T).toarray()[0]
+        position = int(scores.argmax())
+        if scores[position] < threshold:
+            return None
+        return self.labeled_df.iloc[position], float(scores[position])
+
+    def propagate(
+        self,
+        df: pd.DataFrame,
+        result_columns: List[str],
+        threshold: float = DEFAULT_REUSE_THRESHOLD
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Copies neighbor results to the rows similar enough to a classified permission.
+
+        Args:
+            df (pd.DataFrame): Permissions to classify
+            result_columns (List[str]): Result columns copied from the neighbor, e.g.
+                ['Risk Rating', 'Evaluation']
+            threshold (float): Minimum cosine similarity (0-1)
+
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame]: Rows of `df` with the copied results plus
+                'Reused From' and 'Similarity', and the remaining rows that still need the model
+        """
+        matches = self.nearest(df, k=1)
+        if matches.empty:
+            return df.iloc[:0].assign(**{col: [] for col in result_columns + ['Reused From', 'Similarity']}), df
+
+        reused = (matches['Similarity'] >= threshold).to_numpy()
+        neighbors = matches['Neighbor'].to_numpy()[reused]
+        reused_df = df[reused].copy()
+        for col in result_columns:
+            reused_df[col] = self.labeled_df[col].to_numpy(dtype=object)[neighbors]
+        reused_df['Reused From'] = matches[f"Neighbor {self.key_column}"].to_numpy()[reused]
+        reused_df['Similarity'] = matches['Similarity'].to_numpy()[reused]
+
+        logger.info(f"Reused results for {len(reused_df)} of {len(df)} permissions at similarity >= {threshold}")
+        return reused_df, df[~reused]
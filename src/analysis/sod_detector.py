@@ -0,0 +1,282 @@
+"""
+Segregation-of-duties (toxic combination) detection over permission assignments.
+
+A conflict rule names two or more sides, each a group of permissions serving one
+duty; a holder violates the rule when they hold at least one permission from every
+side (or from `min_sides` sides). Rules are compiled to two indicator matrices:
+permissions x sides and sides x rules. Detection is then two matrix products per
+block of holders, for all users and all permission sets of an `AssignmentEngine`
+at once:
+
+    side_hits  = (holders x permissions) @ (permissions x sides) > 0
+    rule_sides = side_hits @ (sides x rules)
+    violation  = rule_sides >= sides required by the rule
+
+Rules are plain mappings of rule name to sides, written by hand, loaded from YAML,
+or seeded from the Ben Ten high-risk list and the category/risk classifications
+with `seed_conflict_rules`.
+
+Example:
+    >>> rules = seed_conflict_rules(category_df=category_results_df, risk_df=risk_results_df)
+    >>> detector = ConflictDetector(engine, rules)
+    >>> user_conflicts_df = detector.user_conflicts()
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from .assignment_engine import AssignmentEngine, WORD_BITS, unpack_bits
+from ..llms.risk_evaluator import RiskRating
+from ..llms.category_evaluator import CategoryLabel
+from ..llms.enum_codes import encode_enum_column
+from ..llms.scheduling import HIGH_RISK_PERMS_PATH
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Rule name -> sides, each side a list of API Names
+ConflictRules = Dict[str, List[List[str]]]
+
+# Duty served by each Ben Ten high-risk permission
+HIGH_RISK_DUTIES = {
+    'ManageUsers': 'user administration',
+    'ResetPasswords': 'user administration',
+    'ManageProfilesets': 'access administration',
+    'ModifyAllData': 'data administration',
+    'ViewAllData': 'data administration',
+    'CustomizeApplication': 'configuration',
+    'InstallPackaging': 'configuration'
+}
+
+# Duty served by the permissions of each category
+CATEGORY_DUTIES = {
+    CategoryLabel.USER_MANAGEMENT_ADMIN: 'user administration',
+    CategoryLabel.SECURITY_ADMIN: 'access administration',
+    CategoryLabel.DATA_ADMIN: 'data administration',
+    CategoryLabel.GENERAL_ADMIN: 'configuration',
+    CategoryLabel.DEVELOPER: 'development'
+}
+
+# Duties one person should not combine
+CONFLICTING_DUTIES = [
+    ('access administration', 'user administration'),
+    ('user administration', 'data administration'),
+    ('access administration', 'data administration'),
+    ('development', 'configuration')
+]
+
+def load_conflict_rules(rules_path: str) -> ConflictRules:
+    """
+    Loads conflict rules from a YAML file.
+
+    Args:
+        rules_path (str): YAML mapping of rule name to a list of sides, e.g.
+            "Manage users + modify all data: [[ManageUsers, ResetPasswords], [ModifyAllData]]"
+
+    Returns:
+        ConflictRules: Rule name to sides
+
+    Raises:
+        ValueError: If a rule has fewer than two sides
+    """
+    with open(rules_path, 'r') as f:
+        rules = yaml.safe_load(f) or {}
+    for name, sides in rules.items():
+        if not isinstance(sides, list) or len(sides) < 2:
+            raise ValueError(f"Conflict rule '{name}' needs at least two sides")
+    return {str(name): [[str(api_name) for api_name in side] for side in sides] for name, sides in rules.items()}
+
+def seed_conflict_rules(
+    high_risk_path: Optional[Union[str, Path]] = HIGH_RISK_PERMS_PATH,
+    category_df: Optional[pd.DataFrame] = None,
+    risk_df: Optional[pd.DataFrame] = None,
+    min_risk_rating: RiskRating = RiskRating.RESTRICTED,
+    conflicting_duties: Sequence[Tuple[str, str]] = CONFLICTING_DUTIES
+) -> ConflictRules:
+    """
+    Seeds conflict rules from the high-risk list and the classification outputs.
+
+    Ben Ten permissions get their duty from `HIGH_RISK_DUTIES`. Classified permissions
+    get the duty of their 'Category Label' from `CATEGORY_DUTIES`; when `risk_df` is
+    given, only those rated at least `min_risk_rating` are used. One rule is created per
+    pair of conflicting duties that both have permissions.
+
+    Args:
+        high_risk_path (str, optional): CSV of high-risk permissions with an 'API Name' column
+        category_df (pd.DataFrame, optional): Category results with 'API Name' and 'Category Label'
+        risk_df (pd.DataFrame, optional): Risk results with 'API Name' and 'Risk Rating'
+        min_risk_rating (RiskRating): Lowest risk rating of classified permissions to include
+        conflicting_duties (Sequence[Tuple[str, str]]): Pairs of duties that conflict
+
+    Returns:
+        ConflictRules: Rule name ("duty + duty") to sides
+    """
+    duties: Dict[str, set] = {}
+
+    if high_risk_path:
+        high_risk_names = pd.read_csv(high_risk_path)['API Name'].dropna().str.strip()
+        for api_name in high_risk_names:
+            if api_name in HIGH_RISK_DUTIES:
+                duties.setdefault(HIGH_RISK_DUTIES[api_name], set()).add(api_name)
+
+    if category_df is not None:
+        categories = category_df[['API Name', 'Category Label']].dropna(subset=['API Name'])
+        codes = encode_enum_column(categories['Category Label'], CategoryLabel)
+        if risk_df is not None:
+            risk_codes = encode_enum_column(risk_df['Risk Rating'], RiskRating).astype(float)
+            risky = set(risk_df.loc[(risk_codes >= int(min_risk_rating.value)).to_numpy(), 'API Name'])
+            keep = categories['API Name'].isin(risky).to_numpy()
+            categories, codes = categories[keep], codes[keep]
+        for label, duty in CATEGORY_DUTIES.items():
+            api_names = categories.loc[(codes.astype(float) == int(label.value)).to_numpy(), 'API Name']
+            duties.setdefault(duty, set()).update(api_names.str.strip())
+
+    rules = {}
+    for first, second in conflicting_duties:
+        if duties.get(first) and duties.get(second):
+            rules[f"{first} + {second}"] = [sorted(duties[first]), sorted(duties[second])]
+    return rules
+
+def _unique_rows(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the distinct rows of a boolean matrix and the index of each row among them."""
+    if matrix.shape[1] <= WORD_BITS:
+        # Encode each row as one integer, which sorts much faster than row-wise unique
+        weights = np.uint64(1) << np.arange(matrix.shape[1], dtype=np.uint64)
+        codes = (matrix.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+        _, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+        return matrix[first], inverse.ravel()
+    patterns, inverse = np.unique(matrix, axis=0, return_inverse=True)
+    return patterns, inverse.ravel()
+
+class ConflictDetector:
+    """
+    Finds users and permission sets holding conflicting permissions.
+
+    Args:
+        engine (AssignmentEngine): Assignments to check
+        rules (ConflictRules): Rule name to sides, each a list of API Names
+        min_sides (int, optional): Sides a holder must touch to violate a rule.
+            Defaults to every side of the rule
+
+    Raises:
+        ValueError: If a rule has fewer than two sides
+    """
+
+    def __init__(self, engine: AssignmentEngine, rules: ConflictRules, min_sides: Optional[int] = None):
+        self.engine = engine
+        self.rule_names = list(rules)
+        n_permissions = len(engine.permissions)
+
+        side_columns = []
+        side_rules = []
+        required = []
+        self._rule_positions = []
+        for rule_index, (name, sides) in enumerate(rules.items()):
+            if len(sides) < 2:
+                raise ValueError(f"Conflict rule '{name}' needs at least two sides")
+            positions = set()
+            for side in sides:
+                column = np.zeros(n_permissions, dtype=np.float32)
+                for api_name in side:
+                    try:
+                        position = engine.permission_position(api_name)
+                    except KeyError:
+                        logger.debug(f"Permission {api_name} of rule '{name}' is not granted by any permission set")
+                        continue
+                    column[position] = 1
+                    positions.add(position)
+                side_columns.append(column)
+                side_rules.append(rule_index)
+            required.append(min(min_sides or len(sides), len(sides)))
+            self._rule_positions.append(np.array(sorted(positions), dtype=np.int64))
+
+        # permissions x sides and sides x rules indicator matrices
+        self.side_matrix = np.stack(side_columns, axis=1) if side_columns else np.zeros((n_permissions, 0), dtype=np.float32)
+        self.rule_matrix = np.zeros((len(side_columns), len(self.rule_names)), dtype=np.float32)
+        self.rule_matrix[np.arange(len(side_columns)), side_rules] = 1
+        self.required = np.array(required, dtype=np.float32)
+
+    def _violations(self, bits: np.ndarray, block_size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the (holder, rule) index pairs of all violations."""
+        holder_indices, rule_indices = [], []
+        for start in range(0, len(bits), block_size):
+            held = unpack_bits(bits[start:start + block_size], len(self.engine.permissions)).astype(np.float32)
+            side_hits = (held @ self.side_matrix) > 0
+            rule_sides = side_hits.astype(np.float32) @ self.rule_matrix
+            holders, rules = np.nonzero(rule_sides >= self.required)
+            holder_indices.append(holders + start)
+            rule_indices.append(rules)
+        if not holder_indices:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(holder_indices), np.concatenate(rule_indices)
+
+    def _report(self, bits: np.ndarray, names: List[str], holder_column: str, block_size: int) -> pd.DataFrame:
+        holders, rules = self._violations(bits, block_size)
+        permissions = np.array(self.engine.permissions, dtype=object)
+
+        held_permissions = np.empty(len(holders), dtype=object)
+        order = np.argsort(rules, kind='stable')
+        rule_ids, starts = np.unique(rules[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        for rule_index, start, end in zip(rule_ids, starts, ends):
+            rows = order[start:end]
+            positions = self._rule_positions[rule_index]
+            # Read only the rule's bits straight from the packed words
+            words = bits[holders[rows][:, np.newaxis], positions // WORD_BITS]
+            held = ((words >> (positions % WORD_BITS).astype(np.uint64)) & np.uint64(1)).astype(bool)
+            # Holders share few distinct combinations, so join names once per combination
+            patterns, inverse = _unique_rows(held)
+            labels = np.array([';'.join(permissions[positions[row]]) for row in patterns], dtype=object)
+            held_permissions[rows] = labels[inverse]
+
+        return pd.DataFrame({
+            holder_column: np.array(names, dtype=object)[holders] if len(holders) else np.array([], dtype=object),
+            'Rule': np.array(self.rule_names, dtype=object)[rules] if len(rules) else np.array([], dtype=object),
+            'Permissions': held_permissions
+        })
+
+    def user_conflicts(self, block_size: int = 16384) -> pd.DataFrame:
+        """
+        Finds every user holding a toxic combination through their assignments.
+
+        Args:
+            block_size (int): Users unpacked per matrix product, bounding memory
+
+        Returns:
+            pd.DataFrame: One row per (User, Rule) with the conflicting 'Permissions' held
+        """
+        return self._report(self.engine.user_bits(), self.engine.users, 'User', block_size)
+
+    def set_conflicts(self, block_size: int = 16384) -> pd.DataFrame:
+        """
+        Finds every permission set or profile that grants a toxic combination by itself.
+
+        Args:
+            block_size (int): Permission sets unpacked per matrix product
+
+        Returns:
+            pd.DataFrame: One row per (Permission Set, Rule) with the conflicting 'Permissions' granted
+        """
+        return self._report(self.engine.set_bits, self.engine.permission_sets, 'Permission Set', block_size)
+
+    def rule_summary(self, block_size: int = 16384) -> pd.DataFrame:
+        """
+        Counts the users and permission sets violating each rule.
+
+        Args:
+            block_size (int): Holders unpacked per matrix product
+
+        Returns:
+            pd.DataFrame: 'Users' and 'Permission Sets' counts indexed by rule name
+        """
+        _, user_rules = self._violations(self.engine.user_bits(), block_size)
+        _, set_rules = self._violations(self.engine.set_bits, block_size)
+        return pd.DataFrame({
+            'Users': np.bincount(user_rules, minlength=len(self.rule_names)),
+            'Permission Sets': np.bincount(set_rules, minlength=len(self.rule_names))
+        }, index=pd.Index(self.rule_names, name='Rule'))
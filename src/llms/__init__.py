@@ -7,19 +7,26 @@ and classification utilities used throughout the project.
 
 from .chat_session import create_chat_session
 
+from .job_engine import ClassificationJob
+from .scheduling import PrioritySchedule, load_priority_list
+from .job_metrics import JobMetrics
+from .dead_letter import DeadLetterStore
+from .concurrency import AIMDController, get_controller
+from .enum_codes import encode_enum_columns, decode_enum_columns
+
 from .description_evaluator import (
     description_eval_summary,
     QualityRating
 )
 
-from .description_classifier import classify_description
+from .description_classifier import classify_description, stream_description
 
 from .risk_evaluator import (
     risk_eval_summary,
     RiskRating
 )
 
-from .risk_classifier import classify_risk_rating
+from .risk_classifier import classify_risk_rating, stream_risk_rating
 
 from .category_evaluator import (
     category_eval_summary,
@@ -27,33 +34,46 @@ from .category_evaluator import (
     CategoryLabel,
 )
 
-from .category_classifier import classify_category
+from .category_classifier import classify_category, stream_category
 
 from .cloud_evaluator import (
     cloud_eval_summary,
     CloudRating
 )
 
-from .cloud_classifier import classify_cloud
+from .cloud_classifier import classify_cloud, stream_cloud
 
 
 __all__ = [
     'create_chat_session',
+    'ClassificationJob',
+    'PrioritySchedule',
+    'load_priority_list',
+    'JobMetrics',
+    'DeadLetterStore',
+    'AIMDController',
+    'get_controller',
+    'encode_enum_columns',
+    'decode_enum_columns',
 
     'description_eval_summary',
     'QualityRating',
     'classify_description',
+    'stream_description',
 
     'category_eval_summary',
     'CategoryRating',
     'CategoryLabel',
     'classify_category',
+    'stream_category',
 
     'risk_eval_summary',
     'RiskRating',
     'classify_risk_rating',
+    'stream_risk_rating',
 
     'cloud_eval_summary',
     'CloudRating',
-    'classify_cloud'
+    'classify_cloud',
+    'stream_cloud'
 ] 
\ No newline at end of file
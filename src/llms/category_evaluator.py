@@ -18,6 +18,8 @@ import logging
 import json
 
 from .chat_session import create_chat_session
+from .job_metrics import emit_event
+from .enum_matcher import EnumMatcher
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -72,6 +74,15 @@ class CategoryLabel(enum.Enum):
             logger.warning(f"Invalid category label value: {value}. Defaulting to UNKNOWN.")
             return cls.UNKNOWN
 
+# Fallback matchers for evaluation text; mentions are matched in declaration order
+_RATING_MATCHER = EnumMatcher(CategoryRating, default=CategoryRating.UNKNOWN, exclude=[CategoryRating.UNKNOWN])
+_LABEL_MATCHER = EnumMatcher(
+    CategoryLabel,
+    default=CategoryLabel.UNKNOWN,
+    aliases={CategoryLabel.EINSTEIN: ['einstein and ai']},
+    exclude=[CategoryLabel.UNKNOWN]
+)
+
 def category_eval_summary(
     prompt: str,
     name: str,
@@ -192,26 +203,11 @@ def _extract_fallback_rating(eval_text: str) -> CategoryRating:
         eval_text (str): The evaluation text to parse
         
     Returns:
-        RiskRating: Extracted rating or GENERAL as default
+        CategoryRating: Extracted rating or UNKNOWN as default
     """
-    try:
-        # Look for rating keywords in the text
-        text_lower = eval_text.lower()
-        if "exact match" in text_lower or "exact_match" in text_lower:
-            return CategoryRating.EXACT_MATCH
-        elif "high match" in text_lower or "high_match" in text_lower:
-            return CategoryRating.HIGH_MATCH
-        elif "moderate match" in text_lower or "moderate_match" in text_lower:
-            return CategoryRating.MODERATE_MATCH
-        elif "low match" in text_lower or "low_match" in text_lower:
-            return CategoryRating.LOW_MATCH
-        elif "no match" in text_lower or "no_match" in text_lower:
-            return CategoryRating.NO_MATCH
-        else:
-            return CategoryRating.UNKNOWN
-    except Exception:
-        return CategoryRating.UNKNOWN 
-    
+    emit_event('fallback', kind='rating')
+    return _RATING_MATCHER.match(eval_text)
+
 def _extract_fallback_label(eval_text: str) -> CategoryLabel:
     """
     Attempts to extract a category label from evaluation text as fallback.
@@ -222,48 +218,5 @@ def _extract_fallback_label(eval_text: str) -> CategoryLabel:
     Returns:
         CategoryLabel: Extracted label or UNKNOWN as default
     """
-    try:
-        # Look for label keywords in the text
-        text_lower = eval_text.lower()
-        
-        # Core Platform Categories
-        if "general admin" in text_lower or "general_admin" in text_lower:
-            return CategoryLabel.GENERAL_ADMIN
-        elif "security admin" in text_lower or "security_admin" in text_lower:
-            return CategoryLabel.SECURITY_ADMIN
-        elif "user management admin" in text_lower or "user_management_admin" in text_lower:
-            return CategoryLabel.USER_MANAGEMENT_ADMIN
-        elif "data admin" in text_lower or "data_admin" in text_lower:
-            return CategoryLabel.DATA_ADMIN
-        elif "import and export" in text_lower or "import_and_export" in text_lower:
-            return CategoryLabel.IMPORT_AND_EXPORT
-        elif "agentforce" in text_lower:
-            return CategoryLabel.AGENTFORCE
-        elif "einstein and ai" in text_lower or "einstein_and_ai" in text_lower:
-            return CategoryLabel.EINSTEIN_AND_AI
-        elif "report and dashboard" in text_lower or "report_and_dashboard" in text_lower:
-            return CategoryLabel.REPORT_AND_DASHBOARD
-        elif "developer" in text_lower:
-            return CategoryLabel.DEVELOPER
-        elif "user interface" in text_lower or "user_interface" in text_lower:
-            return CategoryLabel.USER_INTERFACE
-        elif "object access" in text_lower or "object_access" in text_lower:
-            return CategoryLabel.OBJECT_ACCESS
-
-        # Core Platform Add-Ons
-        elif "data cloud" in text_lower or "data_cloud" in text_lower:
-            return CategoryLabel.DATA_CLOUD
-        elif "crm analytics" in text_lower or "crm_analytics" in text_lower:
-            return CategoryLabel.CRM_ANALYTICS
-        elif "chatter and communities" in text_lower or "chatter_and_communities" in text_lower:
-            return CategoryLabel.CHATTER_AND_COMMUNITIES
-        elif "shield and event monitoring" in text_lower or "shield_and_event_monitoring" in text_lower:
-            return CategoryLabel.SHIELD_AND_EVENT_MONITORING
-
-        # Other
-        elif "other" in text_lower:
-            return CategoryLabel.UNKNOWN
-        else:
-            return CategoryLabel.UNKNOWN
-    except Exception:
-        return CategoryLabel.UNKNOWN
+    emit_event('fallback', kind='label')
+    return _LABEL_MATCHER.match(eval_text)
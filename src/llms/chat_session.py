@@ -6,9 +6,22 @@ import logging
 from google import genai
 from google.api_core import retry
 
+from .job_metrics import emit_event
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+def _is_retriable(e: Exception) -> bool:
+    """
+    Retry predicate for rate limit and availability errors.
+
+    Retried errors are reported to the metrics registry of the active job.
+    """
+    retriable = isinstance(e, genai.errors.APIError) and e.code in {429, 503}
+    if retriable:
+        emit_event('retry', code=e.code)
+    return retriable
+
 def create_chat_session(
     client = None,
     model_name: str = 'gemini-2.0-flash'
@@ -24,11 +37,9 @@ def create_chat_session(
         ChatSession: Initialized chat session
     """
     try:
-        is_retriable = lambda e: (isinstance(e, genai.errors.APIError) and e.code in {429, 503})
-
         if not hasattr(genai.models.Models.generate_content, '__wrapped__'):
           genai.models.Models.generate_content = retry.Retry(
-              predicate=is_retriable)(genai.models.Models.generate_content)
+              predicate=_is_retriable)(genai.models.Models.generate_content)
 
         chat = client.chats.create(model=model_name)
         return chat
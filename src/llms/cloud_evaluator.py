@@ -18,6 +18,8 @@ import logging
 import json
 
 from .chat_session import create_chat_session
+from .job_metrics import emit_event
+from .enum_matcher import EnumMatcher
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -71,6 +73,18 @@ class CloudLabel(enum.Enum):
             logger.warning(f"Invalid cloud label value: {value}. Defaulting to UNKNOWN.")
             return cls.UNKNOWN
 
+# Fallback matchers for evaluation text; mentions are matched in declaration order
+_RATING_MATCHER = EnumMatcher(CloudRating, default=CloudRating.UNKNOWN, exclude=[CloudRating.UNKNOWN])
+_LABEL_MATCHER = EnumMatcher(
+    CloudLabel,
+    default=CloudLabel.UNKNOWN,
+    aliases={
+        CloudLabel.MARKETING_CLOUD_AND_PARDOT: ['marking cloud and pardot'],
+        CloudLabel.HEALTHCARE_AND_LIFE_SCIENCES_CLOUD: ['healthcare & life sciences cloud']
+    },
+    exclude=[CloudLabel.UNKNOWN]
+)
+
 def cloud_eval_summary(
     prompt: str,
     name: str,
@@ -190,26 +204,11 @@ def _extract_fallback_rating(eval_text: str) -> CloudRating:
         eval_text (str): The evaluation text to parse
         
     Returns:
-        RiskRating: Extracted rating or GENERAL as default
+        CloudRating: Extracted rating or UNKNOWN as default
     """
-    try:
-        # Look for rating keywords in the text
-        text_lower = eval_text.lower()
-        if "exact match" in text_lower or "exact_match" in text_lower:
-            return CloudRating.EXACT_MATCH
-        elif "high match" in text_lower or "high_match" in text_lower:
-            return CloudRating.HIGH_MATCH
-        elif "moderate match" in text_lower or "moderate_match" in text_lower:
-            return CloudRating.MODERATE_MATCH
-        elif "low match" in text_lower or "low_match" in text_lower:
-            return CloudRating.LOW_MATCH
-        elif "no match" in text_lower or "no_match" in text_lower:
-            return CloudRating.NO_MATCH
-        else:
-            return CloudRating.UNKNOWN
-    except Exception:
-        return CloudRating.UNKNOWN 
-    
+    emit_event('fallback', kind='rating')
+    return _RATING_MATCHER.match(eval_text)
+
 def _extract_fallback_label(eval_text: str) -> CloudLabel:
     """
     Attempts to extract a cloud label from evaluation text as fallback.
@@ -220,48 +219,5 @@ def _extract_fallback_label(eval_text: str) -> CloudLabel:
     Returns:
         CloudLabel: Extracted label or UNKNOWN as default
     """
-    try:
-        # Look for label keywords in the text
-        text_lower = eval_text.lower()
-
-        # Cloud
-        if "sales cloud" in text_lower or "sales_cloud" in text_lower:
-            return CloudLabel.SALES_CLOUD
-        elif "service cloud" in text_lower or "service_cloud" in text_lower:
-            return CloudLabel.SERVICE_CLOUD
-        elif "marketing cloud and pardot" in text_lower or "marketing_cloud_and_pardot" in text_lower:
-            return CloudLabel.MARKETING_CLOUD_AND_PARDOT
-        elif "commerce cloud" in text_lower or "commerce_cloud" in text_lower:
-            return CloudLabel.COMMERCE_CLOUD
-        elif "slack and quip" in text_lower or "slack_and_quip" in text_lower:
-            return CloudLabel.SLACK_AND_QUIP
-
-        # Cloud Add-Ons
-        elif "cpq" in text_lower:
-            return CloudLabel.CPQ
-        elif "field service" in text_lower or "field_service" in text_lower:
-            return CloudLabel.FIELD_SERVICE
-
-        # Industries
-        elif "financial services cloud" in text_lower or "financial_services_cloud" in text_lower:
-            return CloudLabel.FINANCIAL_SERVICES_CLOUD
-        elif "healthcare & life sciences cloud" in text_lower or "healthcare_and_life_sciences_cloud" in text_lower:
-            return CloudLabel.HEALTHCARE_AND_LIFE_SCIENCES_CLOUD
-        elif "consumer goods cloud" in text_lower or "consumer_goods_cloud" in text_lower:
-            return CloudLabel.CONSUMER_GOODS_CLOUD
-        elif "communications cloud" in text_lower or "communications_cloud" in text_lower:
-            return CloudLabel.COMMUNICATIONS_CLOUD
-        elif "manufacturing cloud" in text_lower or "manufacturing_cloud" in text_lower:
-            return CloudLabel.MANUFACTURING_CLOUD
-        elif "nonprofit cloud" in text_lower or "nonprofit_cloud" in text_lower:
-            return CloudLabel.NONPROFIT_CLOUD
-        elif "general industries cloud" in text_lower or "general_industries_cloud" in text_lower:
-            return CloudLabel.GENERAL_INDUSTRIES_CLOUD
-
-        # Other
-        elif "other" in text_lower:
-            return CloudLabel.UNKNOWN
-        else:
-            return CloudLabel.UNKNOWN
-    except Exception:
-        return CategoryLabel.UNKNOWN
+    emit_event('fallback', kind='label')
+    return _LABEL_MATCHER.match(eval_text)
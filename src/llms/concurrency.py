@@ -0,0 +1,154 @@
+"""
+Adaptive concurrency control for classification jobs.
+
+An `AIMDController` sets how many evaluations a job keeps in flight. The limit grows
+additively while calls are healthy and is cut multiplicatively when the API throttles
+(429/503 retries reported by the retry predicate) or latency spikes above its baseline.
+"""
+
+import threading
+import time
+import logging
+from typing import Dict, Tuple
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class AIMDController:
+    """
+    Additive-increase/multiplicative-decrease limit on in-flight evaluations.
+
+    Args:
+        initial_limit (int): Limit to start with
+        min_limit (int): Lowest limit the controller will cut to
+        max_limit (int): Highest limit the controller will grow to
+        increase (int): Amount added to the limit after a full window of healthy calls
+        decrease_factor (float): Factor the limit is multiplied by on throttling or latency spikes
+        latency_spike_factor (float): A call slower than this multiple of the baseline latency is a spike
+        baseline_alpha (float): Smoothing factor of the exponentially weighted baseline latency
+        min_samples (int): Calls needed before latency spikes are detected
+        cooldown (float): Minimum seconds between two decreases, so one burst of throttled
+            in-flight calls only cuts the limit once
+
+    Example:
+        >>> controller = get_controller('gemini-2.0-flash', 'risk', max_limit=16)
+        >>> results = classify_risk_rating(df, prompt, client=client, concurrency=controller)
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 2,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        increase: int = 1,
+        decrease_factor: float = 0.5,
+        latency_spike_factor: float = 2.5,
+        baseline_alpha: float = 0.1,
+        min_samples: int = 10,
+        cooldown: float = 5.0
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_spike_factor = latency_spike_factor
+        self.baseline_alpha = baseline_alpha
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+
+        self._lock = threading.Lock()
+        self._limit = initial_limit
+        self._successes = 0
+        self._samples = 0
+        self._baseline_latency = None
+        self._last_decrease = 0.0
+        self.throttles = 0
+        self.latency_spikes = 0
+
+    @property
+    def limit(self) -> int:
+        """Current number of evaluations allowed in flight."""
+        return self._limit
+
+    def on_success(self, latency: float) -> None:
+        """
+        Records a completed call and adjusts the limit.
+
+        Args:
+            latency (float): Seconds the call took
+        """
+        with self._lock:
+            self._samples += 1
+            baseline = self._baseline_latency
+            if (
+                baseline is not None
+                and self._samples > self.min_samples
+                and latency > baseline * self.latency_spike_factor
+            ):
+                self.latency_spikes += 1
+                self._decrease(f"latency {latency:.2f}s above baseline {baseline:.2f}s")
+                return
+
+            # Only healthy calls feed the baseline
+            if baseline is None:
+                self._baseline_latency = latency
+            else:
+                self._baseline_latency = (1 - self.baseline_alpha) * baseline + self.baseline_alpha * latency
+
+            # Grow once per window of `limit` healthy calls
+            self._successes += 1
+            if self._successes >= self._limit and self._limit < self.max_limit:
+                self._limit = min(self._limit + self.increase, self.max_limit)
+                self._successes = 0
+                logger.debug(f"Concurrency limit increased to {self._limit}")
+
+    def on_throttle(self) -> None:
+        """Records a throttled call (HTTP 429/503) and cuts the limit."""
+        with self._lock:
+            self.throttles += 1
+            self._decrease("API throttling")
+
+    def _decrease(self, reason: str) -> None:
+        # Caller holds the lock
+        self._successes = 0
+        now = time.time()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        new_limit = max(self.min_limit, int(self._limit * self.decrease_factor))
+        if new_limit != self._limit:
+            logger.info(f"Concurrency limit cut from {self._limit} to {new_limit} ({reason})")
+        self._limit = new_limit
+
+    def record_event(self, name: str, **labels) -> None:
+        """Handles events reported through `emit_event` while this controller is active."""
+        if name == 'retry' and str(labels.get('code')) in ('429', '503'):
+            self.on_throttle()
+
+# Controllers shared by every job of the same model and stage
+_controllers: Dict[Tuple[str, str], AIMDController] = {}
+_controllers_lock = threading.Lock()
+
+def get_controller(model_name: str, stage: str, **controller_options) -> AIMDController:
+    """
+    Returns the shared controller for a model and stage, creating it on first use.
+
+    Each model/stage pair finds its own sustainable limit, and later jobs start from
+    the limit earlier jobs converged to.
+
+    Args:
+        model_name (str): Name of the LLM model
+        stage (str): Classification stage, e.g. 'risk'
+        **controller_options: `AIMDController` arguments used when creating the controller
+
+    Returns:
+        AIMDController: The controller for the model and stage
+    """
+    key = (model_name, stage)
+    with _controllers_lock:
+        if key not in _controllers:
+            _controllers[key] = AIMDController(**controller_options)
+        return _controllers[key]
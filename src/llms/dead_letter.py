@@ -0,0 +1,157 @@
+"""
+Dead-letter store for records whose evaluation failed during a classification job.
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from datetime import datetime
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class DeadLetterStore:
+    """
+    Append-only JSONL log of failed records.
+
+    Every failure or resolution appends one line; the log is replayed once on
+    construction so the latest line per record wins, and an in-memory index keeps
+    that state current afterwards. Each entry holds the input record, the error class
+    and message, the number of attempts, the first/last failure timestamps and, once
+    known, the row of the results file the failure was written to.
+
+    Args:
+        path (str): Path of the JSONL file
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries = self._replay()
+
+    def _replay(self) -> Dict[int, Dict]:
+        """Reads the log and returns the latest entry per position."""
+        entries = {}
+        if not self.path.exists():
+            return entries
+
+        with open(self.path, 'r') as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping unreadable dead-letter line {line_number} in {self.path}")
+                    continue
+                entries[entry['position']] = entry
+        return entries
+
+    def _append(self, entry: Dict) -> None:
+        """Writes an entry to the log and the index; the caller holds the lock."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+        self._entries[entry['position']] = entry
+
+    def load(self, include_resolved: bool = False) -> Dict[int, Dict]:
+        """
+        Returns the current state of every dead-lettered record.
+
+        Args:
+            include_resolved (bool): Whether to include records that were since retried successfully
+
+        Returns:
+            Dict[int, Dict]: Latest entry per record, keyed by the record's position in the input
+        """
+        with self._lock:
+            return {
+                position: dict(entry) for position, entry in self._entries.items()
+                if include_resolved or not entry.get('resolved')
+            }
+
+    def add_failure(self, position: int, record: Dict, error: Exception) -> Dict:
+        """
+        Records a failed evaluation attempt.
+
+        Args:
+            position (int): Positional index of the record in the job input
+            record (Dict): Input column values of the record
+            error (Exception): The exception raised by the evaluation
+
+        Returns:
+            Dict: The updated dead-letter entry
+        """
+        now = datetime.now().isoformat()
+        with self._lock:
+            previous = self._entries.get(position)
+            entry = {
+                'position': position,
+                'api_name': record.get('API Name'),
+                'record': record,
+                'error_class': type(error).__name__,
+                'error_message': str(error),
+                'attempts': (previous['attempts'] if previous else 0) + 1,
+                'first_failed_at': previous['first_failed_at'] if previous else now,
+                'last_failed_at': now,
+                'result_row': previous.get('result_row') if previous else None,
+                'resolved': False
+            }
+            self._append(entry)
+        return dict(entry)
+
+    def set_result_row(self, position: int, result_row: int) -> None:
+        """
+        Records the row of the results file an unresolved failure was written to.
+
+        Args:
+            position (int): Positional index of the record in the job input
+            result_row (int): Row of the record's error row in the results file
+        """
+        with self._lock:
+            entry = self._entries.get(position)
+            if entry is None or entry.get('resolved') or entry.get('result_row') == result_row:
+                return
+            self._append(dict(entry, result_row=result_row))
+
+    def mark_resolved(self, entry: Dict) -> None:
+        """
+        Records that a dead-lettered record was evaluated successfully.
+
+        Args:
+            entry (Dict): The dead-letter entry that was retried
+        """
+        self.resolve(entry['position'])
+
+    def resolve(self, position: int) -> None:
+        """
+        Records a successful evaluation of a record; a no-op unless it has an unresolved failure.
+
+        Args:
+            position (int): Positional index of the record in the job input
+        """
+        with self._lock:
+            entry = self._entries.get(position)
+            if entry is None or entry.get('resolved'):
+                return
+            resolved = dict(entry)
+            resolved['resolved'] = True
+            resolved['resolved_at'] = datetime.now().isoformat()
+            self._append(resolved)
+
+    def pending(self) -> List[Dict]:
+        """Returns the unresolved entries ordered by position."""
+        return [entry for _, entry in sorted(self.load().items())]
+
+    def clear(self) -> None:
+        """Removes the dead-letter file."""
+        with self._lock:
+            if self.path.exists():
+                self.path.unlink()
+            self._entries = {}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(1 for entry in self._entries.values() if not entry.get('resolved'))
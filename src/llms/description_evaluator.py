@@ -21,6 +21,8 @@ import io
 from pprint import pprint
 
 from .chat_session import create_chat_session
+from .job_metrics import emit_event
+from .enum_matcher import EnumMatcher
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -46,6 +48,9 @@ class QualityRating(enum.Enum):
             return cls.UNKNOWN
         
 
+# Fallback matcher for evaluation text; mentions are matched in declaration order
+_RATING_MATCHER = EnumMatcher(QualityRating, default=QualityRating.UNKNOWN, exclude=[QualityRating.UNKNOWN])
+
 def write_markdown_output(response, debug: bool = False):
     """
     Writes a markdown buffer to a file.
@@ -263,22 +268,7 @@ def _extract_fallback_rating(eval_text: str) -> QualityRating:
         eval_text (str): The evaluation text to parse
         
     Returns:
-        RiskRating: Extracted rating or GENERAL as default
+        QualityRating: Extracted rating or UNKNOWN as default
     """
-    try:
-        # Look for rating keywords in the text
-        text_lower = eval_text.lower()
-        if "perfect quality" in text_lower or "perfect_quality" in text_lower:
-            return QualityRating.PERFECT_QUALITY
-        elif "high quality" in text_lower or "high_quality" in text_lower:
-            return QualityRating.HIGH_QUALITY
-        elif "moderate quality" in text_lower or "moderate_quality" in text_lower:
-            return QualityRating.MODERATE_QUALITY
-        elif "low quality" in text_lower or "low_quality" in text_lower:
-            return QualityRating.LOW_QUALITY
-        elif "no quality" in text_lower or "no_quality" in text_lower:
-            return QualityRating.NO_QUALITY
-        else:
-            return QualityRating.UNKNOWN
-    except Exception:
-        return QualityRating.UNKNOWN 
+    emit_event('fallback', kind='rating')
+    return _RATING_MATCHER.match(eval_text)
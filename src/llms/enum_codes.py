@@ -0,0 +1,152 @@
+"""
+Compact integer codes for the rating and label columns of classification results.
+
+Every rating/label enum is valued '1'..'15' or '99', so a result column can be stored
+as a categorical of small integers instead of enum objects or strings such as
+'RiskRating.RESTRICTED'. Failed evaluations ("ERROR") are stored as -1. Encoding
+and decoding work on the distinct values of a column, so they stay fast on large
+result sets, and decoding restores the original enum members.
+
+Example:
+    >>> coded_df = encode_enum_columns(risk_results_df)
+    >>> high_risk = coded_df[coded_df['Risk Rating'] >= 4]
+    >>> decoded_df = decode_enum_columns(coded_df)
+"""
+
+import enum
+import numbers
+import logging
+from typing import Dict, Optional, Type, Any
+
+import pandas as pd
+
+from .risk_evaluator import RiskRating
+from .category_evaluator import CategoryRating, CategoryLabel
+from .cloud_evaluator import CloudRating, CloudLabel
+from .description_evaluator import QualityRating
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Code stored for failed evaluations
+ERROR_CODE = -1
+
+# Marker the classifiers store in rating/label columns when an evaluation fails
+ERROR_VALUE = "ERROR"
+
+# Enum stored in each rating/label result column
+ENUM_COLUMNS: Dict[str, Type[enum.Enum]] = {
+    'Risk Rating': RiskRating,
+    'Category Rating': CategoryRating,
+    'Category Label': CategoryLabel,
+    'Cloud Rating': CloudRating,
+    'Cloud Label': CloudLabel,
+    'Quality Rating': QualityRating
+}
+
+def enum_code_dtype(enum_cls: Type[enum.Enum]) -> pd.CategoricalDtype:
+    """
+    Returns the categorical dtype holding the codes of an enum and the error code.
+
+    Args:
+        enum_cls (Type[enum.Enum]): Rating or label enum
+
+    Returns:
+        pd.CategoricalDtype: Categories are the integer codes, ordered from the error code up
+    """
+    codes = sorted(int(member.value) for member in enum_cls)
+    return pd.CategoricalDtype(categories=[ERROR_CODE] + codes, ordered=True)
+
+def _parse_code(value: Any, enum_cls: Type[enum.Enum]) -> Optional[int]:
+    """
+    Converts a stored value to its integer code.
+
+    Accepts enum members, "ERROR", legacy strings ('RiskRating.RESTRICTED' or
+    'RESTRICTED') and codes as int, float or string. Returns None for missing or
+    unrecognized values.
+    """
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, enum_cls):
+        return int(value.value)
+    if isinstance(value, numbers.Real):
+        value = str(int(value))
+
+    text = str(value).strip()
+    if text == ERROR_VALUE or text == str(ERROR_CODE):
+        return ERROR_CODE
+    if text.startswith(f"{enum_cls.__name__}."):
+        text = text.split('.', 1)[1]
+    if text in enum_cls.__members__:
+        return int(enum_cls[text].value)
+    try:
+        return int(enum_cls(text).value)
+    except ValueError:
+        logger.warning(f"Unrecognized {enum_cls.__name__} value: {value}")
+        return None
+
+def encode_enum_column(series: pd.Series, enum_cls: Type[enum.Enum]) -> pd.Series:
+    """
+    Encodes a rating or label column as a categorical of integer codes.
+
+    Args:
+        series (pd.Series): Column of enum members, "ERROR" markers or legacy strings
+        enum_cls (Type[enum.Enum]): Enum stored in the column
+
+    Returns:
+        pd.Series: Categorical column of integer codes; unrecognized values become missing
+    """
+    dtype = enum_code_dtype(enum_cls)
+    if isinstance(series.dtype, pd.CategoricalDtype) and series.dtype == dtype:
+        return series
+
+    # Parse each distinct value once and map the codes back onto the column
+    uniques = pd.unique(series.astype(object))
+    lookup = {value: _parse_code(value, enum_cls) for value in uniques}
+    return series.astype(object).map(lookup).astype(dtype)
+
+def decode_enum_column(series: pd.Series, enum_cls: Type[enum.Enum]) -> pd.Series:
+    """
+    Decodes a column of integer codes back to enum members.
+
+    Args:
+        series (pd.Series): Column produced by `encode_enum_column`
+        enum_cls (Type[enum.Enum]): Enum stored in the column
+
+    Returns:
+        pd.Series: Object column of enum members, with "ERROR" for the error code
+    """
+    lookup = {int(member.value): member for member in enum_cls}
+    lookup[ERROR_CODE] = ERROR_VALUE
+    codes = encode_enum_column(series, enum_cls)
+    return codes.astype(object).map(lambda code: lookup.get(code) if code == code else None)
+
+def encode_enum_columns(df: pd.DataFrame, columns: Optional[Dict[str, Type[enum.Enum]]] = None) -> pd.DataFrame:
+    """
+    Encodes every rating/label column present in a results DataFrame.
+
+    Args:
+        df (pd.DataFrame): Results DataFrame
+        columns (Dict[str, Type[enum.Enum]], optional): Column to enum mapping. Defaults to `ENUM_COLUMNS`
+
+    Returns:
+        pd.DataFrame: Copy of the DataFrame with coded categorical columns
+    """
+    columns = ENUM_COLUMNS if columns is None else columns
+    encoded = {col: encode_enum_column(df[col], enum_cls) for col, enum_cls in columns.items() if col in df.columns}
+    return df.assign(**encoded) if encoded else df
+
+def decode_enum_columns(df: pd.DataFrame, columns: Optional[Dict[str, Type[enum.Enum]]] = None) -> pd.DataFrame:
+    """
+    Decodes every coded rating/label column of a results DataFrame back to enum members.
+
+    Args:
+        df (pd.DataFrame): Results DataFrame with coded columns
+        columns (Dict[str, Type[enum.Enum]], optional): Column to enum mapping. Defaults to `ENUM_COLUMNS`
+
+    Returns:
+        pd.DataFrame: Copy of the DataFrame with enum member columns
+    """
+    columns = ENUM_COLUMNS if columns is None else columns
+    decoded = {col: decode_enum_column(df[col], enum_cls) for col, enum_cls in columns.items() if col in df.columns}
+    return df.assign(**decoded) if decoded else df
@@ -0,0 +1,90 @@
+"""
+Keyword matcher that maps free evaluation text to a rating or label enum.
+
+Used by the evaluators' fallback extractors when structured output fails. The
+matcher is generated from the enum definition: every member name is matched as
+words separated by spaces, underscores or hyphens ("mission critical" / "mission_critical"),
+plus optional aliases. Phrases only match as whole words, so "sensitive" is not
+found in "insensitive". All phrases are compiled into one case-insensitive regex
+that scans the text once; when several members appear, the one declared first in
+the enum wins.
+"""
+
+import enum
+import re
+import logging
+from typing import Dict, Iterable, List, Optional, Type
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class EnumMatcher:
+    """
+    Single-scan matcher from text to enum members.
+
+    Args:
+        enum_cls (Type[enum.Enum]): Enum whose member names are matched
+        default (enum.Enum): Member returned when nothing matches
+        aliases (Dict[enum.Enum, List[str]], optional): Extra phrases per member
+        exclude (Iterable[enum.Enum]): Members never matched by name, e.g. UNKNOWN
+
+    Example:
+        >>> matcher = EnumMatcher(RiskRating, default=RiskRating.GENERAL)
+        >>> matcher.match("Overall this permission is Mission Critical.")
+        <RiskRating.MISSION_CRITICAL: '5'>
+    """
+
+    def __init__(
+        self,
+        enum_cls: Type[enum.Enum],
+        default: enum.Enum,
+        aliases: Optional[Dict[enum.Enum, List[str]]] = None,
+        exclude: Iterable[enum.Enum] = ()
+    ):
+        self.enum_cls = enum_cls
+        self.default = default
+        excluded = set(exclude)
+
+        members = [member for member in enum_cls if member not in excluded]
+        self._rank = {member: rank for rank, member in enumerate(members)}
+
+        # One named group per member so a match identifies its member directly
+        self._group_members = {}
+        alternatives = []
+        for index, member in enumerate(members):
+            phrases = [member.name.lower()] + [alias.lower() for alias in (aliases or {}).get(member, [])]
+            # Longest phrases first so a longer phrase wins at the same position
+            patterns = sorted({_phrase_pattern(phrase) for phrase in phrases}, key=len, reverse=True)
+            group = f"m{index}"
+            self._group_members[group] = member
+            alternatives.append(f"(?P<{group}>{'|'.join(patterns)})")
+
+        # Word boundaries keep a phrase from matching inside a longer word
+        self._pattern = re.compile(rf"\b(?:{'|'.join(alternatives)})\b", re.IGNORECASE)
+
+    def match(self, text: str) -> enum.Enum:
+        """
+        Returns the highest-precedence member mentioned in the text.
+
+        Args:
+            text (str): Evaluation text
+
+        Returns:
+            enum.Enum: Matched member, or the default when none is mentioned
+        """
+        if not isinstance(text, str):
+            return self.default
+
+        best = None
+        for found in self._pattern.finditer(text):
+            member = self._group_members[found.lastgroup]
+            if best is None or self._rank[member] < self._rank[best]:
+                best = member
+                if self._rank[best] == 0:
+                    break
+        return best if best is not None else self.default
+
+def _phrase_pattern(phrase: str) -> str:
+    """Builds the regex for a phrase, accepting spaces, underscores or hyphens between words."""
+    words = re.split(r'[\s_-]+', phrase.strip())
+    return r'[\s_-]+'.join(re.escape(word) for word in words)
@@ -0,0 +1,868 @@
+"""
+Shared job engine for long-running permission classification jobs.
+
+Each classifier stage supplies a function that evaluates a single record; the
+engine takes care of checkpoint/recovery, progress reporting and hands back each
+completed record as soon as it has been evaluated.
+"""
+
+import numpy as np
+import pandas as pd
+import time
+import logging
+import json
+from pathlib import Path
+from typing import Optional, Callable, Dict, List, Iterator, Iterable, Union, Sequence, Tuple
+from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .job_metrics import JobMetrics, activate_listeners, deactivate_listeners
+from .concurrency import AIMDController, get_controller
+from ..utils.data_utils import iter_data_chunks, count_data_rows
+from ..utils.blob_store import BlobStore
+from .dead_letter import DeadLetterStore
+from .results_store import open_results_store
+from .enum_codes import ENUM_COLUMNS, encode_enum_columns
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Labels used when printing the input record in verbose debug mode
+_DEBUG_LABELS = {
+    'Permission Name': 'Name:       ',
+    'API Name': 'API Name:   ',
+    'Description': 'Description:',
+    'Expanded Description': 'Expanded Description:'
+}
+
+# Number of completed records kept for the sample printed at the end of a job
+_SAMPLE_SIZE = 5
+
+
+class ClassificationJob:
+    """
+    Runs a classification stage over an input DataFrame with checkpointing.
+
+    Completed rows are appended to the results file at every checkpoint instead
+    of rewriting the whole file, so a job only ever holds the rows that have not
+    been checkpointed yet. Results are a CSV file by default, or a directory of
+    Parquet/Arrow part files with `checkpoint_format`. Use `stream()` to consume records incrementally or
+    `run()` to collect them into a DataFrame.
+
+    The input can also be a CSV/Parquet/Arrow path or an iterable of DataFrames. It is
+    then read `chunksize` rows at a time, each chunk is validated and scheduled on
+    its own, and peak memory stays constant regardless of the input size.
+
+    Args:
+        input_df (Union[pd.DataFrame, str, Iterable[pd.DataFrame]]): Input DataFrame containing
+            permission details, a path to a .csv/.parquet/.arrow file, or an iterable of chunks
+        evaluate_record (Callable): Function taking an input record (pd.Series) and
+            returning a dict with a value for each of `result_columns`
+        stage (str): Stage name used for checkpoint file names (e.g. 'risk')
+        input_columns (List[str]): Required input columns, copied to every result row
+        result_columns (List[str]): Columns produced by `evaluate_record`
+        error_values (Dict, optional): Values stored in the result columns when the
+            evaluation raises. 'Evaluation' always receives the error text
+        display_columns (List[str], optional): Result columns printed in verbose mode
+        checkpoint_dir (str): Directory to store checkpoint files
+        job_id (Optional[str]): Unique identifier for this job run. If None, uses timestamp
+        resume_from_checkpoint (bool): Whether to attempt to resume from last checkpoint
+        total_records (int, optional): Number of records to process. If None, processes all records
+        checkin_interval (int): Seconds between progress updates
+        checkpoint_interval (int): Number of records between checkpoints
+        schedule (Callable, optional): Scheduling policy taking the input DataFrame and
+            returning positional indices in processing order (e.g. `PrioritySchedule`).
+            If None, records are processed in file order. Chunked input is scheduled chunk by chunk
+        metrics (JobMetrics, optional): Registry updated with throughput, latency,
+            error, retry and fallback metrics while the job runs
+        retry_failed (bool): Whether `run()` finishes with a retry pass over dead-lettered records
+        retry_workers (int): Concurrent evaluations during the retry pass
+        retry_attempts (int): Attempts per record during the retry pass
+        concurrency (Union[int, str, AIMDController]): Evaluations kept in flight. An int sets a
+            fixed limit, 'adaptive' uses the shared `AIMDController` for this model and stage,
+            and a controller instance is used as given. Results are still checkpointed and
+            yielded in processing order. Use a client rather than a shared chat session
+            when running more than one evaluation at a time
+        shared_session (bool): Whether `evaluate_record` sends every record through one chat
+            session. Its history would interleave between concurrent records, so such a job
+            must evaluate one record at a time
+        model_name (str, optional): Model used by `evaluate_record`, for per-model concurrency control
+        chunksize (int): Rows read at a time when the input is a file
+        input_defaults (Dict, optional): Columns added with a constant value when missing from
+            the input, e.g. {'Expanded Description': ''}
+        checkpoint_format (str): Results format: 'csv', 'parquet' or 'arrow'. Columnar formats
+            store enum columns as categoricals and require pyarrow
+        compression (str, optional): Compression codec for columnar results, e.g. 'zstd' or 'snappy'
+        enum_codes (Union[bool, Dict]): Whether rating/label columns are stored and returned as
+            categoricals of integer codes (see `enum_codes.decode_enum_columns`). True codes the
+            result columns listed in `ENUM_COLUMNS`; a dict maps column names to enums explicitly.
+            Streamed dict rows keep the enum members
+        blob_store (BlobStore, optional): Store that verbose text columns are moved to. Result rows
+            then hold a reference; use `resolve_blobs` or `blob_store.get` to load the text
+        blob_columns (List[str], optional): Result columns moved to `blob_store`. Defaults to
+            'Evaluation' and 'Full Fidelity Evaluation'. Error messages always stay inline
+        reuse_index (SimilarityIndex, optional): Index of already-classified permissions. A record
+            whose nearest indexed neighbor reaches `reuse_threshold` takes over the neighbor's
+            result columns without calling the model; a 'Reused From' result column names the neighbor
+        reuse_threshold (float): Minimum cosine similarity for reusing a neighbor's result
+        debug (bool): Whether to print debug information
+        verbose (bool): Whether to print every record while processing
+
+    Raises:
+        ValueError: If the input is missing any of `input_columns`, or if `shared_session`
+            is set with `concurrency` or `retry_workers` above 1
+    """
+
+    def __init__(
+        self,
+        input_df: Union[pd.DataFrame, str, Path, Iterable[pd.DataFrame]],
+        evaluate_record: Callable[[pd.Series], Dict],
+        stage: str,
+        input_columns: List[str],
+        result_columns: List[str],
+        error_values: Optional[Dict] = None,
+        display_columns: Optional[List[str]] = None,
+        checkpoint_dir: str = "data/checkpoints",
+        job_id: Optional[str] = None,
+        resume_from_checkpoint: bool = False,
+        total_records: Optional[int] = None,
+        checkin_interval: int = 120,
+        checkpoint_interval: int = 10,
+        schedule: Optional[Callable[[pd.DataFrame], Sequence[int]]] = None,
+        metrics: Optional[JobMetrics] = None,
+        retry_failed: bool = False,
+        retry_workers: int = 1,
+        retry_attempts: int = 3,
+        concurrency: Union[int, str, AIMDController] = 1,
+        shared_session: bool = False,
+        model_name: Optional[str] = None,
+        chunksize: int = 10000,
+        input_defaults: Optional[Dict] = None,
+        checkpoint_format: str = 'csv',
+        compression: Optional[str] = None,
+        enum_codes: Union[bool, Dict] = False,
+        blob_store: Optional[BlobStore] = None,
+        blob_columns: Optional[List[str]] = None,
+        reuse_index=None,
+        reuse_threshold: float = 0.9,
+        debug: bool = True,
+        verbose: bool = True
+    ):
+        # Input validation
+        if isinstance(input_df, pd.DataFrame):
+            missing_defaults = {
+                col: value for col, value in (input_defaults or {}).items() if col not in input_df.columns
+            }
+            if missing_defaults:
+                input_df = input_df.assign(**missing_defaults)
+            missing_columns = [col for col in input_columns if col not in input_df.columns]
+            if missing_columns:
+                raise ValueError(f"Input DataFrame missing required columns: {missing_columns}")
+
+        self.input_df = input_df
+        self.chunksize = chunksize
+        self.input_defaults = input_defaults
+        self.evaluate_record = evaluate_record
+        self.stage = stage
+        self.input_columns = list(input_columns)
+        self.result_columns = list(result_columns)
+        self.reuse_index = reuse_index
+        self.reuse_threshold = reuse_threshold
+        if reuse_index is not None and 'Reused From' not in self.result_columns:
+            self.result_columns.append('Reused From')
+        self.columns = self.input_columns + self.result_columns + ['Processing Time']
+        self.error_values = error_values or {}
+        self.display_columns = display_columns if display_columns is not None else [
+            col for col in self.result_columns if 'Evaluation' not in col
+        ]
+        self.resume_from_checkpoint = resume_from_checkpoint
+        self.checkin_interval = checkin_interval
+        self.checkpoint_interval = checkpoint_interval
+        self.metrics = metrics
+        if isinstance(enum_codes, dict):
+            self.enum_columns = dict(enum_codes)
+        elif enum_codes:
+            self.enum_columns = {col: ENUM_COLUMNS[col] for col in self.result_columns if col in ENUM_COLUMNS}
+        else:
+            self.enum_columns = {}
+        self.blob_store = blob_store
+        self.blob_columns = [
+            col for col in (blob_columns or ['Evaluation', 'Full Fidelity Evaluation'])
+            if col in self.result_columns
+        ] if blob_store is not None else []
+        self.retry_failed = retry_failed
+        self.retry_workers = retry_workers
+        self.retry_attempts = retry_attempts
+        self.model_name = model_name
+        self.debug = debug
+        self.verbose = verbose
+
+        # Setup checkpoint directory
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+        # Generate job ID
+        self.job_id = job_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.checkpoint_file = self.checkpoint_dir / f"{stage}_classification_{self.job_id}.json"
+        self.results_store = open_results_store(
+            self.checkpoint_dir / f"{stage}_classification_{self.job_id}",
+            format=checkpoint_format,
+            compression=compression
+        )
+        self.results_file = self.results_store.path
+        self.dead_letters = DeadLetterStore(
+            self.checkpoint_dir / f"{stage}_classification_{self.job_id}_dead_letter.jsonl"
+        )
+
+        # Set total records; unknown for an iterable of chunks unless given
+        if isinstance(input_df, pd.DataFrame):
+            available = len(input_df)
+        elif isinstance(input_df, (str, Path)):
+            available = count_data_rows(input_df, chunksize=chunksize)
+        else:
+            available = None
+        self.total_records = total_records or available
+        if available is not None and self.total_records > available:
+            logger.warning(f"Requested {self.total_records} records but only {available} available")
+            self.total_records = available
+
+        # Determine processing order
+        self.schedule = schedule
+        self.schedule_name = getattr(schedule, 'name', type(schedule).__name__) if schedule is not None else None
+
+        # Configure concurrency
+        self.controller = None
+        self.max_concurrency = 1
+        if isinstance(concurrency, AIMDController):
+            self.controller = concurrency
+        elif concurrency == 'adaptive':
+            self.controller = get_controller(model_name or 'default', stage)
+        else:
+            self.max_concurrency = max(1, int(concurrency))
+
+        self.shared_session = shared_session
+        if shared_session:
+            max_workers = self.controller.max_limit if self.controller is not None else self.max_concurrency
+            if max_workers > 1 or retry_workers > 1:
+                raise ValueError(
+                    "A shared chat session cannot be used with concurrent evaluations; "
+                    "pass a client instead or set concurrency and retry_workers to 1"
+                )
+
+        self.start_index = None
+        self._rows_written = 0
+
+    def _prepare(self) -> int:
+        """
+        Loads checkpoint metadata when resuming and determines the start index.
+
+        Returns:
+            int: Index of the first record to process
+        """
+        if self.start_index is not None:
+            return self.start_index
+
+        self.start_index = 0
+        self._rows_written = 0
+
+        if self.resume_from_checkpoint and self.checkpoint_file.exists() and self.results_file.exists():
+            try:
+                # Load checkpoint metadata
+                with open(self.checkpoint_file, 'r') as f:
+                    checkpoint_data = json.load(f)
+                start_index = checkpoint_data['last_processed_index'] + 1
+                if checkpoint_data.get('schedule') != self.schedule_name:
+                    logger.warning(
+                        f"Checkpoint was written with schedule {checkpoint_data.get('schedule')} "
+                        f"but this job uses {self.schedule_name}. Resumed records may be skipped or repeated."
+                    )
+
+                # Drop rows appended after the last recorded checkpoint
+                rows_written = checkpoint_data.get('rows_written')
+                if rows_written is not None:
+                    self._truncate_results(rows_written)
+                    self._rows_written = rows_written
+                else:
+                    self._rows_written = self.results_store.count()
+
+                self.start_index = start_index
+                logger.info(f"Resuming from checkpoint at index {start_index}")
+                if self.debug:
+                    print(f"Resuming from checkpoint at index {start_index}")
+            except Exception as e:
+                logger.error(f"Error loading checkpoint: {str(e)}. Starting from beginning.")
+                self.start_index = 0
+                self._rows_written = 0
+
+        # Failures from an earlier run with the same job ID no longer apply
+        if self.start_index == 0:
+            self.dead_letters.clear()
+
+        return self.start_index
+
+    def _truncate_results(self, rows_written: int) -> None:
+        """
+        Trims the results file back to the number of rows recorded in the checkpoint.
+
+        Args:
+            rows_written (int): Number of result rows covered by the checkpoint
+        """
+        row_count = self.results_store.count()
+        if row_count > rows_written:
+            logger.warning(
+                f"Results file has {row_count} rows but checkpoint covers {rows_written}. Truncating."
+            )
+            self.results_store.truncate(rows_written)
+
+    def stream(self, batch_size: Optional[int] = None) -> Iterator[Union[Dict, pd.DataFrame]]:
+        """
+        Processes records and yields each one as soon as it has been evaluated.
+
+        Args:
+            batch_size (int, optional): If set, yields DataFrames of up to this many
+                rows instead of one dict per record
+
+        Yields:
+            Union[Dict, pd.DataFrame]: A completed result row, or a micro-batch of rows
+        """
+        start_index = self._prepare()
+        total_records = self.total_records
+
+        # Start tracking time
+        start_time = time.time()
+        last_checkin = start_time
+
+        logger.info(f"Starting job {self.job_id} to process {total_records} records at {datetime.now()}")
+
+        #Share the start of the job
+        if self.debug:
+            print(f"Starting job {self.job_id} to process {total_records} records.")
+            print('####################\n')
+
+        if self.metrics is not None:
+            self.metrics.start_job(
+                self.stage, self.job_id, total_records - start_index if total_records is not None else 0
+            )
+
+        # Rows handed to the consumer but not yet checkpointed, and rows waiting in an
+        # unfilled batch. Checkpoints only ever cover rows the consumer has received
+        pending = []
+        batch = []
+        sample = []
+        last_index = start_index - 1
+        last_step = start_index - 1
+        completed = False
+
+        try:
+            # Process records
+            for i, position, record, values, record_time in self._evaluated_records(start_index, total_records):
+                row = None
+                last_step = i
+
+                try:
+                    # Reading the record failed; handled like any other processing error
+                    if record is None:
+                        raise values
+
+                    # Progress update
+                    current_time = time.time()
+                    if current_time - last_checkin >= self.checkin_interval:
+                        self._report_progress(i, start_index, total_records, start_time, current_time)
+                        last_checkin = current_time
+
+                    # Debug output
+                    if self.debug and self.verbose:
+                        print(f'Analyzing Permission {i+1} of {total_records}...')
+                        for col in self.input_columns:
+                            print(_DEBUG_LABELS.get(col, f'{col}:'), record[col])
+                        print('--------------------')
+
+                    row = self._make_row(record, values, record_time)
+                    # Lets the retry pass find a failed record's error row in the results file
+                    self.dead_letters.set_result_row(position, self._rows_written + len(pending) + len(batch))
+                    if batch_size is None:
+                        pending.append(row)
+                        last_index = i
+
+                    if self.debug and self.verbose:
+                        for col in self.display_columns:
+                            print(f'{col}:', row[col])
+                        print('####################\n')
+
+                    # Checkpoint if needed
+                    if batch_size is None and (i + 1) % self.checkpoint_interval == 0:
+                        self._save_checkpoint(pending, last_index=i)
+                        pending = []
+
+                except Exception as e:
+                    logger.error(f"Error processing record {i}: {str(e)}")
+                    # Save checkpoint on error; rows of an unfilled batch stay unprocessed
+                    if not batch:
+                        last_index = i - 1
+                    self._save_checkpoint(pending, last_index=last_index)
+                    pending = []
+                    continue
+
+                if len(sample) < _SAMPLE_SIZE:
+                    sample.append(row)
+
+                if batch_size is None:
+                    yield row
+                else:
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        # The batch counts as delivered once it is handed over
+                        pending.extend(batch)
+                        last_index = i
+                        delivered, batch = batch, []
+                        yield self._encode(pd.DataFrame(delivered, columns=self.columns))
+                        if len(pending) >= self.checkpoint_interval:
+                            self._save_checkpoint(pending, last_index=last_index)
+                            pending = []
+
+            completed = True
+        finally:
+            if not completed:
+                # The consumer stopped early; keep what it has received resumable. Rows of
+                # an unfilled batch were never delivered and are evaluated again on resume
+                self._save_checkpoint(pending, last_index=last_index)
+                pending = []
+
+        self._report_completion(last_step + 1 - start_index, start_time, sample)
+        if self.metrics is not None:
+            self.metrics.publish()
+
+        # Save final results, including the last partial batch yielded below
+        final_index = total_records - 1 if total_records is not None else last_step
+        self._save_checkpoint(pending + batch, last_index=final_index, is_final=True)
+
+        if batch:
+            yield self._encode(pd.DataFrame(batch, columns=self.columns))
+
+    def _evaluate(self, position: int, record: pd.Series) -> Tuple[Dict, Optional[Exception]]:
+        """
+        Evaluates a single record, recording metrics and dead-lettering failures.
+
+        Args:
+            position (int): Positional index of the record in the input
+            record (pd.Series): Input record
+
+        Returns:
+            Tuple[Dict, Optional[Exception]]: Result column values for the record, and the
+                exception raised by the evaluation (None on success)
+        """
+        reused = self._reuse(record)
+        if reused is not None:
+            self.dead_letters.resolve(position)
+            return reused, None
+
+        if self.metrics is not None:
+            self.metrics.record_started()
+        token = activate_listeners(self.metrics, self.controller)
+        call_start = time.time()
+        error = None
+        try:
+            values = self._store_blobs(self.evaluate_record(record))
+            # A record that failed in an earlier run no longer needs a retry
+            self.dead_letters.resolve(position)
+            if self.controller is not None:
+                self.controller.on_success(time.time() - call_start)
+        except Exception as e:
+            logger.error(f"Error evaluating permission at index {position}: {str(e)}")
+            error = e
+            values = dict(self.error_values)
+            values['Evaluation'] = f"Error: {str(e)}"
+            self.dead_letters.add_failure(
+                position, {col: record[col] for col in self.input_columns}, e
+            )
+        finally:
+            deactivate_listeners(token)
+            if self.metrics is not None:
+                self.metrics.record_finished(time.time() - call_start, error=error is not None)
+                self.metrics.set_gauge('concurrency_limit', self._concurrency_limit())
+        return values, error
+
+    def _reuse(self, record: pd.Series) -> Optional[Dict]:
+        """Returns the result of a similar enough classified permission, if any."""
+        if self.reuse_index is None:
+            return None
+        match = self.reuse_index.best_match(record, self.reuse_threshold)
+        if match is None:
+            return None
+        neighbor, similarity = match
+        values = {col: neighbor.get(col) for col in self.result_columns}
+        values['Reused From'] = neighbor.get(self.reuse_index.key_column)
+        logger.debug(f"Reusing the result of {values['Reused From']} (similarity {similarity:.3f})")
+        return values
+
+    def _store_blobs(self, values: Dict) -> Dict:
+        """Moves verbose text values to the blob store and keeps their references."""
+        if not self.blob_columns:
+            return values
+        values = dict(values)
+        for col in self.blob_columns:
+            if isinstance(values.get(col), str):
+                values[col] = self.blob_store.put(values[col])
+        return values
+
+    def _evaluate_timed(self, position: int, record: pd.Series) -> Tuple[Dict, float]:
+        """Evaluates a record and returns its values with the processing time in seconds."""
+        record_start_time = time.time()
+        values, _ = self._evaluate(position, record)
+        return values, round(time.time() - record_start_time, 2)
+
+    def _concurrency_limit(self) -> int:
+        """Current number of evaluations allowed in flight."""
+        return self.controller.limit if self.controller is not None else self.max_concurrency
+
+    def _iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """Yields the input as DataFrame chunks; an in-memory DataFrame is a single chunk."""
+        if isinstance(self.input_df, pd.DataFrame):
+            yield self.input_df
+            return
+        yield from iter_data_chunks(
+            self.input_df,
+            chunksize=self.chunksize,
+            required_columns=self.input_columns,
+            default_columns=self.input_defaults
+        )
+
+    def _iter_records(self, start_index: int, total_records: Optional[int]) -> Iterator[Tuple]:
+        """
+        Yields input records from `start_index` in processing order.
+
+        Chunks before the start index are skipped without being scheduled. If a record
+        cannot be read, the exception is yielded in its place.
+
+        Yields:
+            Tuple: (step, position in the input, record or exception)
+        """
+        offset = 0
+        for chunk in self._iter_chunks():
+            chunk_size = len(chunk)
+            if offset + chunk_size <= start_index:
+                offset += chunk_size
+                continue
+
+            order = np.asarray(self.schedule(chunk)) if self.schedule is not None else None
+            for step in range(max(0, start_index - offset), chunk_size):
+                i = offset + step
+                if total_records is not None and i >= total_records:
+                    return
+                local_position = int(order[step]) if order is not None else step
+                try:
+                    record = chunk.iloc[local_position]
+                except Exception as e:
+                    record = e
+                yield i, offset + local_position, record
+            offset += chunk_size
+
+    def _evaluated_records(self, start_index: int, total_records: Optional[int]) -> Iterator[Tuple]:
+        """
+        Evaluates records from `start_index` and yields them in processing order.
+
+        With concurrency, evaluations run in a thread pool with at most the current limit
+        in flight, but results are still yielded in order so checkpoints stay consistent.
+        If a record cannot be read, None is yielded in its place together with the exception.
+
+        Yields:
+            Tuple: (step, position in the input, record, result values, processing time)
+        """
+        records = self._iter_records(start_index, total_records)
+
+        if self.controller is None and self.max_concurrency == 1:
+            for i, position, record in records:
+                if isinstance(record, Exception):
+                    yield i, position, None, record, None
+                    continue
+                values, record_time = self._evaluate_timed(position, record)
+                yield i, position, record, values, record_time
+            return
+
+        max_workers = self.controller.max_limit if self.controller is not None else self.max_concurrency
+        window = deque()
+        exhausted = False
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            try:
+                while True:
+                    # Keep up to the current limit of evaluations in flight
+                    while not exhausted and len(window) < self._concurrency_limit():
+                        next_record = next(records, None)
+                        if next_record is None:
+                            exhausted = True
+                            break
+                        i, position, record = next_record
+                        if isinstance(record, Exception):
+                            window.append((i, position, None, record))
+                        else:
+                            window.append((i, position, record, executor.submit(self._evaluate_timed, position, record)))
+
+                    if not window:
+                        break
+                    i, position, record, future = window.popleft()
+                    if record is None:
+                        yield i, position, None, future, None
+                        continue
+                    values, record_time = future.result()
+                    yield i, position, record, values, record_time
+            finally:
+                # The consumer stopped early; drop evaluations that have not started
+                for _, _, _, future in window:
+                    if hasattr(future, 'cancel'):
+                        future.cancel()
+
+    def _encode(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Stores rating/label columns as integer codes when `enum_codes` is enabled."""
+        return encode_enum_columns(df, self.enum_columns) if self.enum_columns else df
+
+    def _make_row(self, record: pd.Series, values: Dict, record_time: float) -> Dict:
+        """Builds a result row from the input record and the evaluated values."""
+        row = {col: record[col] for col in self.input_columns}
+        row.update({col: values.get(col) for col in self.result_columns})
+        row['Processing Time'] = record_time
+        return row
+
+    def retry_dead_letters(
+        self,
+        max_workers: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        initial_delay: float = 2.0,
+        max_delay: float = 60.0,
+        multiplier: float = 2.0
+    ) -> pd.DataFrame:
+        """
+        Re-evaluates only the dead-lettered records and merges them into the results file.
+
+        Each record is retried with exponential backoff until it succeeds or runs out of
+        attempts. Records that still fail stay in the dead-letter store with their attempt
+        count updated. When `max_workers` > 1, pass a client rather than a shared chat
+        session to the classifier so concurrent evaluations do not share chat history.
+
+        Args:
+            max_workers (int, optional): Concurrent evaluations. Defaults to `retry_workers`
+            max_attempts (int, optional): Attempts per record. Defaults to `retry_attempts`
+            initial_delay (float): Seconds to wait after the first failed attempt
+            max_delay (float): Maximum seconds to wait between attempts
+            multiplier (float): Factor the delay grows by after each failed attempt
+
+        Returns:
+            pd.DataFrame: Result rows for the records that succeeded, indexed by the row of the
+                results file holding the record's error row (missing if it was never written)
+
+        Raises:
+            ValueError: If the job uses a shared chat session and `max_workers` is above 1
+        """
+        max_workers = max_workers or self.retry_workers
+        max_attempts = max_attempts or self.retry_attempts
+        if self.shared_session and max_workers > 1:
+            raise ValueError("A shared chat session cannot be used with concurrent retries")
+        entries = self.dead_letters.pending()
+        if not entries:
+            return pd.DataFrame(columns=self.columns, index=pd.Index([], dtype='Int64'))
+
+        logger.info(f"Retrying {len(entries)} dead-lettered records for job {self.job_id}")
+        if self.debug:
+            print(f"Retrying {len(entries)} failed records with {max_workers} worker(s).")
+
+        def retry_entry(entry: Dict) -> Optional[Tuple[Optional[int], Dict]]:
+            record = pd.Series(entry['record'])
+            delay = initial_delay
+            for attempt in range(1, max_attempts + 1):
+                record_start_time = time.time()
+                values, error = self._evaluate(entry['position'], record)
+                if error is None:
+                    self.dead_letters.mark_resolved(entry)
+                    return entry.get('result_row'), self._make_row(record, values, round(time.time() - record_start_time, 2))
+                if attempt < max_attempts:
+                    time.sleep(delay)
+                    delay = min(delay * multiplier, max_delay)
+            return None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            retried = [result for result in executor.map(retry_entry, entries) if result is not None]
+
+        retried_df = self._encode(pd.DataFrame(
+            [row for _, row in retried],
+            index=pd.Index([result_row for result_row, _ in retried], dtype='Int64'),
+            columns=self.columns
+        ))
+        if not retried_df.empty and self.results_file.exists():
+            self._merge_into_results_file(retried_df)
+
+        logger.info(f"Retry pass recovered {len(retried_df)} of {len(entries)} records")
+        if self.debug:
+            print(f"Retry pass recovered {len(retried_df)} of {len(entries)} records.")
+        return retried_df
+
+    def _merge_into_results_file(self, retried_df: pd.DataFrame) -> None:
+        """Replaces error rows in the results file with retried rows, one chunk at a time."""
+        def merged_chunks():
+            offset = 0
+            for chunk in self.results_store.iter_chunks():
+                yield self._encode(_apply_retried(chunk, retried_df, offset=offset))
+                offset += len(chunk)
+
+        self.results_store.rewrite(merged_chunks())
+
+    def run(self) -> pd.DataFrame:
+        """
+        Processes all records and returns the results as a DataFrame.
+
+        When resuming from a checkpoint, previously saved results are included.
+
+        Returns:
+            pd.DataFrame: Results DataFrame for the stage
+        """
+        start_index = self._prepare()
+
+        frames = []
+        if start_index > 0 and self.results_file.exists():
+            frames.append(self.results_store.read())
+
+        rows = list(self.stream())
+        frames.append(pd.DataFrame(rows, columns=self.columns))
+
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame(columns=self.columns)
+        results_df = pd.concat(frames, ignore_index=True)
+
+        if self.retry_failed and len(self.dead_letters):
+            retried_df = self.retry_dead_letters()
+            results_df = _apply_retried(results_df, retried_df)
+
+        return self._encode(results_df)
+
+    def _report_progress(
+        self,
+        i: int,
+        start_index: int,
+        total_records: Optional[int],
+        start_time: float,
+        current_time: float
+    ) -> None:
+        """Logs progress and estimated time remaining."""
+        elapsed = current_time - start_time
+        if total_records is None:
+            logger.info(f"Progress: {i+1} records ({(i + 1 - start_index) / elapsed:.2f} records/s)")
+            if self.debug:
+                print(f"Progress: {i+1} records processed.")
+            return
+        rate = (i + 1 - start_index) / elapsed
+        remaining = (total_records - (i + 1)) / rate if rate > 0 else 0
+        logger.info(
+            f"Progress: {i+1}/{total_records} records "
+            f"({(i+1)/total_records*100:.1f}%). "
+            f"Est. time remaining: {remaining/60:.1f} minutes"
+        )
+        if self.debug:
+            print(f"Progress: ({(i+1)/total_records*100:.1f}%) {i+1}/{total_records} records ---> Est. time remaining: {remaining/60:.1f} minutes.")
+
+    def _report_completion(
+        self,
+        processed: int,
+        start_time: float,
+        sample: List[Dict]
+    ) -> None:
+        """Logs final statistics for the job."""
+        end_time = time.time()
+        total_time = end_time - start_time
+        avg_time = total_time / processed if processed > 0 else 0
+
+        logger.info(
+            f"Processing completed at {datetime.now()}. "
+            f"Total time: {total_time:.2f}s. "
+            f"Average per record: {avg_time:.2f}s"
+        )
+
+        if self.debug:
+            print('\n####################')
+            print(f"Total time taken: {total_time:.2f} seconds to process {processed} records.")
+            print(f"Average time per record: {avg_time:.2f} seconds")
+            if self.verbose:
+                print('\nSample Output of Results:')
+                print(pd.DataFrame(sample, columns=self.columns).head())
+                print()
+
+    def _save_checkpoint(
+        self,
+        pending: List[Dict],
+        last_index: int,
+        is_final: bool = False
+    ) -> None:
+        """
+        Appends pending rows to the results file and saves checkpoint metadata.
+
+        Args:
+            pending (List[Dict]): Rows completed since the last checkpoint
+            last_index (int): Index of last processed record
+            is_final (bool): Whether this is the final checkpoint
+        """
+        try:
+            # Append results; the first write of a fresh job replaces any old file
+            write_header = self._rows_written == 0
+            if pending or write_header:
+                self.results_store.append(
+                    self._encode(pd.DataFrame(pending, columns=self.columns)), overwrite=write_header
+                )
+                self._rows_written += len(pending)
+
+            # Save checkpoint metadata
+            checkpoint_data = {
+                'job_id': self.job_id,
+                'last_processed_index': last_index,
+                'rows_written': self._rows_written,
+                'schedule': self.schedule_name,
+                'timestamp': datetime.now().isoformat(),
+                'is_final': is_final
+            }
+            with open(self.checkpoint_file, 'w') as f:
+                json.dump(checkpoint_data, f)
+
+            logger.debug(f"Checkpoint saved at index {last_index}")
+        except Exception as e:
+            logger.error(f"Error saving checkpoint: {str(e)}")
+
+
+def _apply_retried(results_df: pd.DataFrame, retried_df: pd.DataFrame, offset: int = 0) -> pd.DataFrame:
+    """
+    Replaces error rows in a results DataFrame with the matching retried rows.
+
+    Rows are matched by their row in the results file, which the dead-letter store
+    records for every failed input position, so records sharing an API Name never
+    overwrite each other's rows.
+
+    Args:
+        results_df (pd.DataFrame): Results containing error rows
+        retried_df (pd.DataFrame): Successfully retried rows, indexed by results file row
+            as returned by `ClassificationJob.retry_dead_letters`
+        offset (int): Row of the results file that `results_df` starts at
+
+    Returns:
+        pd.DataFrame: Results with the retried rows merged in
+    """
+    if retried_df.empty:
+        return results_df
+
+    rows = retried_df.index.to_numpy(dtype='float64', na_value=np.nan)
+    local = rows - offset
+    known = ~np.isnan(local) & (local >= 0) & (local < len(results_df))
+    if not known.any():
+        return results_df
+    replacements = retried_df[known]
+    local = local[known].astype(np.int64)
+
+    # Only rows still holding an error are replaced
+    is_error = results_df['Evaluation'].astype(str).str.startswith('Error: ').to_numpy()[local]
+    if not is_error.any():
+        return results_df
+    replacements = replacements[is_error]
+    local = local[is_error]
+
+    results_df = results_df.copy()
+    for col in replacements.columns:
+        if col in results_df.columns:
+            results_df[col] = results_df[col].astype(object)
+            results_df.iloc[local, results_df.columns.get_loc(col)] = replacements[col].to_numpy(dtype=object)
+    return results_df
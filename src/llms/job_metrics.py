@@ -0,0 +1,291 @@
+"""
+Live metrics for running classification jobs.
+
+A `JobMetrics` registry is updated by the job engine as records are evaluated and
+can be watched through a Prometheus-format text file, a local HTTP endpoint or
+Python callbacks. Code deep inside an evaluation (the retry predicate, fallback
+extractors) reports events with `emit_event`, which routes them to the listeners
+(metrics registry, concurrency controller) of the job currently evaluating a record.
+"""
+
+import contextvars
+import threading
+import time
+import logging
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, Callable, Dict, List
+
+import numpy as np
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Event listeners of the job evaluating a record in the current context
+_active_listeners: contextvars.ContextVar = contextvars.ContextVar('active_listeners', default=())
+
+# Prefix for all exported metric names
+METRIC_PREFIX = 'sfdc_permission_job'
+
+def emit_event(name: str, **labels) -> None:
+    """
+    Reports an event to the listeners of the active job, if any.
+
+    Args:
+        name (str): Event name, e.g. 'retry' or 'fallback'
+        **labels: Event labels, e.g. code=429 or kind='rating'
+    """
+    for listener in _active_listeners.get():
+        try:
+            listener.record_event(name, **labels)
+        except Exception as e:
+            logger.error(f"Error handling event {name}: {str(e)}")
+
+def activate_listeners(*listeners) -> contextvars.Token:
+    """
+    Makes objects with a `record_event` method receive events emitted in the current context.
+
+    Args:
+        *listeners: Listeners to activate; None values are ignored
+
+    Returns:
+        contextvars.Token: Token to pass to `deactivate_listeners`
+    """
+    return _active_listeners.set(tuple(listener for listener in listeners if listener is not None))
+
+def deactivate_listeners(token: contextvars.Token) -> None:
+    """Restores the listeners that were active before `activate_listeners`."""
+    _active_listeners.reset(token)
+
+class JobMetrics:
+    """
+    Thread-safe metrics registry for a classification job.
+
+    Tracks records/sec, in-flight evaluations, call latency percentiles, errors,
+    retry counts by status code and how often fallback extraction was used.
+
+    Args:
+        latency_window (int): Number of most recent call latencies kept for percentiles
+        prometheus_path (str, optional): File the Prometheus text exposition is written to
+        publish_interval (float): Minimum seconds between publishes to file and callbacks
+        callbacks (List[Callable], optional): Functions called with a snapshot dict on publish
+
+    Example:
+        >>> metrics = JobMetrics(prometheus_path='data/checkpoints/risk.prom')
+        >>> metrics.serve(port=9108)
+        >>> results = classify_risk_rating(df, prompt, client=client, metrics=metrics)
+    """
+
+    def __init__(
+        self,
+        latency_window: int = 1000,
+        prometheus_path: Optional[str] = None,
+        publish_interval: float = 10.0,
+        callbacks: Optional[List[Callable[[Dict], None]]] = None
+    ):
+        self.prometheus_path = Path(prometheus_path) if prometheus_path else None
+        self.publish_interval = publish_interval
+        self.callbacks = list(callbacks or [])
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_window)
+        self._server = None
+        self._last_publish = 0.0
+
+        self.stage = None
+        self.job_id = None
+        self.total_records = 0
+        self.start_time = None
+        self.records = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.retries: Dict[str, int] = {}
+        self.fallbacks: Dict[str, int] = {}
+        self.gauges: Dict[str, float] = {}
+
+    def add_callback(self, callback: Callable[[Dict], None]) -> None:
+        """Registers a function that is called with a snapshot dict on every publish."""
+        self.callbacks.append(callback)
+
+    def start_job(self, stage: str, job_id: str, total_records: int) -> None:
+        """Resets the registry at the start of a job."""
+        with self._lock:
+            self.stage = stage
+            self.job_id = job_id
+            self.total_records = total_records
+            self.start_time = time.time()
+            self.records = 0
+            self.errors = 0
+            self.in_flight = 0
+            self.retries = {}
+            self.fallbacks = {}
+            self.gauges = {}
+            self._latencies.clear()
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Sets an additional gauge exported alongside the built-in metrics."""
+        with self._lock:
+            self.gauges[name] = value
+
+    def record_started(self) -> None:
+        """Marks a record evaluation as in flight."""
+        with self._lock:
+            self.in_flight += 1
+
+    def record_finished(self, latency: float, error: bool = False) -> None:
+        """
+        Marks a record evaluation as complete.
+
+        Args:
+            latency (float): Seconds the evaluation took
+            error (bool): Whether the evaluation raised
+        """
+        with self._lock:
+            self.in_flight -= 1
+            self.records += 1
+            if error:
+                self.errors += 1
+            self._latencies.append(latency)
+        self.maybe_publish()
+
+    def record_event(self, name: str, **labels) -> None:
+        """Counts an event reported through `emit_event`."""
+        with self._lock:
+            if name == 'retry':
+                code = str(labels.get('code'))
+                self.retries[code] = self.retries.get(code, 0) + 1
+            elif name == 'fallback':
+                kind = str(labels.get('kind'))
+                self.fallbacks[kind] = self.fallbacks.get(kind, 0) + 1
+            else:
+                logger.debug(f"Ignoring unknown metrics event: {name}")
+
+    def snapshot(self) -> Dict:
+        """
+        Returns the current metric values.
+
+        Returns:
+            Dict: Metric values keyed by name
+        """
+        with self._lock:
+            elapsed = time.time() - self.start_time if self.start_time else 0.0
+            latencies = np.fromiter(self._latencies, dtype=float)
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+            fallback_total = sum(self.fallbacks.values())
+            return {
+                'stage': self.stage,
+                'job_id': self.job_id,
+                'total_records': self.total_records,
+                'records': self.records,
+                'records_per_second': self.records / elapsed if elapsed > 0 else 0.0,
+                'in_flight': self.in_flight,
+                'latency_p50': float(p50),
+                'latency_p95': float(p95),
+                'latency_p99': float(p99),
+                'errors': self.errors,
+                'error_rate': self.errors / self.records if self.records else 0.0,
+                'retries': dict(self.retries),
+                'fallbacks': dict(self.fallbacks),
+                'fallback_rate': fallback_total / self.records if self.records else 0.0,
+                'gauges': dict(self.gauges),
+                'elapsed_seconds': elapsed
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        Renders the current metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Prometheus text exposition
+        """
+        snap = self.snapshot()
+        job_labels = f'stage="{snap["stage"]}",job_id="{snap["job_id"]}"'
+        lines = []
+
+        def add(name, metric_type, help_text, samples):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {metric_type}")
+            for extra_labels, value in samples:
+                labels = f"{job_labels},{extra_labels}" if extra_labels else job_labels
+                lines.append(f"{METRIC_PREFIX}_{name}{{{labels}}} {value}")
+
+        add('records_total', 'counter', 'Records evaluated.', [('', snap['records'])])
+        add('records_planned', 'gauge', 'Records scheduled for this job.', [('', snap['total_records'])])
+        add('records_per_second', 'gauge', 'Average evaluation throughput.', [('', snap['records_per_second'])])
+        add('in_flight', 'gauge', 'Evaluations currently in flight.', [('', snap['in_flight'])])
+        add('call_latency_seconds', 'summary', 'Evaluation call latency.', [
+            ('quantile="0.5"', snap['latency_p50']),
+            ('quantile="0.95"', snap['latency_p95']),
+            ('quantile="0.99"', snap['latency_p99'])
+        ])
+        add('errors_total', 'counter', 'Evaluations that raised.', [('', snap['errors'])])
+        add('retries_total', 'counter', 'Retried API calls by status code.',
+            [(f'code="{code}"', count) for code, count in sorted(snap['retries'].items())])
+        add('fallbacks_total', 'counter', 'Structured outputs recovered by fallback extraction.',
+            [(f'kind="{kind}"', count) for kind, count in sorted(snap['fallbacks'].items())])
+        for name, value in sorted(snap['gauges'].items()):
+            add(name, 'gauge', f'Job gauge {name}.', [('', value)])
+
+        return "\n".join(lines) + "\n"
+
+    def maybe_publish(self) -> None:
+        """Publishes if at least `publish_interval` seconds passed since the last publish."""
+        if time.time() - self._last_publish >= self.publish_interval:
+            self.publish()
+
+    def publish(self) -> None:
+        """Writes the Prometheus text file and invokes the registered callbacks."""
+        self._last_publish = time.time()
+
+        if self.prometheus_path:
+            try:
+                self.prometheus_path.parent.mkdir(parents=True, exist_ok=True)
+                # Write to a temporary file first so scrapers never see a partial file
+                tmp_path = self.prometheus_path.with_suffix(self.prometheus_path.suffix + '.tmp')
+                tmp_path.write_text(self.to_prometheus())
+                tmp_path.replace(self.prometheus_path)
+            except Exception as e:
+                logger.error(f"Error writing metrics file: {str(e)}")
+
+        if self.callbacks:
+            snap = self.snapshot()
+            for callback in self.callbacks:
+                try:
+                    callback(snap)
+                except Exception as e:
+                    logger.error(f"Error in metrics callback: {str(e)}")
+
+    def serve(self, port: int = 9108, host: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """
+        Serves the metrics at http://host:port/metrics from a background thread.
+
+        Args:
+            port (int): Port to listen on
+            host (str): Interface to bind to
+
+        Returns:
+            ThreadingHTTPServer: The running server; call `shutdown()` to stop it
+        """
+        metrics = self
+
+        class _MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip('/') not in ('', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        self._server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        thread.start()
+        logger.info(f"Serving job metrics at http://{host}:{port}/metrics")
+        return self._server
@@ -0,0 +1,36 @@
+"""
+Few-shot placeholder handling shared by the classification prompts.
+"""
+
+from typing import Callable
+
+import pandas as pd
+
+# Placeholder of the compact templates filled by `FewShotSelector.fill_prompt`
+FEW_SHOT_PLACEHOLDER = '{few_shot_examples}'
+
+# Text filled in when no labeled example is available
+NO_EXAMPLES_TEXT = 'No labeled examples available.'
+
+def prepare_prompt(prompt: str, few_shot=None) -> Callable[[pd.Series], str]:
+    """
+    Prepares a prompt template for per-record few-shot examples.
+
+    Args:
+        prompt (str): Prompt template, optionally with a `{few_shot_examples}` placeholder
+        few_shot (FewShotSelector, optional): Selector filling the placeholder per record.
+            Without one, the placeholder of a compact template is filled with `NO_EXAMPLES_TEXT`
+
+    Returns:
+        Callable[[pd.Series], str]: Returns the template for a record
+
+    Raises:
+        ValueError: If `few_shot` is given for a prompt without the placeholder
+    """
+    if few_shot is None:
+        # A compact template used without retrieval gets no examples
+        prompt = prompt.replace(FEW_SHOT_PLACEHOLDER, NO_EXAMPLES_TEXT)
+        return lambda record: prompt
+    if FEW_SHOT_PLACEHOLDER not in prompt:
+        raise ValueError(f"Prompt has no {FEW_SHOT_PLACEHOLDER} placeholder for the few-shot examples")
+    return lambda record: few_shot.fill_prompt(prompt, record)
@@ -0,0 +1,205 @@
+"""
+Storage backends for the rows a classification job checkpoints.
+
+`CsvResultsStore` appends to a single CSV file. `ColumnarResultsStore` writes each
+checkpoint as a Parquet or Arrow IPC part file in a directory, with enum columns
+stored as categoricals, so large results are re-read faster and take less space.
+"""
+
+import logging
+import shutil
+from pathlib import Path
+from typing import Iterator, Iterable, List, Optional
+
+import pandas as pd
+
+from ..utils.data_utils import COLUMNAR_FORMATS, write_columnar, read_columnar
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Rows read at a time when scanning a results file
+_READ_CHUNKSIZE = 10000
+
+class CsvResultsStore:
+    """
+    Results stored in a single CSV file that checkpoints append to.
+
+    Args:
+        path (Path): Path of the CSV file
+    """
+
+    format = 'csv'
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def exists(self) -> bool:
+        """Whether results have been written."""
+        return self.path.exists()
+
+    def append(self, df: pd.DataFrame, overwrite: bool = False) -> None:
+        """
+        Appends rows to the results.
+
+        Args:
+            df (pd.DataFrame): Rows to append
+            overwrite (bool): Whether to replace existing results instead
+        """
+        df.to_csv(self.path, mode='w' if overwrite else 'a', header=overwrite, index=False)
+
+    def read(self) -> pd.DataFrame:
+        """Reads all stored rows."""
+        return pd.read_csv(self.path)
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """Yields the stored rows in chunks."""
+        yield from pd.read_csv(self.path, chunksize=_READ_CHUNKSIZE)
+
+    def count(self) -> int:
+        """Counts the stored rows."""
+        return sum(len(chunk) for chunk in self.iter_chunks())
+
+    def truncate(self, rows: int) -> None:
+        """Keeps only the first `rows` rows."""
+        pd.read_csv(self.path, nrows=rows).to_csv(self.path, index=False)
+
+    def rewrite(self, chunks: Iterable[pd.DataFrame]) -> None:
+        """Replaces the stored rows with `chunks` through a temporary file."""
+        tmp_file = self.path.with_suffix(self.path.suffix + '.tmp')
+        first_chunk = True
+        for chunk in chunks:
+            chunk.to_csv(tmp_file, mode='w' if first_chunk else 'a', header=first_chunk, index=False)
+            first_chunk = False
+        tmp_file.replace(self.path)
+
+class ColumnarResultsStore:
+    """
+    Results stored as a directory of Parquet or Arrow IPC part files, one per checkpoint.
+
+    Part files are written under a temporary name and renamed into place, so readers
+    never see a partial part. The directory can be read directly with
+    `pd.read_parquet(path)` for Parquet results.
+
+    Args:
+        path (Path): Directory holding the part files
+        format (str): 'parquet' or 'arrow'
+        compression (str, optional): Compression codec passed to `write_columnar`
+    """
+
+    def __init__(self, path: Path, format: str = 'parquet', compression: Optional[str] = None):
+        if format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unsupported columnar format: {format}")
+        self.path = Path(path)
+        self.format = format
+        self.compression = compression
+
+    def _parts(self) -> List[Path]:
+        if not self.path.exists():
+            return []
+        return sorted(self.path.glob(f"part-*.{self.format}"))
+
+    def exists(self) -> bool:
+        """Whether results have been written."""
+        return self.path.exists()
+
+    def _write_part(self, df: pd.DataFrame, part_number: int, directory: Optional[Path] = None) -> None:
+        directory = directory or self.path
+        part_file = directory / f"part-{part_number:06d}.{self.format}"
+        tmp_file = part_file.with_suffix(part_file.suffix + '.tmp')
+        write_columnar(df, tmp_file, format=self.format, compression=self.compression)
+        tmp_file.replace(part_file)
+
+    def append(self, df: pd.DataFrame, overwrite: bool = False) -> None:
+        """
+        Appends rows to the results as a new part file.
+
+        Args:
+            df (pd.DataFrame): Rows to append
+            overwrite (bool): Whether to replace existing results instead
+        """
+        if overwrite and self.path.exists():
+            shutil.rmtree(self.path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        if df.empty:
+            return
+        parts = self._parts()
+        next_part = int(parts[-1].stem.split('-')[1]) + 1 if parts else 0
+        self._write_part(df, next_part)
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """Yields the stored rows one part file at a time."""
+        for part in self._parts():
+            yield read_columnar(part)
+
+    def read(self) -> pd.DataFrame:
+        """Reads all stored rows, keeping enum columns categorical."""
+        frames = list(self.iter_chunks())
+        if not frames:
+            return pd.DataFrame()
+        categorical = [
+            col for col in frames[0].columns
+            if any(isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames)
+        ]
+        results_df = pd.concat(frames, ignore_index=True)
+        return results_df.astype({col: 'category' for col in categorical}) if categorical else results_df
+
+    def count(self) -> int:
+        """Counts the stored rows from the part file metadata."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        total = 0
+        for part in self._parts():
+            if self.format == 'parquet':
+                total += pq.ParquetFile(part).metadata.num_rows
+            else:
+                with pa.memory_map(str(part), 'r') as source:
+                    total += pa.ipc.open_file(source).read_all().num_rows
+        return total
+
+    def truncate(self, rows: int) -> None:
+        """Keeps only the first `rows` rows, dropping or trimming trailing part files."""
+        kept = 0
+        for part in self._parts():
+            if kept >= rows:
+                part.unlink()
+                continue
+            part_df = read_columnar(part)
+            if kept + len(part_df) > rows:
+                part_df = part_df.iloc[:rows - kept]
+                self._write_part(part_df, int(part.stem.split('-')[1]))
+            kept += len(part_df)
+
+    def rewrite(self, chunks: Iterable[pd.DataFrame]) -> None:
+        """Replaces the stored rows with `chunks` through a temporary directory."""
+        tmp_dir = self.path.with_name(self.path.name + '.tmp')
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+        for part_number, chunk in enumerate(chunks):
+            self._write_part(chunk, part_number, directory=tmp_dir)
+        shutil.rmtree(self.path)
+        tmp_dir.rename(self.path)
+
+def open_results_store(base_path: Path, format: str = 'csv', compression: Optional[str] = None):
+    """
+    Creates the results store for a job.
+
+    Args:
+        base_path (Path): Results path without extension
+        format (str): 'csv', 'parquet' or 'arrow'
+        compression (str, optional): Compression codec for columnar formats
+
+    Returns:
+        Union[CsvResultsStore, ColumnarResultsStore]: The store; its `path` carries the format extension
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    base_path = Path(base_path)
+    if format == 'csv':
+        return CsvResultsStore(base_path.with_name(base_path.name + '.csv'))
+    if format in COLUMNAR_FORMATS:
+        return ColumnarResultsStore(base_path.with_name(f"{base_path.name}.{format}"), format, compression)
+    raise ValueError(f"Unsupported checkpoint format: {format}")
@@ -18,6 +18,8 @@ import logging
 import json
 
 from .chat_session import create_chat_session
+from .job_metrics import emit_event
+from .enum_matcher import EnumMatcher
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -41,6 +43,9 @@ class RiskRating(enum.Enum):
             logger.warning(f"Invalid risk rating value: {value}. Defaulting to GENERAL.")
             return cls.GENERAL
 
+# Fallback matcher for evaluation text; mentions are matched in declaration order
+_RATING_MATCHER = EnumMatcher(RiskRating, default=RiskRating.GENERAL)
+
 def risk_eval_summary(
     prompt: str,
     name: str,
@@ -140,18 +145,5 @@ def _extract_fallback_rating(eval_text: str) -> RiskRating:
     Returns:
         RiskRating: Extracted rating or GENERAL as default
     """
-    try:
-        # Look for rating keywords in the text
-        text_lower = eval_text.lower()
-        if "mission critical" in text_lower or "mission_critical" in text_lower:
-            return RiskRating.MISSION_CRITICAL
-        elif "restricted" in text_lower:
-            return RiskRating.RESTRICTED
-        elif "sensitive" in text_lower:
-            return RiskRating.SENSITIVE
-        elif "controlled" in text_lower:
-            return RiskRating.CONTROLLED
-        else:
-            return RiskRating.GENERAL
-    except Exception:
-        return RiskRating.GENERAL 
\ No newline at end of file
+    emit_event('fallback', kind='rating')
+    return _RATING_MATCHER.match(eval_text)
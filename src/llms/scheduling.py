@@ -0,0 +1,102 @@
+"""
+Scheduling policies that decide the order in which a classification job processes records.
+"""
+
+import numpy as np
+import pandas as pd
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Reference lists in the repository's data/input, independent of the working directory
+INPUT_DIR = Path(__file__).resolve().parents[2] / 'data' / 'input'
+HIGH_RISK_PERMS_PATH = INPUT_DIR / 'user_permission_reference_data__sf_ben_ten_high_risk_perms.csv'
+SECURITY_CENTER_SCOPE_PATH = INPUT_DIR / 'user_permission_reference_data__security_center_scope.csv'
+
+def load_priority_list(
+    high_risk_path: Optional[Union[str, Path]] = HIGH_RISK_PERMS_PATH,
+    security_center_path: Optional[Union[str, Path]] = SECURITY_CENTER_SCOPE_PATH
+) -> List[str]:
+    """
+    Builds an ordered list of API Names that should be classified first.
+
+    Known high-risk permissions come first, ordered by their rank (unranked entries
+    last), followed by the permissions in Security Center scope in file order.
+
+    Args:
+        high_risk_path (str, optional): CSV of high-risk permissions with 'API Name' and 'Rank' columns
+        security_center_path (str, optional): CSV of Security Center permissions with an 'API Name' column
+
+    Returns:
+        List[str]: API Names in priority order, without duplicates
+    """
+    priority_list = []
+
+    if high_risk_path:
+        high_risk_df = pd.read_csv(high_risk_path)
+        if 'Rank' in high_risk_df.columns:
+            rank = pd.to_numeric(high_risk_df['Rank'], errors='coerce')
+            high_risk_df = high_risk_df.assign(_rank=rank).sort_values('_rank', kind='stable', na_position='last')
+        priority_list.extend(high_risk_df['API Name'].astype(str).str.strip())
+
+    if security_center_path:
+        security_center_df = pd.read_csv(security_center_path)
+        priority_list.extend(security_center_df['API Name'].astype(str).str.strip())
+
+    # Keep the first (highest priority) occurrence of each API Name
+    return list(dict.fromkeys(priority_list))
+
+class PrioritySchedule:
+    """
+    Orders records so that permissions on the priority list are processed first.
+
+    Records on the priority list are processed in list order; all other records keep
+    their file order after them. Instances are passed to `ClassificationJob` (or any
+    classifier) as the `schedule` option.
+
+    Args:
+        priority_list (List[str], optional): API Names in priority order. If None, loads the
+            high-risk and Security Center reference lists from `data/input`
+        api_name_column (str): Column holding the API Name in the input DataFrame
+
+    Example:
+        >>> results = classify_risk_rating(
+        ...     perm_list_df,
+        ...     prompt,
+        ...     client=client,
+        ...     schedule=PrioritySchedule()
+        ... )
+    """
+
+    name = 'priority'
+
+    def __init__(
+        self,
+        priority_list: Optional[List[str]] = None,
+        api_name_column: str = 'API Name'
+    ):
+        if priority_list is None:
+            priority_list = load_priority_list()
+        self.priorities: Dict[str, int] = {api_name: rank for rank, api_name in enumerate(priority_list)}
+        self.api_name_column = api_name_column
+
+    def __call__(self, input_df: pd.DataFrame) -> np.ndarray:
+        """
+        Computes the processing order for an input DataFrame.
+
+        Args:
+            input_df (pd.DataFrame): Input DataFrame to schedule
+
+        Returns:
+            np.ndarray: Positional indices of the records in processing order
+        """
+        api_names = input_df[self.api_name_column].astype(str).str.strip()
+        priority = api_names.map(self.priorities).fillna(len(self.priorities)).to_numpy()
+        order = np.argsort(priority, kind='stable')
+
+        prioritized = int((priority < len(self.priorities)).sum())
+        logger.info(f"Scheduled {prioritized} of {len(input_df)} records ahead of file order")
+        return order
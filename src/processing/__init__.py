@@ -2,6 +2,7 @@
 Processing module for data transformation and extraction.
 """
 
-from .json_processor import extract_json_fields, clean_json_string
+from .json_processor import extract_json_fields, extract_json_fields_from_file, clean_json_string
+from .eval_schemas import extract_typed_fields, get_schema
  
-__all__ = ['extract_json_fields', 'clean_json_string'] 
\ No newline at end of file
+__all__ = ['extract_json_fields', 'extract_json_fields_from_file', 'clean_json_string', 'extract_typed_fields', 'get_schema'] 
\ No newline at end of file
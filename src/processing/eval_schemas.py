@@ -0,0 +1,273 @@
+"""
+Output schemas of the evaluation prompts and typed extraction of evaluation JSON.
+
+Each stage's schema names the JSON keys the model returns, the column each key is
+extracted to and its type. Allowed values of tier/label fields and the score
+criteria are read from the "# Output Schema" block of the stage's prompt template,
+so the template stays the single documented source of the output format.
+
+`extract_typed_fields` validates every evaluation against its schema and returns
+numeric, categorical and per-criterion score columns ready for vectorized analysis.
+"""
+
+import re
+import json
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .json_processor import _clean_json_series, _parse_json_column
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Directory holding the prompt templates
+TEMPLATES_DIR = Path(__file__).resolve().parents[1] / 'prompts' / 'templates'
+
+# Confidence levels from lowest to highest
+CONFIDENCE_LEVELS = ['Low', 'Medium', 'High']
+
+# Range of the per-criterion scores
+SCORE_RANGE = (1, 5)
+
+# Field kinds:
+#   'tier'   ordered categorical, categories in template order (lowest first)
+#   'label'  unordered categorical, categories from the template
+#   'level'  ordered categorical of CONFIDENCE_LEVELS
+#   'int'    integer code (nullable Int16)
+#   'float'  float64
+#   'text'   free text
+#   'list'   list of strings
+STAGE_SCHEMAS: Dict[str, Dict] = {
+    'risk': {
+        'template': 'prompt_user_perm_risk_rating.md',
+        'fields': {
+            'risk_rating_tier': ('Risk Rating Tier', 'tier'),
+            'risk_rating_score': ('Risk Rating Score', 'int'),
+            'weighted_score': ('Weighted Score', 'float'),
+            'rationale': ('Rationale', 'text'),
+            'confidence': ('Confidence', 'level')
+        }
+    },
+    'category': {
+        'template': 'prompt_user_perm_category.md',
+        'fields': {
+            'permission_category_label': ('Permission Category Label', 'label'),
+            'permission_category_order': ('Permission Category Order', 'int'),
+            'match_rating_tier': ('Match Rating Tier', 'tier'),
+            'match_rating_score': ('Match Rating Score', 'int'),
+            'weighted_match_score': ('Weighted Match Score', 'float'),
+            'rationale': ('Rationale', 'text'),
+            'confidence': ('Confidence', 'level')
+        }
+    },
+    'cloud': {
+        'template': 'prompt_user_perm_cloud.md',
+        'fields': {
+            'permission_cloud_label': ('Permission Cloud Label', 'label'),
+            'permission_cloud_order': ('Permission Cloud Order', 'int'),
+            'match_rating_tier': ('Match Rating Tier', 'tier'),
+            'match_rating_score': ('Match Rating Score', 'int'),
+            'weighted_match_score': ('Weighted Match Score', 'float'),
+            'rationale': ('Rationale', 'text'),
+            'confidence': ('Confidence', 'level')
+        }
+    },
+    'description': {
+        'template': 'prompt_user_perm_description.md',
+        'fields': {
+            'expanded_description': ('Expanded Description', 'text'),
+            'salesforce_feature': ('Salesforce Feature', 'text'),
+            'salesforce_cloud': ('Salesforce Cloud', 'text'),
+            'quality_score_label': ('Quality Score Label', 'tier'),
+            'quality_score_value': ('Quality Score Value', 'int'),
+            'weighted_quality_score': ('Weighted Quality Score', 'float'),
+            'rationale': ('Rationale', 'text'),
+            'confidence': ('Confidence', 'level'),
+            'top_urls': ('Top URLs', 'list')
+        }
+    }
+}
+
+def parse_template_schema(template_path: Path) -> Dict:
+    """
+    Parses the "# Output Schema" block of a prompt template.
+
+    Args:
+        template_path (Path): Path of the prompt template
+
+    Returns:
+        Dict: 'keys' (top-level JSON keys in order), 'options' (allowed values of
+            "<a|b|c>" fields) and 'scores' (criterion names of the scores object)
+
+    Raises:
+        ValueError: If the template has no output schema block
+    """
+    text = Path(template_path).read_text(encoding='utf-8')
+    match = re.search(r'# Output Schema[^\n]*\n+```\n(.*?)\n```', text, re.DOTALL)
+    if not match:
+        raise ValueError(f"No output schema found in {template_path}")
+    block = match.group(1)
+
+    keys, options, scores = [], {}, []
+    in_scores = False
+    for line in block.splitlines():
+        field = re.match(r'\s*"([^"]+)"\s*:\s*(.*?),?\s*$', line)
+        if not field:
+            if line.strip().startswith('}'):
+                in_scores = False
+            continue
+        key, value = field.group(1).strip(), field.group(2)
+        if in_scores:
+            scores.append(key)
+            continue
+        keys.append(key)
+        if value.startswith('{'):
+            in_scores = key == 'scores'
+            continue
+        choice = re.fullmatch(r'"<([^>]*\|[^>]*)>"', value)
+        if choice:
+            options[key] = choice.group(1).split('|')
+    return {'keys': keys, 'options': options, 'scores': scores}
+
+@lru_cache(maxsize=None)
+def get_schema(stage: str) -> Dict:
+    """
+    Returns a stage's schema completed with the allowed values and criteria from its template.
+
+    Args:
+        stage (str): 'risk', 'category', 'cloud' or 'description'
+
+    Returns:
+        Dict: Schema with 'fields', 'options' and 'scores'
+
+    Raises:
+        ValueError: If the stage is unknown
+    """
+    if stage not in STAGE_SCHEMAS:
+        raise ValueError(f"Unknown stage: {stage}. Expected one of {list(STAGE_SCHEMAS)}")
+    schema = dict(STAGE_SCHEMAS[stage])
+    schema.update(parse_template_schema(TEMPLATES_DIR / schema['template']))
+    return schema
+
+def _categorical(values: pd.Series, categories: List[str], ordered: bool) -> pd.Series:
+    """Converts text values to a categorical, matching categories case-insensitively."""
+    lookup = {category.lower(): category for category in categories}
+    normalized = values.map(lambda value: lookup.get(str(value).strip().lower()) if isinstance(value, str) else None)
+    return normalized.astype(pd.CategoricalDtype(categories=categories, ordered=ordered))
+
+def extract_typed_fields(
+    df: pd.DataFrame,
+    stage: str,
+    json_column: str = 'Evaluation',
+    score_columns: bool = True
+) -> pd.DataFrame:
+    """
+    Extracts a stage's evaluation JSON into typed, validated columns.
+
+    Tier and label fields become categoricals (tiers ordered lowest first), codes and
+    weighted scores become numbers, and each criterion of the `scores` object becomes
+    a float64 column named after the criterion (e.g. 'Data_Sensitivity'). Values that
+    do not match the schema are left missing and reported in a 'Schema Errors' column;
+    repairs applied to malformed JSON are listed in a 'JSON Repairs' column.
+
+    Args:
+        df (pd.DataFrame): Results DataFrame of the stage
+        stage (str): 'risk', 'category', 'cloud' or 'description'
+        json_column (str): Column containing the evaluation JSON
+        score_columns (bool): Whether to add one numeric column per score criterion
+
+    Returns:
+        pd.DataFrame: Copy of the DataFrame with the typed columns, 'JSON Repairs' and 'Schema Errors'
+
+    Example:
+        >>> risk_df = extract_typed_fields(risk_results_df, 'risk')
+        >>> risk_df.groupby('Risk Rating Tier', observed=True)['Data_Sensitivity'].mean()
+    """
+    schema = get_schema(stage)
+    raw = df[json_column].astype(object)
+    is_text = raw.map(lambda value: isinstance(value, str))
+    cleaned = raw.where(is_text, None)
+    if is_text.any():
+        cleaned[is_text] = _clean_json_series(raw[is_text].astype(str)).to_numpy(dtype=object)
+    repairs = []
+    parsed = _parse_json_column(cleaned, repairs=repairs)
+
+    index = df.index
+    is_parsed = pd.Series([eval_data is not None for eval_data in parsed], index=index)
+    errors = {}
+
+    def add_errors(mask: pd.Series, message: str) -> None:
+        for position in np.flatnonzero(mask.to_numpy()):
+            errors.setdefault(position, []).append(message)
+
+    add_errors(~is_parsed, 'invalid JSON')
+
+    typed = {}
+    for json_key, (column, kind) in schema['fields'].items():
+        values = pd.Series(
+            [eval_data.get(json_key) if eval_data is not None else None for eval_data in parsed],
+            index=index, dtype=object
+        )
+        present = values.notna()
+        add_errors(is_parsed & ~present, f"missing {json_key}")
+
+        if kind in ('tier', 'label'):
+            converted = _categorical(values, schema['options'].get(json_key, []), ordered=kind == 'tier')
+        elif kind == 'level':
+            converted = _categorical(values, CONFIDENCE_LEVELS, ordered=True)
+        elif kind == 'int':
+            converted = pd.to_numeric(values, errors='coerce').round().astype('Int16')
+        elif kind == 'float':
+            converted = pd.to_numeric(values, errors='coerce').astype('float64')
+        elif kind == 'list':
+            converted = values.map(lambda value: value if isinstance(value, list) else ([value] if value else []))
+        else:
+            converted = values.map(lambda value: value if isinstance(value, str) or value is None else str(value))
+
+        if kind not in ('text', 'list'):
+            add_errors(present & converted.isna(), f"invalid {json_key}")
+        typed[column] = converted
+
+    if score_columns:
+        low, high = SCORE_RANGE
+        for criterion in schema['scores']:
+            values = pd.Series([
+                _score(eval_data, criterion) if eval_data is not None else None for eval_data in parsed
+            ], index=index, dtype=object)
+            scores = pd.to_numeric(values, errors='coerce').astype('float64')
+            add_errors(is_parsed & values.isna(), f"missing score {criterion}")
+            out_of_range = (scores < low) | (scores > high)
+            add_errors(values.notna() & (scores.isna() | out_of_range), f"invalid score {criterion}")
+            typed[criterion] = scores.where(~out_of_range)
+
+    typed['JSON Repairs'] = pd.Series(repairs, index=index, dtype=object)
+    typed['Schema Errors'] = pd.Series(
+        ['; '.join(errors.get(position, [])) for position in range(len(df))], index=index, dtype=object
+    )
+    invalid = len(errors)
+    if invalid:
+        logger.warning(f"{invalid} of {len(df)} {stage} evaluations do not match the output schema")
+
+    return df.assign(**typed)
+
+def _score(eval_data: Dict, criterion: str):
+    """Looks up a criterion score, tolerating whitespace around the key."""
+    scores = eval_data.get('scores')
+    if isinstance(scores, str):
+        try:
+            scores = json.loads(scores)
+        except ValueError:
+            return None
+    if not isinstance(scores, dict):
+        return None
+    if criterion in scores:
+        return scores[criterion]
+    for key, value in scores.items():
+        if key.strip() == criterion:
+            return value
+    return None
@@ -5,31 +5,95 @@ Functions for processing and extracting data from JSON fields in DataFrames.
 import json
 import pandas as pd
 import logging
-from typing import Optional, List, Union
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, List, Union, Dict
+
+from ..utils.data_utils import iter_data_chunks
+from .json_recovery import repair_json_text, recover_json
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 def clean_json_string(json_string: str) -> str:
     """
-    Cleans a JSON string by removing markdown code blocks and newlines.
+    Cleans a JSON string by removing markdown code blocks and text around the object.
+
+    Newlines inside string values are escaped rather than removed, and common defects
+    (trailing commas, smart quotes, truncation) are repaired; see `json_recovery`.
     
     Args:
         json_string (str): The JSON string to clean
         
     Returns:
-        str: Cleaned JSON string
+        str: Cleaned JSON string, or the text without code fences if it holds no object
     """
-    replacements = [
-        ("```json\n", ""),
-        ("\n```", ""),
-        ("```", ""),
-        ("\n", "")
-    ]
-    
-    for old, new in replacements:
-        json_string = json_string.replace(old, new)
-    return json_string
+    repaired, _ = repair_json_text(json_string)
+    if repaired is None:
+        return json_string.replace("```json\n", "").replace("\n```", "").replace("```", "")
+    return repaired
+
+def _clean_json_series(json_strings: pd.Series) -> pd.Series:
+    """Strips markdown code fences from a whole column of strings."""
+    for old, new in [("```json\n", ""), ("\n```", ""), ("```", "")]:
+        json_strings = json_strings.str.replace(old, new, regex=False)
+    return json_strings
+
+def _get_json_loads():
+    """Returns orjson's parser when installed, else the standard library parser."""
+    try:
+        import orjson
+        return orjson.loads
+    except ImportError:
+        return json.loads
+
+def _parse_json_column(json_strings: pd.Series, repairs: Optional[List[str]] = None) -> List[Optional[dict]]:
+    """
+    Parses a column of cleaned JSON strings.
+
+    Rows that are not valid JSON are passed through `recover_json`, so objects with
+    small defects are still extracted.
+
+    Args:
+        json_strings (pd.Series): Cleaned JSON strings; missing values are allowed
+        repairs (List[str], optional): If given, receives the repairs applied to each row
+            ('' when none)
+
+    Returns:
+        List[Optional[dict]]: Parsed object per row, or None where the row is empty or invalid
+    """
+    loads = _get_json_loads()
+    parsed = []
+    for index, value in json_strings.items():
+        if repairs is not None:
+            repairs.append('')
+        if not isinstance(value, str) or not value.strip():
+            logger.warning(f"Empty or null JSON at index {index}")
+            parsed.append(None)
+            continue
+        try:
+            eval_data = loads(value)
+        except ValueError as e:
+            eval_data, row_repairs = recover_json(value)
+            if repairs is not None:
+                repairs[-1] = '; '.join(row_repairs)
+            if eval_data is None:
+                logger.error(f"Error decoding JSON at index {index}: {str(e)}")
+                logger.debug(f"Problematic JSON: {value}")
+                parsed.append(None)
+                continue
+            logger.info(f"Recovered JSON at index {index}: {', '.join(row_repairs)}")
+        if not isinstance(eval_data, dict):
+            logger.error(f"Unexpected error processing row {index}: JSON is not an object")
+            parsed.append(None)
+            continue
+        parsed.append(eval_data)
+    return parsed
+
+def _storable(value):
+    """Converts lists/dicts to strings for storage."""
+    return str(value) if isinstance(value, (list, dict)) else value
 
 def clean_expanded_description_column(df):
     if 'Expanded Description' in df.columns:
@@ -46,6 +110,12 @@ def extract_json_fields(
     """
     Extracts fields from a JSON column in a DataFrame and adds them as new columns.
 
+    The column is cleaned and parsed in bulk (with orjson when installed) and each
+    extracted column is built in a single construction, so large result sets are
+    processed without per-cell DataFrame writes. Malformed JSON is repaired where
+    possible (see `json_recovery`); rows that cannot be recovered keep their existing
+    values in the extracted columns.
+
     Args:
         df (pd.DataFrame): The input DataFrame containing the JSON column
         json_column (str): The name of the column containing the JSON data
@@ -75,37 +145,27 @@ def extract_json_fields(
     # Use provided fields or defaults
     fields_map = fields if fields else default_fields
     
-    # Initialize new columns
-    for column in fields_map.values():
-        if column not in results_df.columns:
-            results_df[column] = None
-    
-    # Clean and process JSON
-    results_df[json_column] = results_df[json_column].apply(clean_json_string)
-    
-    # Process each row
-    for index, row in results_df.iterrows():
-        try:
-            # Skip empty or null values
-            if pd.isna(row[json_column]) or not row[json_column].strip():
-                logger.warning(f"Empty or null JSON at index {index}")
-                continue
-                
-            eval_data = json.loads(row[json_column])
-            
-            # Extract each field
-            for json_key, df_column in fields_map.items():
-                value = eval_data.get(json_key, '')
-                # Convert lists/dicts to strings for storage
-                if isinstance(value, (list, dict)):
-                    value = str(value)
-                results_df.loc[index, df_column] = value
-
-        except json.JSONDecodeError as e:
-            logger.error(f"Error decoding JSON at index {index}: {str(e)}")
-            logger.debug(f"Problematic JSON: {row[json_column]}")
-        except Exception as e:
-            logger.error(f"Unexpected error processing row {index}: {str(e)}")
+    # Clean the whole column at once; missing values stay missing
+    raw = results_df[json_column]
+    is_text = raw.map(lambda value: isinstance(value, str))
+    cleaned = raw.where(is_text, None).astype(object)
+    if is_text.any():
+        cleaned[is_text] = _clean_json_series(raw[is_text].astype(str)).to_numpy(dtype=object)
+    results_df[json_column] = cleaned
+
+    # Parse every row, then build each extracted column in one pass
+    parsed = _parse_json_column(cleaned)
+    extracted = {}
+    for json_key, df_column in fields_map.items():
+        existing = results_df[df_column].tolist() if df_column in results_df.columns else [None] * len(results_df)
+        extracted[df_column] = [
+            _storable(eval_data.get(json_key, '')) if eval_data is not None else previous
+            for eval_data, previous in zip(parsed, existing)
+        ]
+    results_df = results_df.assign(**{
+        column: pd.Series(values, index=results_df.index, dtype=object)
+        for column, values in extracted.items()
+    })
 
     results_df = clean_expanded_description_column(results_df)
     
@@ -115,9 +175,152 @@ def extract_json_fields(
         display(results_df.head())
         print("\nColumns added:", list(fields_map.values()))
     
-    return results_df 
+    return results_df
 
+def _extract_chunk(
+    chunk: pd.DataFrame,
+    json_column: str,
+    fields: Optional[Dict[str, str]],
+    stage: Optional[str]
+) -> pd.DataFrame:
+    """Extracts one chunk; top-level so it can run in a worker process."""
+    if stage is not None:
+        from .eval_schemas import extract_typed_fields
+        return extract_typed_fields(chunk, stage, json_column=json_column)
+    return extract_json_fields(chunk, json_column=json_column, fields=fields, debug=False)
+
+class _ChunkWriter:
+    """
+    Appends DataFrame chunks to a CSV, JSON Lines or Parquet file.
+
+    Parquet chunks share the schema of the first chunk: integer columns are stored
+    as float64 and untyped object columns as strings, so later chunks with missing
+    values or mixed JSON value types still fit.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.format = self.path.suffix.lower().lstrip('.')
+        if self.format not in ('csv', 'jsonl', 'parquet'):
+            raise ValueError(f"Unsupported output format: {self.path.suffix}")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_name(self.path.name + '.tmp')
+        self._writer = None
+        self._schema = None
+        self._first = True
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        if self.format == 'csv':
+            chunk.to_csv(self._tmp_path, mode='w' if self._first else 'a', header=self._first, index=False)
+        elif self.format == 'jsonl':
+            with open(self._tmp_path, 'w' if self._first else 'a', encoding='utf-8') as f:
+                if len(chunk):
+                    f.write(chunk.to_json(orient='records', lines=True, force_ascii=False, default_handler=str))
+        else:
+            self._write_parquet(chunk)
+        self._first = False
+
+    def _write_parquet(self, chunk: pd.DataFrame) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        chunk = chunk.copy()
+        for col in chunk.columns:
+            if chunk[col].dtype == object and not chunk[col].map(lambda v: isinstance(v, list)).any():
+                chunk[col] = chunk[col].map(lambda v: None if v is None or v != v else str(v)).astype(object)
+
+        if self._schema is None:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            fields = []
+            for field in table.schema:
+                if pa.types.is_integer(field.type):
+                    field = field.with_type(pa.float64())
+                elif pa.types.is_null(field.type):
+                    field = field.with_type(pa.string())
+                fields.append(field)
+            self._schema = pa.schema(fields)
+            self._writer = pq.ParquetWriter(self._tmp_path, self._schema, compression='zstd')
+        self._writer.write_table(pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False))
+
+    def close(self) -> None:
+        """Finishes the output and moves it into place."""
+        if self._writer is not None:
+            self._writer.close()
+        if self._first:
+            # No chunks were written; still produce an empty output file
+            self._tmp_path.write_text('')
+        self._tmp_path.replace(self.path)
 
+    def abort(self) -> None:
+        """Discards a partially written output."""
+        if self._writer is not None:
+            self._writer.close()
+        if self._tmp_path.exists():
+            self._tmp_path.unlink()
 
+def extract_json_fields_from_file(
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    json_column: str = 'Evaluation',
+    fields: Optional[Dict[str, str]] = None,
+    stage: Optional[str] = None,
+    chunksize: int = 10000,
+    max_workers: int = 1
+) -> int:
+    """
+    Extracts JSON fields from a results file chunk by chunk, writing the output incrementally.
+
+    Only a few chunks are held in memory at a time, so files larger than memory can be
+    processed. With `max_workers` > 1 chunks are parsed in a process pool; the output
+    keeps the input order. The output is written under a temporary name and renamed
+    when complete.
+
+    Args:
+        input_path (Union[str, Path]): Results file (.csv, .jsonl, .parquet or .arrow)
+        output_path (Union[str, Path]): Output file (.csv, .jsonl or .parquet)
+        json_column (str): The name of the column containing the JSON data
+        fields (Dict[str, str], optional): JSON key to column mapping, as for `extract_json_fields`
+        stage (str, optional): If set, uses the stage's schema for typed extraction
+            (`extract_typed_fields`) instead of `fields`
+        chunksize (int): Rows per chunk
+        max_workers (int): Worker processes parsing chunks
+
+    Returns:
+        int: Number of rows written
+
+    Example:
+        >>> extract_json_fields_from_file('data/output/risk_results.csv',
+        ...                               'data/output/risk_results_extracted.parquet',
+        ...                               max_workers=4)
+    """
+    writer = _ChunkWriter(output_path)
+    chunks = iter_data_chunks(input_path, chunksize=chunksize, required_columns=[json_column])
+    rows_written = 0
 
+    try:
+        if max_workers <= 1:
+            for chunk in chunks:
+                extracted = _extract_chunk(chunk, json_column, fields, stage)
+                writer.write(extracted)
+                rows_written += len(extracted)
+        else:
+            # Keep a bounded window of chunks in flight and write them in input order
+            window = deque()
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for chunk in chunks:
+                    window.append(executor.submit(_extract_chunk, chunk, json_column, fields, stage))
+                    if len(window) >= max_workers * 2:
+                        extracted = window.popleft().result()
+                        writer.write(extracted)
+                        rows_written += len(extracted)
+                while window:
+                    extracted = window.popleft().result()
+                    writer.write(extracted)
+                    rows_written += len(extracted)
+    except Exception:
+        writer.abort()
+        raise
+    writer.close()
 
+    logger.info(f"Extracted {rows_written} rows from {input_path} to {output_path}")
+    return rows_written
@@ -0,0 +1,177 @@
+"""
+Lenient recovery of JSON objects from model output.
+
+Models sometimes wrap the JSON in markdown fences or prose, or return JSON with small
+defects. `recover_json` repairs the common ones in a single pass over the text so the
+record can be used without asking the model again.
+"""
+
+import json
+import logging
+from typing import List, Optional, Tuple
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Typographic quotes models sometimes use as JSON string delimiters
+_SMART_QUOTES = {'“': '”', '”': '”', '„': '“'}
+
+# Escapes for control characters that are invalid inside JSON strings
+_CONTROL_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t'}
+
+def strip_code_fences(text: str) -> str:
+    """
+    Returns the contents of the first markdown code fence, or the text unchanged.
+
+    Args:
+        text (str): Model output
+
+    Returns:
+        str: Text inside the fence
+    """
+    start = text.find('```')
+    if start == -1:
+        return text
+    body_start = text.find('\n', start)
+    if body_start == -1:
+        return text.replace('```', '')
+    end = text.find('```', body_start)
+    return text[body_start + 1:end if end != -1 else len(text)]
+
+def repair_json_text(text: str) -> Tuple[Optional[str], List[str]]:
+    """
+    Extracts the outermost JSON object from text and repairs common defects in one pass.
+
+    Repairs: markdown fences and surrounding prose, smart quotes used as string
+    delimiters, raw newlines/tabs inside strings, trailing commas before a closing
+    bracket, and brackets left unclosed by truncated output.
+
+    Args:
+        text (str): Model output
+
+    Returns:
+        Tuple[Optional[str], List[str]]: Repaired JSON text (None if no object was found)
+            and the repairs that were applied
+    """
+    repairs = []
+    body = strip_code_fences(text)
+    if body != text:
+        repairs.append('stripped code fences')
+
+    start = body.find('{')
+    if start == -1:
+        return None, repairs
+    if body[:start].strip():
+        repairs.append('dropped text before object')
+
+    out = []
+    stack = []
+    in_string = False
+    closing_quote = '"'
+    escaped = False
+    end = len(body)
+
+    i = start
+    while i < len(body):
+        char = body[i]
+        if in_string:
+            if escaped:
+                escaped = False
+                out.append(char)
+            elif char == '\\':
+                escaped = True
+                out.append(char)
+            elif char == closing_quote or (closing_quote != '"' and char in _SMART_QUOTES):
+                in_string = False
+                out.append('"')
+            elif char in _CONTROL_ESCAPES:
+                out.append(_CONTROL_ESCAPES[char])
+                if 'escaped control characters in strings' not in repairs:
+                    repairs.append('escaped control characters in strings')
+            elif char == '"' and closing_quote != '"':
+                # A straight quote inside a smart-quoted string is content
+                out.append('\\"')
+            else:
+                out.append(char)
+        elif char == '"':
+            in_string = True
+            closing_quote = '"'
+            out.append(char)
+        elif char in _SMART_QUOTES:
+            in_string = True
+            closing_quote = _SMART_QUOTES[char]
+            out.append('"')
+            if 'replaced smart quotes' not in repairs:
+                repairs.append('replaced smart quotes')
+        elif char in '{[':
+            stack.append('}' if char == '{' else ']')
+            out.append(char)
+        elif char in '}]':
+            # Drop a trailing comma before the closing bracket
+            j = len(out) - 1
+            while j >= 0 and out[j] in ' \t\r\n':
+                j -= 1
+            if j >= 0 and out[j] == ',':
+                del out[j]
+                if 'removed trailing commas' not in repairs:
+                    repairs.append('removed trailing commas')
+            if stack:
+                stack.pop()
+            out.append(char)
+            if not stack:
+                end = i + 1
+                break
+        else:
+            out.append(char)
+        i += 1
+
+    if stack:
+        if in_string:
+            out.append('"')
+        while out and out[-1] in ' \t\r\n,':
+            out.pop()
+        out.extend(reversed(stack))
+        repairs.append('closed truncated object')
+    elif body[end:].strip():
+        repairs.append('dropped text after object')
+
+    return ''.join(out), repairs
+
+def recover_json(text: str) -> Tuple[Optional[dict], List[str]]:
+    """
+    Parses a JSON object from model output, repairing it if needed.
+
+    Well-formed JSON (optionally fenced) is parsed directly; otherwise the text is
+    repaired with `repair_json_text` and parsed again.
+
+    Args:
+        text (str): Model output
+
+    Returns:
+        Tuple[Optional[dict], List[str]]: The parsed object (None if it could not be
+            recovered) and the repairs that were applied
+
+    Example:
+        >>> recover_json('```json\\n{"confidence": "High",}\\n```')
+        ({'confidence': 'High'}, ['stripped code fences', 'removed trailing commas'])
+    """
+    if not isinstance(text, str):
+        return None, []
+
+    body = strip_code_fences(text).strip()
+    try:
+        value = json.loads(body)
+        if isinstance(value, dict):
+            return value, ['stripped code fences'] if body != text.strip() else []
+    except ValueError:
+        pass
+
+    repaired, repairs = repair_json_text(text)
+    if repaired is None:
+        return None, repairs
+    try:
+        value = json.loads(repaired)
+    except ValueError as e:
+        logger.debug(f"JSON could not be recovered after {repairs}: {str(e)}")
+        return None, repairs
+    return (value, repairs) if isinstance(value, dict) else (None, repairs)
@@ -8,14 +8,41 @@ API names, and descriptions, as well as cleaning and formatting the data.
 Functions:
     extract_permission_data: Extract permission data from HTML content
     clean_permission_data: Clean and format permission DataFrame
+    extract_permissions_from_files: Extract permission data from many files in parallel
     scrape_permissions_from_file: Process permissions from an HTML file
+    iter_html_text: Stream the decoded HTML of an MHTML or HTML file
+    decode_html_text: Decode MHTML or quoted-printable text that was read as a string
+    build_permission_catalog: Merge exports of many orgs into one row per permission
+    build_permission_provenance: Long table of the orgs and descriptions of each permission
+    scrape_permission_catalog: Scrape exports of many orgs into a deduplicated catalog
+    extract_metadata_permissions: Extract permission set membership from metadata XML
+    scrape_permissions_from_metadata: Process every permission set and profile file under a directory
+
+Classes:
+    ScrapeCache: Content-hash cache of extracted permission rows
 """
 
-from .permission_scraper import extract_permission_data, clean_permission_data, save_permission_data, scrape_permissions_from_file
+from .permission_scraper import extract_permission_data, clean_permission_data, save_permission_data, scrape_permissions_from_file, extract_permissions_from_files
+from .mhtml_reader import iter_html_text, read_html_text, decode_html_text
+from .scrape_cache import ScrapeCache
+from .permission_catalog import build_permission_catalog, build_permission_provenance, scrape_permission_catalog
+from .metadata_scraper import find_metadata_files, iter_user_permissions, extract_metadata_permissions, scrape_permissions_from_metadata
 
 __all__ = [
     'extract_permission_data',
     'clean_permission_data',
     'save_permission_data',
-    'scrape_permissions_from_file'
+    'scrape_permissions_from_file',
+    'extract_permissions_from_files',
+    'iter_html_text',
+    'read_html_text',
+    'decode_html_text',
+    'ScrapeCache',
+    'build_permission_catalog',
+    'build_permission_provenance',
+    'scrape_permission_catalog',
+    'find_metadata_files',
+    'iter_user_permissions',
+    'extract_metadata_permissions',
+    'scrape_permissions_from_metadata'
 ] 
\ No newline at end of file
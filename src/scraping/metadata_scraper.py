@@ -0,0 +1,219 @@
+"""
+Ingestion of Salesforce metadata XML as a permission source.
+
+Retrieved metadata (`sf project retrieve` / Metadata API) stores each permission set
+in a `.permissionset-meta.xml` file and each profile in a `.profile-meta.xml` file
+(`.permissionset` / `.profile` in the older mdapi layout). Their `userPermissions`
+entries name the system permissions the set grants:
+
+    <PermissionSet xmlns="http://soap.sforce.com/2006/04/metadata">
+        <label>Sales Operations</label>
+        <userPermissions>
+            <enabled>true</enabled>
+            <name>ApiEnabled</name>
+        </userPermissions>
+    </PermissionSet>
+
+The files are stream-parsed with `iterparse` and every top-level element is
+discarded once read, so memory stays constant even for profiles with thousands of
+field and object permissions. The output has the permission columns of
+`extract_permission_data` plus the permission set membership of each permission.
+"""
+
+import os
+import logging
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+from .permission_catalog import normalize_api_name
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# File suffixes of permission set and profile metadata and the type they hold
+METADATA_SUFFIXES = {
+    '.permissionset-meta.xml': 'PermissionSet',
+    '.profile-meta.xml': 'Profile',
+    '.permissionset': 'PermissionSet',
+    '.profile': 'Profile'
+}
+
+# Permission columns shared with extract_permission_data
+PERMISSION_COLUMNS = ['Permission Name', 'API Name', 'Permission Requirement', 'Description']
+
+# Membership columns added by the metadata source
+MEMBERSHIP_COLUMNS = ['Permission Set', 'Permission Set Label', 'Permission Set Type', 'Enabled']
+
+def _local_name(tag: str) -> str:
+    """Strips the XML namespace from a tag."""
+    return tag.rsplit('}', 1)[-1]
+
+def _metadata_type(file_path: Union[str, Path]) -> Optional[str]:
+    name = Path(file_path).name
+    for suffix, metadata_type in METADATA_SUFFIXES.items():
+        if name.endswith(suffix):
+            return metadata_type
+    return None
+
+def _set_name(file_path: Union[str, Path]) -> str:
+    """Returns the permission set or profile API name from its file name."""
+    name = Path(file_path).name
+    for suffix in METADATA_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return Path(file_path).stem
+
+def find_metadata_files(root_dir: str) -> List[str]:
+    """
+    Lists the permission set and profile metadata files under a directory.
+
+    Args:
+        root_dir (str): Directory of retrieved metadata (e.g. force-app/main/default)
+
+    Returns:
+        List[str]: Sorted file paths
+    """
+    paths = []
+    for dirpath, _, filenames in os.walk(root_dir):
+        paths.extend(os.path.join(dirpath, name) for name in filenames if _metadata_type(name))
+    return sorted(paths)
+
+def iter_user_permissions(xml_path: str) -> Iterator[Dict]:
+    """
+    Stream-parses the `userPermissions` entries of a permission set or profile file.
+
+    Args:
+        xml_path (str): Path of a .permissionset-meta.xml or .profile-meta.xml file
+
+    Yields:
+        Dict: 'API Name', 'Enabled', 'Permission Set', 'Permission Set Label' and 'Permission Set Type'
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the file is not well-formed XML
+    """
+    set_name = _set_name(xml_path)
+    set_type = _metadata_type(xml_path)
+    set_label = None
+    entries = []
+
+    root = None
+    depth = 0
+    for event, element in ET.iterparse(xml_path, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+                set_type = set_type or _local_name(element.tag)
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth != 1:
+            continue
+
+        # A direct child of the root is complete
+        tag = _local_name(element.tag)
+        if tag == 'userPermissions':
+            fields = {_local_name(child.tag): (child.text or '').strip() for child in element}
+            if fields.get('name'):
+                entries.append((fields['name'], fields.get('enabled', 'true').lower() == 'true'))
+        elif tag == 'label':
+            set_label = (element.text or '').strip() or None
+        # Drop finished elements so memory does not grow with the file
+        root.clear()
+
+    for api_name, enabled in entries:
+        yield {
+            'API Name': api_name,
+            'Enabled': enabled,
+            'Permission Set': set_name,
+            'Permission Set Label': set_label or set_name,
+            'Permission Set Type': set_type
+        }
+
+def extract_metadata_permissions(
+    xml_paths: List[str],
+    reference_df: Optional[pd.DataFrame] = None,
+    include_disabled: bool = False
+) -> pd.DataFrame:
+    """
+    Extracts permission set membership of permissions from metadata XML files.
+
+    Metadata names permissions only by API Name. Labels, requirements and descriptions
+    are filled from `reference_df` (e.g. the scraped reference data or the permission
+    catalog) by normalized API Name; without a match the label is the API Name.
+
+    Args:
+        xml_paths (List[str]): Permission set and profile metadata files
+        reference_df (pd.DataFrame, optional): Permission data with 'API Name' and the
+            permission columns of `extract_permission_data`
+        include_disabled (bool): Whether to keep entries with <enabled>false</enabled>
+
+    Returns:
+        pd.DataFrame: One row per (permission set, permission) with the permission
+            columns plus 'Permission Set', 'Permission Set Label', 'Permission Set Type'
+            and 'Enabled'
+
+    Example:
+        >>> paths = find_metadata_files('force-app/main/default')
+        >>> membership_df = extract_metadata_permissions(paths, reference_df=catalog_df)
+    """
+    rows = []
+    for xml_path in xml_paths:
+        try:
+            rows.extend(iter_user_permissions(xml_path))
+        except ET.ParseError as e:
+            logger.error(f"Skipping malformed metadata file {xml_path}: {str(e)}")
+
+    df = pd.DataFrame(rows, columns=['API Name'] + MEMBERSHIP_COLUMNS)
+    if not include_disabled:
+        df = df[df['Enabled'].astype(bool)]
+    df = df.reset_index(drop=True)
+
+    df['API Key'] = normalize_api_name(df['API Name'])
+    if reference_df is not None and not reference_df.empty:
+        detail_columns = [col for col in PERMISSION_COLUMNS if col in reference_df.columns and col != 'API Name']
+        details = reference_df[detail_columns].assign(**{'API Key': normalize_api_name(reference_df['API Name'])})
+        details = details.dropna(subset=['API Key']).drop_duplicates('API Key')
+        df = df.merge(details, on='API Key', how='left')
+    df = df.drop(columns=['API Key'])
+    for col in PERMISSION_COLUMNS:
+        if col not in df.columns:
+            df[col] = None
+    df['Permission Name'] = df['Permission Name'].fillna(df['API Name'])
+
+    return df[PERMISSION_COLUMNS + MEMBERSHIP_COLUMNS]
+
+def scrape_permissions_from_metadata(
+    metadata_dir: str,
+    output_path: Optional[str] = None,
+    reference_df: Optional[pd.DataFrame] = None,
+    include_disabled: bool = False
+) -> pd.DataFrame:
+    """
+    Extracts permission set membership from every metadata file under a directory.
+
+    Args:
+        metadata_dir (str): Directory of retrieved metadata
+        output_path (str, optional): Path to save the CSV output. Defaults to
+            data/output/permission_set_membership.csv
+        reference_df (pd.DataFrame, optional): Permission data used to fill labels and descriptions
+        include_disabled (bool): Whether to keep disabled entries
+
+    Returns:
+        pd.DataFrame: Membership DataFrame from `extract_metadata_permissions`
+    """
+    xml_paths = find_metadata_files(metadata_dir)
+    df = extract_metadata_permissions(xml_paths, reference_df=reference_df, include_disabled=include_disabled)
+
+    if output_path is None:
+        output_path = os.path.join('data', 'output', 'permission_set_membership.csv')
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    df.to_csv(output_path, index=False)
+
+    print(f"\nFound {df['API Name'].nunique()} permissions in {df['Permission Set'].nunique()} "
+          f"permission sets and profiles ({len(xml_paths)} files).")
+    print(f"\nData saved to: {output_path}")
+    return df
@@ -0,0 +1,204 @@
+"""
+Streaming reader for the HTML of saved Salesforce pages.
+
+Permission pages are saved from the browser as MHTML: a MIME multipart archive whose
+HTML part is quoted-printable encoded ('=3D' for '=', '=' soft line breaks) next to
+the page's stylesheets and images. This module parses the MIME structure line by
+line, decodes the first text/html part incrementally according to its transfer
+encoding and charset, and yields the decoded HTML in chunks without holding the
+archive or the decoded page in memory. Plain .html files are streamed as they are.
+
+Example:
+    >>> for chunk in iter_html_text('data/raw/perm_sets_system_perms.mhtml'):
+    ...     parser.feed(chunk)
+"""
+
+import io
+import codecs
+import binascii
+import logging
+from email.parser import BytesHeaderParser
+from email.message import Message
+from typing import BinaryIO, Iterator, List, Optional
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Size of the decoded text chunks yielded by iter_html_text
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Quoted-printable escape of '=', present in every encoded tag attribute
+_QP_MARKER = '=3D'
+
+def _read_headers(stream: BinaryIO) -> Message:
+    """Reads a MIME header block up to the blank line."""
+    lines = []
+    for line in stream:
+        if not line.strip():
+            break
+        lines.append(line)
+    return BytesHeaderParser().parsebytes(b''.join(lines))
+
+def _looks_like_headers(lines: List[bytes]) -> bool:
+    """Whether the first lines of a file are MIME headers rather than HTML."""
+    return bool(lines) and all(
+        line[:1] in (b' ', b'\t') or (b':' in line and not line.lstrip().startswith(b'<'))
+        for line in lines
+    )
+
+class _BodyDecoder:
+    """Incremental decoder of a MIME body from raw lines to text."""
+
+    def __init__(self, transfer_encoding: str, charset: str):
+        self.transfer_encoding = (transfer_encoding or '7bit').strip().lower()
+        try:
+            decoder = codecs.getincrementaldecoder(charset)(errors='replace')
+        except LookupError:
+            logger.warning(f"Unknown charset {charset}, decoding as utf-8")
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        # Translates CRLF line endings the way reading the file in text mode did
+        self.decoder = io.IncrementalNewlineDecoder(decoder, translate=True)
+        self._base64_rest = b''
+
+    def decode(self, line: bytes, final: bool = False) -> str:
+        if self.transfer_encoding == 'quoted-printable':
+            # Soft line breaks only occur at line ends, so lines decode independently
+            data = binascii.a2b_qp(line)
+        elif self.transfer_encoding == 'base64':
+            encoded = self._base64_rest + b''.join(line.split())
+            usable = len(encoded) - len(encoded) % 4
+            self._base64_rest = encoded[usable:]
+            data = binascii.a2b_base64(encoded[:usable]) if usable else b''
+        else:
+            data = line
+        return self.decoder.decode(data, final=final)
+
+def _iter_body(stream: BinaryIO, decoder: _BodyDecoder, boundary: Optional[bytes]) -> Iterator[str]:
+    """Decodes body lines until the closing boundary (or end of file)."""
+    previous = None
+    for line in stream:
+        if boundary is not None and line.startswith(boundary):
+            break
+        # The line break before a boundary belongs to the boundary, so hold one line back
+        if previous is not None:
+            yield decoder.decode(previous)
+        previous = line
+    if previous is not None:
+        if boundary is not None:
+            previous = previous.rstrip(b'\r\n')
+        yield decoder.decode(previous, final=True)
+    else:
+        yield decoder.decode(b'', final=True)
+
+def _iter_html_part(stream: BinaryIO) -> Iterator[str]:
+    """Yields decoded text of the first text/html part of an MHTML stream."""
+    first_lines = []
+    start = stream.tell()
+    for line in stream:
+        first_lines.append(line)
+        if not line.strip() or len(first_lines) >= 50:
+            break
+    stream.seek(start)
+
+    if not _looks_like_headers([line for line in first_lines if line.strip()]):
+        # Plain HTML file
+        yield from _iter_body(stream, _BodyDecoder('8bit', 'utf-8'), None)
+        return
+
+    headers = _read_headers(stream)
+    if headers.get_content_maintype() != 'multipart':
+        decoder = _BodyDecoder(headers.get('Content-Transfer-Encoding'), headers.get_content_charset('utf-8'))
+        yield from _iter_body(stream, decoder, None)
+        return
+
+    boundary = headers.get_boundary()
+    if not boundary:
+        raise ValueError("Multipart MHTML without a boundary")
+    delimiter = b'--' + boundary.encode('ascii')
+
+    for line in stream:
+        if not line.startswith(delimiter):
+            continue
+        if line.rstrip().endswith(delimiter + b'--'):
+            break
+        part_headers = _read_headers(stream)
+        if part_headers.get_content_type() == 'text/html':
+            decoder = _BodyDecoder(
+                part_headers.get('Content-Transfer-Encoding'), part_headers.get_content_charset('utf-8')
+            )
+            yield from _iter_body(stream, decoder, delimiter)
+            return
+
+    logger.warning("No text/html part found in MHTML archive")
+
+def iter_html_text(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Yields the decoded HTML of a saved page in text chunks.
+
+    MHTML archives are parsed as MIME and only their first text/html part is decoded
+    (quoted-printable, base64 or 7bit/8bit, in the part's charset). Other files are
+    read as UTF-8 HTML. Line endings are normalized to '\\n'.
+
+    Args:
+        file_path (str): Path to an .mhtml/.mht archive or an .html file
+        chunk_size (int): Approximate number of characters per chunk
+
+    Yields:
+        str: Consecutive chunks of the HTML document
+
+    Raises:
+        ValueError: If a multipart archive has no boundary
+    """
+    with open(file_path, 'rb') as stream:
+        pending = []
+        size = 0
+        for text in _iter_html_part(stream):
+            if not text:
+                continue
+            pending.append(text)
+            size += len(text)
+            if size >= chunk_size:
+                yield ''.join(pending)
+                pending, size = [], 0
+        if pending:
+            yield ''.join(pending)
+
+def read_html_text(file_path: str) -> str:
+    """
+    Returns the decoded HTML of a saved page as one string.
+
+    Args:
+        file_path (str): Path to an .mhtml/.mht archive or an .html file
+
+    Returns:
+        str: The HTML document
+    """
+    return ''.join(iter_html_text(file_path))
+
+def decode_html_text(text: str) -> str:
+    """
+    Decodes page text that was read without MIME decoding.
+
+    A whole MHTML archive read as text is decoded like `iter_html_text` decodes the
+    file. Text without MIME headers that still carries quoted-printable escapes
+    ('=3D', '=' soft line breaks), e.g. the HTML part cut out of an archive, is
+    decoded as quoted-printable. Anything else is returned unchanged.
+
+    Args:
+        text (str): Raw MHTML archive, quoted-printable HTML or decoded HTML
+
+    Returns:
+        str: The HTML document
+    """
+    data = text.encode('utf-8')
+    first_lines = []
+    for line in data.splitlines()[:50]:
+        if not line.strip():
+            break
+        first_lines.append(line)
+
+    if _looks_like_headers(first_lines):
+        return ''.join(_iter_html_part(io.BytesIO(data)))
+    if _QP_MARKER in text:
+        return ''.join(_iter_body(io.BytesIO(data), _BodyDecoder('quoted-printable', 'utf-8'), None))
+    return text
@@ -0,0 +1,209 @@
+"""
+Multi-org permission catalog with provenance.
+
+Exports of the same permission from different orgs rarely match byte for byte: the
+description may differ in whitespace or wording and the requirement text may be
+missing. Deduplicating on every column therefore keeps the same API Name several
+times and the LLM stages classify it several times. The catalog keys permissions on
+their normalized API Name instead and emits one canonical row per permission, with
+the orgs exposing it and the number of distinct description variants. The full
+per-org provenance is available as a compact categorical long table.
+
+Example:
+    >>> catalog_df = scrape_permission_catalog(glob.glob('data/raw/*.mhtml'), max_workers=4)
+    >>> catalog_df[['API Name', 'Orgs', 'Org Count', 'Description Variants']].head()
+"""
+
+import re
+import os
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+from .permission_scraper import clean_permission_data, save_permission_data, extract_permissions_from_files
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Salesforce org IDs (15 or 18 characters, prefix 00D) as they appear in export file names
+ORG_ID_PATTERN = re.compile(r'00D[a-zA-Z0-9]{12}(?:[a-zA-Z0-9]{3})?')
+
+# Separator of the org IDs in the 'Orgs' column
+ORG_SEPARATOR = ';'
+
+# Provenance columns added to the catalog
+PROVENANCE_COLUMNS = ['Orgs', 'Org Count', 'Description Variants']
+
+def org_id_from_path(file_path: str) -> str:
+    """
+    Returns the org ID encoded in an export's file name, or the file stem without one.
+
+    Args:
+        file_path (str): Path of a permission export
+
+    Returns:
+        str: Org identifier
+    """
+    stem = Path(file_path).stem
+    match = ORG_ID_PATTERN.search(stem)
+    return match.group(0) if match else stem
+
+def normalize_api_name(api_names: pd.Series) -> pd.Series:
+    """
+    Normalizes API Names for matching across orgs (trimmed, case-folded).
+
+    Args:
+        api_names (pd.Series): API Name column
+
+    Returns:
+        pd.Series: Normalized names; missing or blank names become missing
+    """
+    normalized = api_names.astype(object).str.strip().str.casefold()
+    return normalized.where(normalized != '', None)
+
+def _normalize_text(values: pd.Series) -> pd.Series:
+    """Collapses whitespace so formatting differences do not count as variants."""
+    normalized = values.astype(object).str.replace(r'\s+', ' ', regex=True).str.strip()
+    return normalized.where(normalized != '', None)
+
+def _combined_rows(frames: List[pd.DataFrame], orgs: List[str]) -> pd.DataFrame:
+    if len(frames) != len(orgs):
+        raise ValueError(f"Got {len(frames)} DataFrames but {len(orgs)} orgs")
+    combined = pd.concat([df.assign(Org=org) for df, org in zip(frames, orgs)], ignore_index=True)
+    return clean_permission_data(combined)
+
+def build_permission_provenance(frames: List[pd.DataFrame], orgs: List[str]) -> pd.DataFrame:
+    """
+    Builds the long table of which org exposes which permission with which description.
+
+    Args:
+        frames (List[pd.DataFrame]): Uncleaned permission rows of each export
+        orgs (List[str]): Org of each export; several exports may share an org
+
+    Returns:
+        pd.DataFrame: One row per (API Key, Org, Description Hash) with categorical
+            'API Key', 'Org' and 'Description' columns, so repeated texts are stored once
+
+    Raises:
+        ValueError: If `frames` and `orgs` differ in length
+    """
+    rows = _combined_rows(frames, orgs)
+    return _provenance(rows)
+
+def _provenance(rows: pd.DataFrame) -> pd.DataFrame:
+    api_keys = normalize_api_name(rows['API Name'])
+    # Permissions without an API Name fall back to their label
+    name_keys = 'name:' + rows['Permission Name'].astype(object).str.strip().str.casefold()
+    keys = api_keys.where(api_keys.notna(), name_keys)
+
+    descriptions = _normalize_text(rows['Description'])
+    hashes = pd.util.hash_array(descriptions.fillna('').to_numpy(dtype=object))
+
+    provenance = pd.DataFrame({
+        'API Key': keys.to_numpy(dtype=object),
+        'Org': rows['Org'].to_numpy(dtype=object),
+        'Description Hash': hashes,
+        'Description': descriptions.to_numpy(dtype=object),
+        'Row': range(len(rows))
+    })
+    provenance = provenance.drop_duplicates(['API Key', 'Org', 'Description Hash']).reset_index(drop=True)
+    return provenance.astype({'API Key': 'category', 'Org': 'category', 'Description': 'category'})
+
+def build_permission_catalog(frames: List[pd.DataFrame], orgs: List[str]) -> pd.DataFrame:
+    """
+    Merges permission exports of many orgs into one canonical row per permission.
+
+    Permissions are keyed on their normalized API Name. The canonical row is the one
+    carrying the description shared by the most orgs (rows with a description win over
+    rows without one; ties go to the first export).
+
+    Args:
+        frames (List[pd.DataFrame]): Uncleaned permission rows of each export, e.g.
+            from `extract_permissions_from_files`
+        orgs (List[str]): Org of each export; several exports may share an org
+
+    Returns:
+        pd.DataFrame: The permission columns plus 'Orgs' (sorted org IDs joined by ';'),
+            'Org Count' and 'Description Variants' (distinct descriptions across orgs)
+
+    Raises:
+        ValueError: If `frames` and `orgs` differ in length
+    """
+    rows = _combined_rows(frames, orgs)
+    permission_columns = [col for col in rows.columns if col != 'Org']
+    if rows.empty:
+        return pd.DataFrame(columns=permission_columns + PROVENANCE_COLUMNS)
+
+    provenance = _provenance(rows)
+    provenance['Has Description'] = provenance['Description'].notna()
+
+    # Rank the description variants of each permission
+    variants = provenance.groupby(['API Key', 'Description Hash'], observed=True, sort=False).agg(
+        org_count=('Org', 'nunique'),
+        first_row=('Row', 'min'),
+        has_description=('Has Description', 'any')
+    ).reset_index()
+    canonical = variants.sort_values(
+        ['has_description', 'org_count', 'first_row'], ascending=[False, False, True], kind='stable'
+    ).drop_duplicates('API Key').set_index('API Key')
+
+    by_key = provenance.groupby('API Key', observed=True, sort=False)
+    orgs_by_key = by_key['Org'].agg(lambda values: ORG_SEPARATOR.join(sorted(set(values))))
+    org_counts = by_key['Org'].nunique()
+    description_variants = provenance[provenance['Has Description']].groupby(
+        'API Key', observed=True
+    )['Description Hash'].nunique()
+
+    # Keep the order in which permissions first appear in the exports
+    keys = by_key['Row'].min().sort_values(kind='stable').index
+    canonical_rows = canonical['first_row'].reindex(keys).to_numpy()
+
+    catalog = rows.iloc[canonical_rows][permission_columns].reset_index(drop=True)
+    catalog['API Name'] = catalog['API Name'].str.strip()
+    catalog['Orgs'] = orgs_by_key.reindex(keys).to_numpy()
+    catalog['Org Count'] = org_counts.reindex(keys).to_numpy()
+    catalog['Description Variants'] = description_variants.reindex(keys).fillna(0).astype(int).to_numpy()
+
+    logger.info(f"Merged {len(rows)} permission rows from {rows['Org'].nunique()} orgs into {len(catalog)} permissions")
+    return catalog
+
+def scrape_permission_catalog(
+    html_file_paths: list[str],
+    output_path: Optional[str] = None,
+    parser: str = 'html.parser',
+    max_workers: int = 1,
+    cache_dir: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Scrapes permission exports of many orgs into a deduplicated catalog.
+
+    The org of each export is read from its file name (the 00D... org ID).
+
+    Args:
+        html_file_paths (list[str]): List of paths to .mhtml or .html files containing permission data
+        output_path (str, optional): Path to save the catalog CSV. Defaults to
+            data/output/user_permission_catalog.csv
+        parser (str): HTML parser backend, see `extract_permission_data`
+        max_workers (int): Worker processes parsing files in parallel
+        cache_dir (str, optional): Directory of the content-hash scrape cache
+
+    Returns:
+        pd.DataFrame: Catalog from `build_permission_catalog`
+    """
+    frames = extract_permissions_from_files(
+        html_file_paths, parser=parser, max_workers=max_workers, cache_dir=cache_dir
+    )
+    orgs = [org_id_from_path(file_path) for file_path in html_file_paths]
+    catalog_df = build_permission_catalog(frames, orgs)
+
+    if output_path is None:
+        output_path = os.path.join('data', 'output', 'user_permission_catalog.csv')
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    save_permission_data(catalog_df, output_path)
+
+    print(f"\nCataloged {len(catalog_df)} permissions from {len(set(orgs))} orgs ({len(html_file_paths)} files).")
+    print(f"Permissions with description variants: {(catalog_df['Description Variants'] > 1).sum()}")
+    print(f"\nData saved to: {output_path}")
+    return catalog_df
@@ -1,36 +1,52 @@
 import pandas as pd
 from bs4 import BeautifulSoup
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Union
 import os
+from concurrent.futures import ProcessPoolExecutor
 
+from .mhtml_reader import iter_html_text, decode_html_text
+from .scrape_cache import ScrapeCache
+
+# Parser backends accepted by extract_permission_data
+PARSER_BACKENDS = ('html.parser', 'lxml', 'auto')
+
+# Version of the extraction logic; bump it when extracted rows change so cached scrapes are redone
+PARSER_VERSION = '2'
 
-def __clean_api_name(raw_name):
-    if raw_name:
-        # Remove "3D" if it exists at the start
-        cleaned = raw_name.replace('3D"', '').replace('"', '')
-        return cleaned.strip()
-    return None
 
 def __clean_text(raw_text):
     if raw_text:
-        cleaned = raw_text.replace('=\n', '').strip()
+        cleaned = raw_text.strip()
         return cleaned
     return None
 
 
-def extract_permission_data(html_content: str) -> pd.DataFrame:
-    """
-    Extract permission data from Salesforce permission page HTML content.
-    
-    Args:
-        html_content (str): HTML content containing permission information
-        
-    Returns:
-        pd.DataFrame: DataFrame containing permission data with columns:
-            - Permission Name
-            - API Name
-            - Description
-    """
+def _resolve_parser(parser: str) -> str:
+    """Returns the backend to use, resolving 'auto' to lxml when it is installed."""
+    if parser not in PARSER_BACKENDS:
+        raise ValueError(f"Unsupported parser: {parser}. Expected one of {PARSER_BACKENDS}")
+    if parser == 'html.parser':
+        return parser
+    try:
+        import lxml.html  # noqa: F401
+        return 'lxml'
+    except ImportError as e:
+        if parser == 'lxml':
+            raise ImportError("The lxml parser backend requires lxml: pip install lxml") from e
+        return 'html.parser'
+
+def _permission_row(permission_name: Optional[str], raw_api_name: Optional[str],
+                    raw_requirement: Optional[str], raw_description: Optional[str]) -> Dict:
+    """Builds a permission record from the raw values extracted from a table row."""
+    return {
+        'Permission Name': permission_name,
+        'API Name': __clean_text(raw_api_name),
+        'Permission Requirement': __clean_text(raw_requirement),
+        'Description': __clean_text(raw_description)
+    }
+
+def _extract_rows_html_parser(html_content: str) -> List[Dict]:
+    """Extracts permission rows with BeautifulSoup's pure-Python html.parser."""
     soup = BeautifulSoup(html_content, 'html.parser')
     permissions = []
     
@@ -42,31 +58,123 @@ def extract_permission_data(html_content: str) -> pd.DataFrame:
         permission_name_tag = row.find('label')
         permission_name = permission_name_tag.get_text(strip=True) if permission_name_tag else None
 
-        # Extract and Clean API Name
+        # Extract API Name
         api_name_tag = row.find('a')
-        api_name = None
+        raw_api_name = None
         if api_name_tag and api_name_tag.has_attr('name'):
             raw_api_name = api_name_tag['name']
-            api_name = __clean_api_name(raw_api_name)
 
-        # Extract and Clean Permission Requirement
+        # Extract Permission Requirement
         perm_req_div = row.find('div', class_='mouseOverInfo')
-        permission_requirement = None
+        raw_requirement = None
         if perm_req_div:
             body_div = perm_req_div.find('div', class_='body')
-            permission_requirement = __clean_text(body_div.get_text()) if body_div else None
+            raw_requirement = body_div.get_text() if body_div else None
 
-        # Extract and Clean Permission Description
+        # Extract Permission Description
         description_span = row.find('span')
-        description = __clean_text(description_span.get_text()) if description_span else None
+        raw_description = description_span.get_text() if description_span else None
+
+        permissions.append(_permission_row(permission_name, raw_api_name, raw_requirement, raw_description))
+    
+    return permissions
+
+def _has_class(element, class_name: str) -> bool:
+    return class_name in (element.get('class') or '').split()
+
+def _extract_rows_lxml(html_chunks: Iterable[str]) -> List[Dict]:
+    """
+    Extracts permission rows with lxml.
+
+    The chunks are fed to lxml's incremental parser, so a page streamed from disk is
+    never held as one string. Each row is then walked once over its label, anchor,
+    div and span elements, keeping the first of each the way the html.parser backend
+    finds them.
+    """
+    import lxml.html
+
+    parser = lxml.html.HTMLParser(encoding='utf-8')
+    has_content = False
+    for chunk in html_chunks:
+        if chunk:
+            has_content = has_content or not chunk.isspace()
+            parser.feed(chunk.encode('utf-8'))
+    if not has_content:
+        return []
+    root = parser.close()
+    permissions = []
+
+    for row in root.iter('tr'):
+        label_tag = anchor_tag = info_div = span_tag = None
+        for element in row.iter('label', 'a', 'div', 'span'):
+            if element is row:
+                continue
+            tag = element.tag
+            if tag == 'label':
+                if label_tag is None:
+                    label_tag = element
+            elif tag == 'a':
+                if anchor_tag is None:
+                    anchor_tag = element
+            elif tag == 'span':
+                if span_tag is None:
+                    span_tag = element
+            elif info_div is None and _has_class(element, 'mouseOverInfo'):
+                info_div = element
+
+        permission_name = None
+        if label_tag is not None:
+            permission_name = ''.join(text.strip() for text in label_tag.itertext())
+
+        raw_requirement = None
+        if info_div is not None:
+            for element in info_div.iter('div'):
+                if element is not info_div and _has_class(element, 'body'):
+                    raw_requirement = ''.join(element.itertext())
+                    break
+
+        permissions.append(_permission_row(
+            permission_name,
+            anchor_tag.get('name') if anchor_tag is not None else None,
+            raw_requirement,
+            ''.join(span_tag.itertext()) if span_tag is not None else None
+        ))
 
-        permission = {
-            'Permission Name': permission_name,
-            'API Name': api_name,
-            'Permission Requirement': permission_requirement,
-            'Description': description
-        }
-        permissions.append(permission)
+    return permissions
+
+def extract_permission_data(html_content: Union[str, Iterable[str]], parser: str = 'html.parser') -> pd.DataFrame:
+    """
+    Extract permission data from Salesforce permission page HTML content.
+    
+    Args:
+        html_content (Union[str, Iterable[str]]): HTML containing permission information,
+            as one string or as decoded chunks (e.g. from `iter_html_text`). A string may
+            also be a raw MHTML archive or quoted-printable HTML; it is decoded first.
+            The lxml backend parses chunks incrementally
+        parser (str): 'html.parser' (BeautifulSoup), 'lxml', or 'auto' to use lxml
+            when it is installed. Both backends return the same rows; lxml parses
+            large exports several times faster
+        
+    Returns:
+        pd.DataFrame: DataFrame containing permission data with columns:
+            - Permission Name
+            - API Name
+            - Permission Requirement
+            - Description
+
+    Raises:
+        ValueError: If the parser is not supported
+        ImportError: If parser='lxml' and lxml is not installed
+    """
+    if isinstance(html_content, str):
+        html_content = decode_html_text(html_content)
+
+    if _resolve_parser(parser) == 'lxml':
+        permissions = _extract_rows_lxml([html_content] if isinstance(html_content, str) else html_content)
+    else:
+        if not isinstance(html_content, str):
+            html_content = ''.join(html_content)
+        permissions = _extract_rows_html_parser(html_content)
     
     # Create DataFrame
     df = pd.DataFrame(permissions)
@@ -105,28 +213,86 @@ def save_permission_data(df: pd.DataFrame, output_path: str):
     df.to_csv(output_path, index=False)
 
 
-def scrape_permissions_from_file(html_file_paths: list[str], output_path: str = None) -> pd.DataFrame:
+def _extract_file(file_path: str, parser: str) -> pd.DataFrame:
+    """Extracts the permission rows of one file; top-level so worker processes can run it."""
+    # Stream the decoded HTML of the file into the parser
+    return extract_permission_data(iter_html_text(file_path), parser=parser)
+
+def extract_permissions_from_files(html_file_paths: list[str], parser: str = 'html.parser', max_workers: int = 1, cache_dir: Optional[str] = None) -> list[pd.DataFrame]:
+    """
+    Extract the raw permission rows of each file, optionally in parallel.
+
+    Parsing is CPU-bound, so with `max_workers` > 1 the files are parsed in a process
+    pool and scale with the number of cores. With `cache_dir`, rows are cached by the
+    content hash of each file and `PARSER_VERSION`, so only new or changed exports are
+    parsed. Results keep the order of the input paths.
+    
+    Args:
+        html_file_paths (list[str]): List of paths to .mhtml or .html files containing permission data
+        parser (str): HTML parser backend, see `extract_permission_data`
+        max_workers (int): Worker processes parsing files; 1 parses in this process
+        cache_dir (str, optional): Directory of the scrape cache. Defaults to no caching
+        
+    Returns:
+        list[pd.DataFrame]: One uncleaned DataFrame per file
+
+    Example:
+        >>> frames = extract_permissions_from_files(glob.glob('data/raw/*.mhtml'), max_workers=8,
+        ...                                         cache_dir='data/cache/scrape')
+    """
+    frames = [None] * len(html_file_paths)
+    cache = ScrapeCache(cache_dir, version=PARSER_VERSION) if cache_dir else None
+    digests = []
+    if cache is not None:
+        digests = [cache.file_digest(file_path) for file_path in html_file_paths]
+        for i, file_path in enumerate(html_file_paths):
+            frames[i] = cache.get(digests[i])
+            if frames[i] is not None:
+                print(f"Loaded {file_path} from cache")
+    pending = [i for i, df in enumerate(frames) if df is None]
+
+    workers = min(max_workers, len(pending))
+    if workers <= 1:
+        parsed = []
+        for i in pending:
+            print(f"Processing {html_file_paths[i]}...")
+            parsed.append(_extract_file(html_file_paths[i], parser))
+    else:
+        print(f"Processing {len(pending)} files with {workers} worker processes...")
+        pending_paths = [html_file_paths[i] for i in pending]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parsed = list(executor.map(_extract_file, pending_paths, [parser] * len(pending_paths)))
+        for file_path, df in zip(pending_paths, parsed):
+            print(f"Processed {file_path}: {len(df)} rows")
+
+    for i, df in zip(pending, parsed):
+        frames[i] = df
+        if cache is not None:
+            cache.put(digests[i], df)
+    return frames
+
+def scrape_permissions_from_file(html_file_paths: list[str], output_path: str = None, parser: str = 'html.parser', max_workers: int = 1, cache_dir: Optional[str] = None) -> pd.DataFrame:
     """
     Read HTML files and extract permission data from each file.
+
+    MHTML exports are decoded as MIME archives (quoted-printable or base64 HTML part)
+    and streamed into the parser, so API names and descriptions need no cleanup of
+    encoding artifacts.
     
     Args:
-        html_file_paths (list[str]): List of paths to HTML files containing permission data
+        html_file_paths (list[str]): List of paths to .mhtml or .html files containing permission data
         output_path (str, optional): Path to save the combined CSV output
+        parser (str): HTML parser backend, see `extract_permission_data`
+        max_workers (int): Worker processes parsing files in parallel; 1 parses serially
+        cache_dir (str, optional): Directory of the content-hash scrape cache, e.g.
+            'data/cache/scrape'. Unchanged exports are then loaded instead of parsed
         
     Returns:
         pd.DataFrame: Combined DataFrame with permissions from all files
     """
-    all_permissions = []
-    
-    for file_path in html_file_paths:
-        # Read the HTML file
-        print(f"Processing {file_path}...")
-        with open(file_path, 'r', encoding='utf-8') as file:
-            html_content = file.read()
-        
-        # Extract permission data
-        df = extract_permission_data(html_content)
-        all_permissions.append(df)
+    all_permissions = extract_permissions_from_files(
+        html_file_paths, parser=parser, max_workers=max_workers, cache_dir=cache_dir
+    )
     
     # Combine all DataFrames
     combined_df = pd.concat(all_permissions, ignore_index=True)
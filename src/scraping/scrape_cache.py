@@ -0,0 +1,109 @@
+"""
+Content-hash cache of the permission rows extracted from raw exports.
+
+Each export is keyed by the SHA-256 of its bytes, so an unchanged file is never parsed
+twice no matter where it lives or when it was touched. Entries are gzip-compressed
+JSON holding the column names and row values, tagged with the version of the parser
+that produced them; entries from another parser version are treated as misses and
+overwritten.
+
+Example:
+    >>> cache = ScrapeCache('data/cache/scrape', version=PARSER_VERSION)
+    >>> digest = cache.file_digest('data/raw/perm_sets_system_perms.mhtml')
+    >>> df = cache.get(digest)  # None on a miss
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Block size used when hashing files
+_HASH_BLOCK_SIZE = 1 << 20
+
+class ScrapeCache:
+    """
+    Directory of extracted permission rows keyed by export content hash.
+
+    Args:
+        cache_dir (str): Directory holding the cache entries
+        version (str): Parser version stored with each entry; other versions miss
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], version: str):
+        self.cache_dir = Path(cache_dir)
+        self.version = version
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def file_digest(file_path: Union[str, Path]) -> str:
+        """
+        Returns the SHA-256 hex digest of a file's contents.
+
+        Args:
+            file_path (str): File to hash
+
+        Returns:
+            str: Hex digest
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _entry_path(self, digest: str) -> Path:
+        return self.cache_dir / f"{digest}.json.gz"
+
+    def get(self, digest: str) -> Optional[pd.DataFrame]:
+        """
+        Loads the rows cached for a content digest.
+
+        Args:
+            digest (str): Digest from `file_digest`
+
+        Returns:
+            Optional[pd.DataFrame]: The cached rows, or None when missing, unreadable or
+                written by another parser version
+        """
+        path = self._entry_path(digest)
+        if not path.exists():
+            return None
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable scrape cache entry {path}: {str(e)}")
+            return None
+        if entry.get('version') != self.version:
+            return None
+        return pd.DataFrame([dict(zip(entry['columns'], row)) for row in entry['rows']])
+
+    def put(self, digest: str, df: pd.DataFrame) -> None:
+        """
+        Stores the rows extracted from a file.
+
+        Args:
+            digest (str): Digest from `file_digest`
+            df (pd.DataFrame): Rows extracted from the file
+        """
+        frame = df.astype(object).where(df.notna(), None)
+        entry = {
+            'version': self.version,
+            'columns': [str(col) for col in df.columns],
+            'rows': frame.values.tolist()
+        }
+        path = self._entry_path(digest)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            json.dump(entry, f, ensure_ascii=False, separators=(',', ':'))
+        tmp_path.replace(path)
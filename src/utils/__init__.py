@@ -2,9 +2,18 @@
 Utility modules for common operations across the project.
 """
 
-from .data_utils import save_data, load_config
+from .data_utils import (
+    save_data, load_config, iter_data_chunks, count_data_rows, write_columnar, read_columnar
+)
+from .blob_store import BlobStore, resolve_blobs
  
 __all__ = [
     'save_data',
-    'load_config'
+    'load_config',
+    'iter_data_chunks',
+    'count_data_rows',
+    'write_columnar',
+    'read_columnar',
+    'BlobStore',
+    'resolve_blobs'
 ] 
\ No newline at end of file
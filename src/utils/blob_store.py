@@ -0,0 +1,202 @@
+"""
+Content-addressed, compressed storage for large text values.
+
+Verbose LLM output (evaluations, full-fidelity markdown) is stored once per distinct
+text and result tables keep only a short reference such as 'blob:sha256:3f2a...'.
+Blobs are compressed with zstd when the `zstandard` package is installed and gzip
+otherwise, and live either as files under a directory or as rows of a SQLite table.
+"""
+
+import gzip
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, List, Union
+
+import pandas as pd
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Prefix of the references stored in place of blob values
+BLOB_REF_PREFIX = 'blob:sha256:'
+
+def is_blob_ref(value) -> bool:
+    """Whether a value is a blob reference."""
+    return isinstance(value, str) and value.startswith(BLOB_REF_PREFIX)
+
+def _default_codec() -> str:
+    try:
+        import zstandard  # noqa: F401
+        return 'zstd'
+    except ImportError:
+        return 'gzip'
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        import zstandard
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("Reading zstd blobs requires zstandard: pip install zstandard") from e
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+class BlobStore:
+    """
+    Content-addressed store of compressed text blobs.
+
+    Identical texts are stored once. Writes are atomic: files are written under a
+    temporary name and renamed, and SQLite inserts are ignored when the blob exists.
+
+    Args:
+        root (str): Directory for file blobs, or the SQLite database file
+        backend (str): 'files' or 'sqlite'
+        codec (str, optional): 'zstd' or 'gzip'. Defaults to zstd when available
+
+    Example:
+        >>> store = BlobStore('data/checkpoints/blobs')
+        >>> ref = store.put(evaluation_text)
+        >>> store.get(ref) == evaluation_text
+        True
+    """
+
+    def __init__(self, root: Union[str, Path], backend: str = 'files', codec: Optional[str] = None):
+        if backend not in ('files', 'sqlite'):
+            raise ValueError(f"Unsupported blob store backend: {backend}")
+        self.root = Path(root)
+        self.backend = backend
+        self.codec = codec or _default_codec()
+        self._lock = threading.Lock()
+        self._connection = None
+
+        if backend == 'files':
+            self.root.mkdir(parents=True, exist_ok=True)
+        else:
+            self.root.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(str(self.root), check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, codec TEXT, data BLOB)"
+            )
+            self._connection.commit()
+
+    def _file_path(self, digest: str, codec: str) -> Path:
+        suffix = '.zst' if codec == 'zstd' else '.gz'
+        return self.root / digest[:2] / f"{digest}{suffix}"
+
+    def put(self, text: str) -> str:
+        """
+        Stores a text and returns its reference.
+
+        Args:
+            text (str): Text to store
+
+        Returns:
+            str: Reference to pass to `get`
+        """
+        data = text.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        ref = f"{BLOB_REF_PREFIX}{digest}"
+
+        if self.backend == 'files':
+            path = self._file_path(digest, self.codec)
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+                tmp_path.write_bytes(_compress(data, self.codec))
+                tmp_path.replace(path)
+        else:
+            with self._lock:
+                self._connection.execute(
+                    "INSERT OR IGNORE INTO blobs (digest, codec, data) VALUES (?, ?, ?)",
+                    (digest, self.codec, _compress(data, self.codec))
+                )
+                self._connection.commit()
+        return ref
+
+    def get(self, ref: str) -> str:
+        """
+        Loads the text behind a reference.
+
+        Args:
+            ref (str): Reference returned by `put`
+
+        Returns:
+            str: The stored text
+
+        Raises:
+            KeyError: If the blob does not exist
+        """
+        if not is_blob_ref(ref):
+            raise ValueError(f"Not a blob reference: {ref}")
+        digest = ref[len(BLOB_REF_PREFIX):]
+
+        if self.backend == 'files':
+            for codec in (self.codec, 'gzip', 'zstd'):
+                path = self._file_path(digest, codec)
+                if path.exists():
+                    return _decompress(path.read_bytes(), codec).decode('utf-8')
+            raise KeyError(ref)
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT codec, data FROM blobs WHERE digest = ?", (digest,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(ref)
+        return _decompress(row[1], row[0]).decode('utf-8')
+
+    def __contains__(self, ref: str) -> bool:
+        try:
+            self.get(ref)
+            return True
+        except (KeyError, ValueError):
+            return False
+
+    def close(self) -> None:
+        """Closes the SQLite connection, if any."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+def resolve_blobs(
+    df: pd.DataFrame,
+    store: BlobStore,
+    columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Replaces blob references in a DataFrame with the stored texts.
+
+    Only the requested columns are loaded, each distinct reference once. Filter the
+    DataFrame first to load only the blobs you need.
+
+    Args:
+        df (pd.DataFrame): DataFrame holding blob references
+        store (BlobStore): Store the references point to
+        columns (List[str], optional): Columns to resolve. Defaults to every column holding references
+
+    Returns:
+        pd.DataFrame: Copy of the DataFrame with texts in place of references
+    """
+    if columns is None:
+        columns = [
+            col for col in df.columns
+            if df[col].dtype == object or pd.api.types.is_string_dtype(df[col])
+        ]
+
+    resolved = {}
+    for col in columns:
+        values = df[col].astype(object)
+        refs = [value for value in pd.unique(values) if is_blob_ref(value)]
+        if not refs:
+            continue
+        texts = {ref: store.get(ref) for ref in refs}
+        resolved[col] = values.map(lambda value: texts.get(value, value) if is_blob_ref(value) else value)
+    return df.assign(**resolved) if resolved else df
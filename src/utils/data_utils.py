@@ -3,10 +3,11 @@ Utility functions for data handling and I/O operations.
 """
 
 import os
+import enum
 import pandas as pd
 from pathlib import Path
 import yaml
-from typing import Union, Optional
+from typing import Union, Optional, List, Dict, Iterable, Iterator
 import logging
 
 # Set up logging
@@ -43,7 +44,8 @@ def save_data(
     data_type: str = "output",
     format: str = "csv",
     subdirectory: Optional[str] = None,
-    index: bool = False
+    index: bool = False,
+    compression: Optional[str] = None
 ) -> str:
     """
     Save data to the appropriate directory based on data type.
@@ -52,9 +54,11 @@ def save_data(
         data: Data to save (DataFrame, dict, or list)
         filename: Name of the file (without extension)
         data_type: Type of data ('raw', 'processed', or 'output')
-        format: File format ('csv', 'json', 'pickle')
+        format: File format ('csv', 'json', 'pickle', 'parquet', 'arrow')
         subdirectory: Optional subdirectory within the data type directory
         index: Whether to save DataFrame index
+        compression: Compression codec for columnar formats ('snappy', 'zstd', 'gzip', 'lz4'
+            or 'none'). Defaults to 'zstd' for parquet and 'lz4' for arrow
     
     Returns:
         str: Path to the saved file
@@ -91,6 +95,8 @@ def save_data(
                 data.to_json(full_path, orient='records')
             elif format == 'pickle':
                 data.to_pickle(full_path)
+            elif format in COLUMNAR_FORMATS:
+                write_columnar(data, full_path, format=format, index=index, compression=compression)
             else:
                 raise ValueError(f"Unsupported format for DataFrame: {format}")
         
@@ -114,4 +120,219 @@ def save_data(
     
     except Exception as e:
         logger.error(f"Error saving data to {full_path}: {str(e)}")
-        raise 
\ No newline at end of file
+        raise 
+
+
+# Columnar formats supported by save_data and the checkpoint writer (require pyarrow)
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
+_DEFAULT_COMPRESSION = {'parquet': 'zstd', 'arrow': 'lz4'}
+
+
+def to_columnar(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Prepares a DataFrame for columnar storage.
+
+    Object columns holding enum members (e.g. RiskRating) or the "ERROR" marker are
+    converted to categoricals of their string form, which matches how they are
+    written to CSV and stores each distinct value once.
+
+    Args:
+        df: DataFrame to convert
+
+    Returns:
+        pd.DataFrame: DataFrame with enum columns as categoricals
+    """
+    converted = {}
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        values = df[col].dropna()
+        if len(values) and values.map(lambda v: isinstance(v, enum.Enum)).any():
+            converted[col] = df[col].map(lambda v: str(v) if v is not None and v == v else None).astype('category')
+    return df.assign(**converted) if converted else df
+
+
+def write_columnar(
+    df: pd.DataFrame,
+    path: Union[str, Path],
+    format: str = 'parquet',
+    index: bool = False,
+    compression: Optional[str] = None
+) -> None:
+    """
+    Writes a DataFrame as Parquet or Arrow IPC with enum columns as categoricals.
+
+    Args:
+        df: DataFrame to write
+        path: Destination file
+        format: 'parquet' or 'arrow'
+        index: Whether to store the DataFrame index
+        compression: Compression codec; 'none' disables compression
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        import pyarrow.feather as feather
+    except ImportError as e:
+        raise ImportError(f"Writing {format} requires pyarrow: pip install pyarrow") from e
+
+    compression = compression or _DEFAULT_COMPRESSION[format]
+    if compression == 'none':
+        compression = None if format == 'parquet' else 'uncompressed'
+
+    table = pa.Table.from_pandas(to_columnar(df), preserve_index=index)
+    if format == 'parquet':
+        pq.write_table(table, path, compression=compression)
+    else:
+        feather.write_feather(table, path, compression=compression)
+
+
+def read_columnar(path: Union[str, Path], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Reads a Parquet or Arrow IPC file written by `write_columnar`.
+
+    Args:
+        path: File to read; the format is taken from the extension
+        columns: Optional subset of columns to read
+
+    Returns:
+        pd.DataFrame: The stored DataFrame
+    """
+    if Path(path).suffix.lower() in ('.arrow', '.feather'):
+        return pd.read_feather(path, columns=columns)
+    return pd.read_parquet(path, columns=columns)
+
+
+def _check_columns(
+    chunk: pd.DataFrame,
+    required_columns: Optional[List[str]],
+    default_columns: Optional[Dict]
+) -> pd.DataFrame:
+    """Adds missing default columns to a chunk and validates the required ones."""
+    if default_columns:
+        missing_defaults = {col: value for col, value in default_columns.items() if col not in chunk.columns}
+        if missing_defaults:
+            chunk = chunk.assign(**missing_defaults)
+    if required_columns:
+        missing_columns = [col for col in required_columns if col not in chunk.columns]
+        if missing_columns:
+            raise ValueError(f"Input data missing required columns: {missing_columns}")
+    return chunk
+
+
+def iter_data_chunks(
+    source: Union[str, Path, pd.DataFrame, Iterable[pd.DataFrame]],
+    chunksize: int = 10000,
+    required_columns: Optional[List[str]] = None,
+    default_columns: Optional[Dict] = None,
+    columns: Optional[List[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Reads tabular input in fixed-size chunks so peak memory does not grow with the input.
+
+    CSV and JSON Lines files are read with the pandas chunked readers; Parquet and Arrow
+    IPC files are read one record batch at a time (requires `pyarrow`). Every chunk gets the default columns
+    it is missing and is validated against the required columns.
+
+    Args:
+        source: Path to a .csv, .jsonl, .parquet or .arrow file, a DataFrame, or an iterable
+            of DataFrames
+        chunksize: Number of rows per chunk
+        required_columns: Columns every chunk must contain
+        default_columns: Columns to add with a constant value when missing,
+            e.g. {'Expanded Description': ''}
+        columns: Optional subset of columns to read from files
+
+    Yields:
+        pd.DataFrame: Chunks of at most `chunksize` rows
+
+    Raises:
+        ValueError: If a chunk is missing required columns or the file format is unsupported
+
+    Example:
+        >>> for chunk in iter_data_chunks('data/input/user_permission_reference_data__full_list.csv',
+        ...                               chunksize=100,
+        ...                               default_columns={'Expanded Description': ''}):
+        ...     print(len(chunk))
+    """
+    if isinstance(source, pd.DataFrame):
+        chunks = (source.iloc[start:start + chunksize] for start in range(0, len(source), chunksize))
+    elif isinstance(source, (str, Path)):
+        suffix = Path(source).suffix.lower()
+        if suffix == '.csv':
+            chunks = pd.read_csv(source, chunksize=chunksize, usecols=columns)
+        elif suffix in ('.parquet', '.pq'):
+            try:
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("Reading Parquet input requires pyarrow: pip install pyarrow") from e
+            parquet_file = pq.ParquetFile(source)
+            chunks = (
+                batch.to_pandas()
+                for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns)
+            )
+        elif suffix in ('.arrow', '.feather'):
+            try:
+                import pyarrow as pa
+            except ImportError as e:
+                raise ImportError("Reading Arrow input requires pyarrow: pip install pyarrow") from e
+            chunks = _iter_arrow_chunks(pa, source, chunksize, columns)
+        elif suffix in ('.jsonl', '.ndjson'):
+            chunks = _iter_jsonl_chunks(source, chunksize, columns)
+        else:
+            raise ValueError(f"Unsupported input format: {suffix}")
+    else:
+        chunks = source
+
+    for chunk in chunks:
+        yield _check_columns(chunk, required_columns, default_columns)
+
+
+def _iter_arrow_chunks(pa, source, chunksize: int, columns: Optional[List[str]]) -> Iterator[pd.DataFrame]:
+    """Yields chunks of a memory-mapped Arrow IPC file."""
+    with pa.memory_map(str(source), 'r') as source_file:
+        reader = pa.ipc.open_file(source_file)
+        for batch_index in range(reader.num_record_batches):
+            batch = reader.get_batch(batch_index)
+            if columns:
+                batch = batch.select(columns)
+            for start in range(0, batch.num_rows, chunksize):
+                yield batch.slice(start, chunksize).to_pandas()
+
+
+def _iter_jsonl_chunks(source, chunksize: int, columns: Optional[List[str]]) -> Iterator[pd.DataFrame]:
+    """Yields chunks of a JSON Lines file."""
+    with pd.read_json(source, lines=True, chunksize=chunksize, dtype=False) as reader:
+        for chunk in reader:
+            yield chunk[columns] if columns else chunk
+
+
+def count_data_rows(source: Union[str, Path], chunksize: int = 10000) -> int:
+    """
+    Counts the rows of a CSV, JSON Lines, Parquet or Arrow IPC file without loading it whole.
+
+    Args:
+        source: Path to a .csv, .jsonl, .parquet or .arrow file
+        chunksize: Number of rows read at a time for CSV files
+
+    Returns:
+        int: Number of data rows
+    """
+    suffix = Path(source).suffix.lower()
+    if suffix in ('.parquet', '.pq'):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(source).metadata.num_rows
+    if suffix in ('.arrow', '.feather'):
+        import pyarrow as pa
+        with pa.memory_map(str(source), 'r') as source_file:
+            reader = pa.ipc.open_file(source_file)
+            return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+    if suffix in ('.jsonl', '.ndjson'):
+        with open(source, 'r', encoding='utf-8') as f:
+            return sum(1 for line in f if line.strip())
+    # Only read one column; quoted newlines still need the CSV parser to count correctly
+    return sum(len(chunk) for chunk in pd.read_csv(source, chunksize=chunksize, usecols=[0]))
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.assignment_engine import AssignmentEngine, pack_bits, unpack_bits
+
+class TestAssignmentEngine(unittest.TestCase):
+    def setUp(self):
+        self.membership = pd.DataFrame({
+            'Permission Set': ['Admin', 'Admin', 'Admin', 'Sales_Ops', 'Sales_Ops', 'Read_Only'],
+            'API Name': ['ModifyAllData', 'ManageUsers', 'ApiEnabled', 'apienabled', 'ExportReport', 'ViewSetup'],
+            'Enabled': [True, True, True, True, True, False]
+        })
+        self.assignments = pd.DataFrame({
+            'User': ['alice', 'bob', 'bob', 'carol', 'dave'],
+            'Permission Set': ['Admin', 'Sales_Ops', 'Read_Only', 'Sales_Ops', 'Unknown_Set']
+        })
+        self.engine = AssignmentEngine.from_frames(self.assignments, self.membership)
+
+    def test_pack_round_trip(self):
+        """Test that packing and unpacking bits is lossless across word boundaries"""
+        matrix = np.random.default_rng(0).random((5, 130)) > 0.5
+        packed = pack_bits(matrix)
+
+        self.assertEqual(packed.shape, (5, 3))
+        self.assertEqual(packed.dtype, np.uint64)
+        np.testing.assert_array_equal(unpack_bits(packed, 130), matrix)
+
+    def test_interns_api_names(self):
+        """Test that API Names differing in case share one bit"""
+        self.assertListEqual(self.engine.permissions, ['ModifyAllData', 'ManageUsers', 'ApiEnabled', 'ExportReport'])
+        self.assertEqual(self.engine.permission_position('APIENABLED'), 2)
+
+    def test_effective_permissions(self):
+        """Test that a user's permissions are the union of their sets"""
+        self.assertListEqual(self.engine.effective_permissions('bob'), ['ApiEnabled', 'ExportReport'])
+        self.assertListEqual(self.engine.effective_permissions('dave'), [])
+        self.assertListEqual(self.engine.users_with('ApiEnabled'), ['alice', 'bob', 'carol'])
+        self.assertListEqual(self.engine.sets_with('ApiEnabled'), ['Admin', 'Sales_Ops'])
+        self.assertListEqual(self.engine.set_permissions('Read_Only'), [])
+
+    def test_matches_dense_union(self):
+        """Test the vectorized OR against a dense boolean product on random data"""
+        rng = np.random.default_rng(1)
+        membership = pd.DataFrame({
+            'Permission Set': [f"PS{i}" for i in rng.integers(0, 40, 500)],
+            'API Name': [f"Perm{i}" for i in rng.integers(0, 150, 500)]
+        })
+        assignments = pd.DataFrame({
+            'User': [f"U{i}" for i in rng.integers(0, 300, 900)],
+            'Permission Set': [f"PS{i}" for i in rng.integers(0, 40, 900)]
+        })
+        engine = AssignmentEngine.from_frames(assignments, membership)
+
+        user_sets = np.zeros((len(engine.users), len(engine.permission_sets)), dtype=int)
+        user_index = {user: i for i, user in enumerate(engine.users)}
+        set_index = {name: i for i, name in enumerate(engine.permission_sets)}
+        for user, permission_set in assignments.itertuples(index=False):
+            user_sets[user_index[user], set_index[permission_set]] = 1
+        expected = (user_sets @ engine.set_matrix().astype(int)) > 0
+
+        np.testing.assert_array_equal(engine.user_matrix(), expected)
+        np.testing.assert_array_equal(engine.permission_user_counts().to_numpy(), expected.sum(axis=0))
+
+    def test_string_enabled_values(self):
+        """Test that 'False' strings read from CSV do not grant permissions"""
+        membership = self.membership.assign(Enabled=['True', 'true', '1', 'TRUE', 'false', 'False'])
+        engine = AssignmentEngine.from_frames(self.assignments, membership)
+
+        self.assertListEqual(engine.effective_permissions('bob'), ['ApiEnabled'])
+        self.assertListEqual(engine.set_permissions('Read_Only'), [])
+        self.assertNotIn('ViewSetup', engine.permissions)
+
+    def test_from_files(self):
+        """Test loading assignments and memberships from CSV files"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            assignments_path = os.path.join(tmp_dir, 'assignments.csv')
+            membership_path = os.path.join(tmp_dir, 'membership.csv')
+            self.assignments.to_csv(assignments_path, index=False)
+            self.membership.to_csv(membership_path, index=False)
+            engine = AssignmentEngine.from_files(assignments_path, membership_path)
+
+        self.assertListEqual(engine.effective_permissions('bob'), ['ApiEnabled', 'ExportReport'])
+
+if __name__ == '__main__':
+    unittest.main()
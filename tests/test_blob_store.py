@@ -0,0 +1,41 @@
+import unittest
+import tempfile
+import os
+import pandas as pd
+from src.utils.blob_store import BlobStore, resolve_blobs, is_blob_ref
+
+class TestBlobStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_put_get_dedupes(self):
+        """Test that identical texts share one blob and round-trip for both backends"""
+        text = '{"rationale": "' + 'x' * 5000 + '"}'
+        for backend, root in (('files', 'blobs'), ('sqlite', 'blobs.db')):
+            store = BlobStore(os.path.join(self.tmp_dir.name, root), backend=backend)
+            ref = store.put(text)
+            self.assertTrue(is_blob_ref(ref))
+            self.assertEqual(store.put(text), ref)
+            self.assertEqual(store.get(ref), text)
+            self.assertIn(ref, store)
+            store.close()
+
+        files = [name for _, _, names in os.walk(os.path.join(self.tmp_dir.name, 'blobs')) for name in names]
+        self.assertEqual(len(files), 1)
+
+    def test_resolve_blobs(self):
+        """Test that references are replaced and other values left alone"""
+        store = BlobStore(os.path.join(self.tmp_dir.name, 'blobs'))
+        df = pd.DataFrame({
+            'API Name': ['A', 'B'],
+            'Evaluation': [store.put('first'), 'Error: boom']
+        })
+        resolved_df = resolve_blobs(df, store)
+        self.assertListEqual(resolved_df['Evaluation'].tolist(), ['first', 'Error: boom'])
+        self.assertListEqual(resolved_df['API Name'].tolist(), ['A', 'B'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+import pandas as pd
+from src.llms.enum_codes import (
+    ENUM_COLUMNS, ERROR_CODE, encode_enum_columns, decode_enum_columns, encode_enum_column
+)
+from src.llms.risk_evaluator import RiskRating
+from src.llms.category_evaluator import CategoryLabel
+
+class TestEnumCodes(unittest.TestCase):
+    def test_round_trip_every_member(self):
+        """Test that every enum member and the error marker decode losslessly"""
+        for column, enum_cls in ENUM_COLUMNS.items():
+            df = pd.DataFrame({column: list(enum_cls) + ['ERROR', None]})
+            encoded_df = encode_enum_columns(df)
+            self.assertIsInstance(encoded_df[column].dtype, pd.CategoricalDtype)
+            self.assertEqual(encoded_df[column].iloc[len(enum_cls)], ERROR_CODE)
+
+            decoded = decode_enum_columns(encoded_df)[column].tolist()
+            self.assertListEqual(decoded[:-1], list(enum_cls) + ['ERROR'])
+            self.assertIsNone(decoded[-1])
+
+    def test_parse_legacy_values(self):
+        """Test that CSV round-tripped strings and codes are recognized"""
+        series = pd.Series(['RiskRating.RESTRICTED', 'GENERAL', '3', 5, 2.0, 'ERROR'])
+        encoded = encode_enum_column(series, RiskRating)
+        self.assertListEqual(encoded.astype(int).tolist(), [4, 1, 3, 5, 2, -1])
+
+    def test_vectorized_filtering(self):
+        """Test that ordered codes support comparisons"""
+        df = encode_enum_columns(pd.DataFrame({
+            'Risk Rating': [RiskRating.GENERAL, RiskRating.MISSION_CRITICAL, 'ERROR', RiskRating.RESTRICTED],
+            'Category Label': [CategoryLabel.DEVELOPER, CategoryLabel.UNKNOWN, 'ERROR', CategoryLabel.DATA_CLOUD]
+        }))
+        self.assertEqual(int((df['Risk Rating'] >= 4).sum()), 2)
+        self.assertEqual(int(df['Category Label'].cat.codes.max()), len(CategoryLabel))
+
+if __name__ == '__main__':
+    unittest.main()
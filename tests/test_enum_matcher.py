@@ -0,0 +1,58 @@
+import unittest
+from src.llms.enum_matcher import EnumMatcher
+from src.llms import risk_evaluator, category_evaluator, cloud_evaluator, description_evaluator
+from src.llms.risk_evaluator import RiskRating
+from src.llms.category_evaluator import CategoryRating, CategoryLabel
+from src.llms.cloud_evaluator import CloudRating, CloudLabel
+from src.llms.description_evaluator import QualityRating
+
+class TestEnumMatcher(unittest.TestCase):
+    FALLBACKS = [
+        (risk_evaluator._extract_fallback_rating, RiskRating, RiskRating.GENERAL),
+        (category_evaluator._extract_fallback_rating, CategoryRating, CategoryRating.UNKNOWN),
+        (category_evaluator._extract_fallback_label, CategoryLabel, CategoryLabel.UNKNOWN),
+        (cloud_evaluator._extract_fallback_rating, CloudRating, CloudRating.UNKNOWN),
+        (cloud_evaluator._extract_fallback_label, CloudLabel, CloudLabel.UNKNOWN),
+        (description_evaluator._extract_fallback_rating, QualityRating, QualityRating.UNKNOWN)
+    ]
+
+    def test_every_member(self):
+        """Test that every enum member is found by name in words or with underscores"""
+        for extract, enum_cls, default in self.FALLBACKS:
+            for member in enum_cls:
+                words = member.name.replace('_', ' ').title()
+                self.assertEqual(extract(f"The final answer is **{words}**."), member, words)
+                self.assertEqual(extract(f"label: {member.name}"), member, member.name)
+            self.assertEqual(extract("Nothing to see here."), default)
+            self.assertEqual(extract(None), default)
+
+    def test_aliases(self):
+        """Test label spellings used by the prompt templates"""
+        self.assertEqual(category_evaluator._extract_fallback_label("Einstein and AI"), CategoryLabel.EINSTEIN)
+        self.assertEqual(
+            cloud_evaluator._extract_fallback_label("Healthcare & Life Sciences Cloud"),
+            CloudLabel.HEALTHCARE_AND_LIFE_SCIENCES_CLOUD
+        )
+        self.assertEqual(
+            cloud_evaluator._extract_fallback_label("Marking Cloud and Pardot"),
+            CloudLabel.MARKETING_CLOUD_AND_PARDOT
+        )
+
+    def test_declaration_order_precedence(self):
+        """Test that the member declared first wins regardless of position in the text"""
+        matcher = EnumMatcher(RiskRating, default=RiskRating.GENERAL)
+        text = "Not merely sensitive or controlled; this is mission-critical, indeed MISSION CRITICAL."
+        self.assertEqual(matcher.match(text), RiskRating.MISSION_CRITICAL)
+        self.assertEqual(matcher.match("controlled, then sensitive"), RiskRating.SENSITIVE)
+        self.assertEqual(matcher.match("rated Mission-Critical"), RiskRating.MISSION_CRITICAL)
+
+    def test_whole_words_only(self):
+        """Test that phrases inside longer words are not matched"""
+        self.assertEqual(category_evaluator._extract_fallback_label("Einsteinium exposure"), CategoryLabel.UNKNOWN)
+        self.assertEqual(category_evaluator._extract_fallback_label("See einstein_x"), CategoryLabel.UNKNOWN)
+        self.assertEqual(risk_evaluator._extract_fallback_rating("An insensitive, uncontrolled setting"), RiskRating.GENERAL)
+        self.assertEqual(risk_evaluator._extract_fallback_rating("Insensitive, but Restricted."), RiskRating.RESTRICTED)
+        self.assertEqual(category_evaluator._extract_fallback_label("(Einstein)"), CategoryLabel.EINSTEIN)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from src.analysis.few_shot import FewShotSelector, load_template, measure_prompt_sizes, render_prompt
+from src.llms import category_classifier
+from src.llms.category_evaluator import CategoryLabel, CategoryRating
+from src.processing.eval_schemas import parse_template_schema, TEMPLATES_DIR
+
+def _evaluation(label: str) -> str:
+    return json.dumps({'permission_category_label': label, 'confidence': 'High'})
+
+class TestFewShotSelector(unittest.TestCase):
+    def setUp(self):
+        self.results_df = pd.DataFrame({
+            'Permission Name': ['Run Reports', 'Export Reports', 'Modify All Data', 'Author Apex'],
+            'API Name': ['RunReports', 'ExportReport', 'ModifyAllData', 'AuthorApex'],
+            'Description': ['Run reports and dashboards.', 'Export reports to files.',
+                            'Edit all {org} data.', 'Create Apex classes and triggers.'],
+            'Evaluation': [_evaluation('Report and Dashboard'), _evaluation('Import and Export'),
+                           _evaluation('Data Admin'), _evaluation('Developer')]
+        })
+        self.record = pd.Series({
+            'Permission Name': 'Schedule Reports', 'API Name': 'ScheduleReports',
+            'Description': 'Schedule reports and dashboards.', 'Expanded Description': ''
+        })
+
+    def test_select_and_format(self):
+        """Test that the most similar labeled permissions become the examples"""
+        selector = FewShotSelector.from_results(self.results_df, 'category', k=2)
+        examples = selector.select(self.record)
+        self.assertListEqual(list(examples['API Name']), ['RunReports', 'ExportReport'])
+
+        text = selector.format_examples(examples)
+        self.assertIn('**Permission Category Label:** Report and Dashboard', text)
+        # A permission is never its own example
+        own = selector.select(self.results_df.iloc[0])
+        self.assertNotIn('RunReports', list(own['API Name']))
+
+    def test_compact_template(self):
+        """Test that the compact templates keep the output schema and render with examples"""
+        for stage in ['category', 'cloud']:
+            self.assertEqual(
+                parse_template_schema(TEMPLATES_DIR / f"prompt_user_perm_{stage}_compact.md"),
+                parse_template_schema(TEMPLATES_DIR / f"prompt_user_perm_{stage}.md")
+            )
+
+        selector = FewShotSelector.from_results(self.results_df, 'category', k=2)
+        compact = load_template('prompt_user_perm_category_compact.md')
+        record = pd.Series({'Permission Name': 'Modify All Records', 'API Name': 'ModifyAllRecords',
+                            'Description': 'Edit all data.'})
+        prompt = render_prompt(compact, record, selector)
+        # Braces in example text survive the template's str.format
+        self.assertIn('**Permission Description:** Edit all {org} data.', prompt)
+        self.assertIn('Modify All Records', prompt)
+        self.assertNotIn('{few_shot_examples}', prompt)
+
+        sizes = measure_prompt_sizes(
+            self.results_df.assign(**{'Permission Category Label': ['Report and Dashboard'] * 4}),
+            load_template('prompt_user_perm_category.md'), compact, selector
+        )
+        self.assertTrue((sizes['Compact Tokens'] < sizes['Full Tokens']).all())
+        self.assertTrue(sizes.loc[1, 'Label Covered'])
+
+    def test_classifier_fills_examples(self):
+        """Test that the category job sends the examples with each prompt"""
+        selector = FewShotSelector.from_results(self.results_df, 'category', k=1)
+        compact = load_template('prompt_user_perm_category_compact.md')
+        prompts = []
+
+        def evaluate(prompt, **kwargs):
+            prompts.append(prompt)
+            return '{}', CategoryRating.HIGH_MATCH, CategoryLabel.REPORT_AND_DASHBOARD
+
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+                mock.patch.object(category_classifier, 'category_eval_summary', side_effect=evaluate):
+            category_classifier.classify_category(
+                self.record.to_frame().T, compact, checkpoint_dir=tmp_dir,
+                client=object(), few_shot=selector, debug=False
+            )
+            with self.assertRaises(ValueError):
+                category_classifier.classify_category(
+                    self.record.to_frame().T, load_template('prompt_user_perm_category.md'),
+                    checkpoint_dir=tmp_dir, client=object(), few_shot=selector, debug=False
+                )
+
+        self.assertEqual(len(prompts), 1)
+        self.assertIn('1. **Permission Name:** Run Reports', prompts[0])
+        self.assertIn('{permission_name}', prompts[0])
+
+if __name__ == '__main__':
+    unittest.main()
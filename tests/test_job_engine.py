@@ -0,0 +1,369 @@
+import unittest
+import tempfile
+import json
+import os
+import pandas as pd
+from unittest import mock
+from src.llms import description_classifier
+from src.llms.description_evaluator import QualityRating
+from src.llms.job_engine import ClassificationJob
+from src.llms.scheduling import PrioritySchedule, load_priority_list
+from src.llms.job_metrics import JobMetrics, emit_event
+from src.llms.concurrency import AIMDController
+from src.llms.risk_evaluator import RiskRating
+from src.utils.data_utils import write_columnar
+from src.utils.blob_store import BlobStore, resolve_blobs
+
+class TestClassificationJob(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.input_df = pd.DataFrame({
+            'Permission Name': ['View All Data', 'Modify All Data', 'API Enabled', 'Export Reports'],
+            'API Name': ['ViewAllData', 'ModifyAllData', 'ApiEnabled', 'ExportReport'],
+            'Description': ['View all data', 'Modify all data', 'Access the API', 'Export reports']
+        })
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _make_job(self, evaluate_record, input_df=None, **kwargs):
+        return ClassificationJob(
+            input_df=self.input_df if input_df is None else input_df,
+            evaluate_record=evaluate_record,
+            stage='test',
+            input_columns=['Permission Name', 'API Name', 'Description'],
+            result_columns=['Test Rating', 'Evaluation'],
+            error_values={'Test Rating': 'ERROR'},
+            checkpoint_dir=self.tmp_dir.name,
+            job_id='job',
+            debug=False,
+            **kwargs
+        )
+
+    def test_run_collects_results_and_errors(self):
+        """Test that failed evaluations are stored as ERROR rows"""
+        def evaluate(record):
+            if record['API Name'] == 'ApiEnabled':
+                raise RuntimeError('boom')
+            return {'Test Rating': 'HIGH', 'Evaluation': '{}'}
+
+        results_df = self._make_job(evaluate, checkpoint_interval=2).run()
+
+        self.assertEqual(len(results_df), 4)
+        self.assertEqual(results_df.iloc[2]['Test Rating'], 'ERROR')
+        self.assertEqual(results_df.iloc[2]['Evaluation'], 'Error: boom')
+        saved_df = pd.read_csv(os.path.join(self.tmp_dir.name, 'test_classification_job.csv'))
+        self.assertListEqual(list(saved_df['API Name']), list(self.input_df['API Name']))
+
+    def test_stream_yields_batches(self):
+        """Test that micro-batches are yielded as records complete"""
+        job = self._make_job(lambda record: {'Test Rating': 'LOW', 'Evaluation': '{}'})
+        batches = list(job.stream(batch_size=3))
+
+        self.assertListEqual([len(batch) for batch in batches], [3, 1])
+        self.assertListEqual(list(batches[0].columns), job.columns)
+
+    def test_resume_after_early_stop(self):
+        """Test that closing a stream early leaves a resumable checkpoint"""
+        evaluate = lambda record: {'Test Rating': 'LOW', 'Evaluation': '{}'}
+        stream = self._make_job(evaluate, checkpoint_interval=10).stream()
+        next(stream)
+        next(stream)
+        stream.close()
+
+        with open(os.path.join(self.tmp_dir.name, 'test_classification_job.json')) as f:
+            checkpoint_data = json.load(f)
+        self.assertEqual(checkpoint_data['last_processed_index'], 1)
+
+        results_df = self._make_job(evaluate, resume_from_checkpoint=True).run()
+        self.assertListEqual(list(results_df['API Name']), list(self.input_df['API Name']))
+
+    def test_resume_after_stop_inside_batch(self):
+        """Test that rows of an unyielded batch are evaluated again on resume"""
+        class Interrupted(BaseException):
+            pass
+
+        def evaluate(record):
+            if record['API Name'] == 'ExportReport':
+                raise Interrupted()
+            return {'Test Rating': 'LOW', 'Evaluation': '{}'}
+
+        stream = self._make_job(evaluate, checkpoint_interval=1).stream(batch_size=2)
+        received = list(next(stream)['API Name'])
+        # The stop hits while 'ApiEnabled' waits in the second batch
+        with self.assertRaises(Interrupted):
+            next(stream)
+
+        with open(os.path.join(self.tmp_dir.name, 'test_classification_job.json')) as f:
+            checkpoint_data = json.load(f)
+        self.assertEqual(checkpoint_data['last_processed_index'], 1)
+
+        evaluate = lambda record: {'Test Rating': 'LOW', 'Evaluation': '{}'}
+        resumed = self._make_job(evaluate, resume_from_checkpoint=True).stream(batch_size=2)
+        received += [name for batch in resumed for name in batch['API Name']]
+        self.assertListEqual(received, list(self.input_df['API Name']))
+
+    def test_description_stage_end_to_end(self):
+        """Test that the description wrapper evaluates every record through its evaluator"""
+        calls = []
+        def evaluate(prompt, name, api_name, description, **kwargs):
+            calls.append((api_name, kwargs['debug']))
+            return '{}', QualityRating.HIGH_QUALITY, 'full'
+
+        with mock.patch.object(description_classifier, 'description_eval_summary', side_effect=evaluate):
+            results_df = description_classifier.classify_description(
+                self.input_df, 'prompt', checkpoint_dir=self.tmp_dir.name, job_id='job',
+                client=object(), debug=False
+            )
+
+        self.assertListEqual(calls, [(api_name, False) for api_name in self.input_df['API Name']])
+        self.assertListEqual(list(results_df['Quality Rating']), [QualityRating.HIGH_QUALITY] * 4)
+        self.assertListEqual(list(results_df['Full Fidelity Evaluation']), ['full'] * 4)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir.name, 'description_classification_job_dead_letter.jsonl')))
+
+    def test_shared_session_rejects_concurrency(self):
+        """Test that a shared chat session cannot be used by concurrent evaluations"""
+        evaluate = lambda record: {'Test Rating': 'LOW', 'Evaluation': '{}'}
+        for options in ({'concurrency': 2}, {'concurrency': AIMDController(max_limit=4)}, {'retry_workers': 2}):
+            with self.assertRaises(ValueError):
+                self._make_job(evaluate, shared_session=True, **options)
+        self._make_job(evaluate, shared_session=True, concurrency=1)
+
+        with self.assertRaises(ValueError):
+            description_classifier.classify_description(
+                self.input_df, 'prompt', checkpoint_dir=self.tmp_dir.name, chat_session=object(),
+                concurrency='adaptive', debug=False
+            )
+
+    def test_priority_schedule(self):
+        """Test that prioritized permissions are processed first"""
+        schedule = PrioritySchedule(priority_list=['ModifyAllData', 'ApiEnabled'])
+        job = self._make_job(lambda record: {'Test Rating': 'LOW', 'Evaluation': '{}'}, schedule=schedule)
+        rows = list(job.stream())
+
+        self.assertListEqual(
+            [row['API Name'] for row in rows],
+            ['ModifyAllData', 'ApiEnabled', 'ViewAllData', 'ExportReport']
+        )
+
+    def test_load_priority_list(self):
+        """Test that ranked high-risk permissions precede Security Center scope"""
+        priority_list = load_priority_list()
+
+        self.assertEqual(priority_list[0], 'CustomizeApplication')
+        self.assertEqual(priority_list[10], 'ResetPasswords')
+        self.assertEqual(len(priority_list), len(set(priority_list)))
+
+    def test_priority_list_outside_repo_root(self):
+        """Test that the default reference lists are found from any working directory"""
+        cwd = os.getcwd()
+        os.chdir(self.tmp_dir.name)
+        try:
+            priority_list = load_priority_list()
+        finally:
+            os.chdir(cwd)
+
+        self.assertEqual(priority_list[0], 'CustomizeApplication')
+
+    def test_metrics_registry(self):
+        """Test that metrics capture errors, retries and fallbacks"""
+        def evaluate(record):
+            emit_event('fallback', kind='rating')
+            if record['API Name'] == 'ApiEnabled':
+                emit_event('retry', code=429)
+                raise RuntimeError('boom')
+            return {'Test Rating': 'LOW', 'Evaluation': '{}'}
+
+        snapshots = []
+        prom_path = os.path.join(self.tmp_dir.name, 'job.prom')
+        metrics = JobMetrics(prometheus_path=prom_path, callbacks=[snapshots.append])
+        self._make_job(evaluate, metrics=metrics).run()
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['records'], 4)
+        self.assertEqual(snapshot['errors'], 1)
+        self.assertEqual(snapshot['in_flight'], 0)
+        self.assertDictEqual(snapshot['retries'], {'429': 1})
+        self.assertDictEqual(snapshot['fallbacks'], {'rating': 4})
+        self.assertTrue(snapshots)
+        with open(prom_path) as f:
+            self.assertIn('sfdc_permission_job_retries_total{stage="test",job_id="job",code="429"} 1', f.read())
+
+    def test_dead_letter_retry_pass(self):
+        """Test that failed records are dead-lettered and merged back after a retry pass"""
+        failures = {'ApiEnabled': 2}
+        def evaluate(record):
+            if failures.get(record['API Name'], 0) > 0:
+                failures[record['API Name']] -= 1
+                raise TimeoutError('timed out')
+            return {'Test Rating': 'LOW', 'Evaluation': '{}'}
+
+        job = self._make_job(evaluate, retry_failed=True, retry_attempts=2)
+        entries = []
+        original_retry = job.retry_dead_letters
+        def retry_dead_letters(**kwargs):
+            entries.extend(job.dead_letters.pending())
+            return original_retry(initial_delay=0, **kwargs)
+        job.retry_dead_letters = retry_dead_letters
+        results_df = job.run()
+
+        self.assertEqual(entries[0]['error_class'], 'TimeoutError')
+        self.assertEqual(entries[0]['attempts'], 1)
+        self.assertEqual(results_df.iloc[2]['Test Rating'], 'LOW')
+        self.assertEqual(len(job.dead_letters), 0)
+        saved_df = pd.read_csv(job.results_file)
+        self.assertEqual(saved_df.iloc[2]['Test Rating'], 'LOW')
+
+    def test_dead_letter_retry_matches_positions(self):
+        """Test that retried rows replace their own error rows when API Names repeat"""
+        input_df = pd.DataFrame({
+            'Permission Name': ['API Enabled', 'API Enabled', 'View All Data'],
+            'API Name': ['ApiEnabled', 'ApiEnabled', 'ViewAllData'],
+            'Description': ['first', 'second', 'View all data']
+        })
+        attempted = set()
+        def evaluate(record):
+            if record['API Name'] == 'ApiEnabled' and record['Description'] not in attempted:
+                attempted.add(record['Description'])
+                raise TimeoutError('timed out')
+            return {'Test Rating': record['Description'], 'Evaluation': '{}'}
+
+        job = self._make_job(evaluate, input_df=input_df, retry_failed=True, retry_attempts=1)
+        results_df = job.run()
+
+        self.assertListEqual(list(results_df['Test Rating']), ['first', 'second', 'View all data'])
+        saved_df = pd.read_csv(job.results_file)
+        self.assertListEqual(list(saved_df['Test Rating']), ['first', 'second', 'View all data'])
+
+    def test_dead_letter_resolved_on_resume(self):
+        """Test that a failure evaluated successfully after a resume is not retried again"""
+        class Interrupted(BaseException):
+            pass
+
+        def failing(record):
+            if record['API Name'] == 'ApiEnabled':
+                raise TimeoutError('timed out')
+            if record['API Name'] == 'ExportReport':
+                raise Interrupted()
+            return {'Test Rating': 'LOW', 'Evaluation': '{}'}
+
+        stream = self._make_job(failing, checkpoint_interval=1).stream(batch_size=2)
+        next(stream)
+        # 'ApiEnabled' fails and waits in the unyielded second batch when the stop hits
+        with self.assertRaises(Interrupted):
+            next(stream)
+        self.assertEqual(len(self._make_job(failing).dead_letters), 1)
+
+        calls = []
+        def evaluate(record):
+            calls.append(record['API Name'])
+            return {'Test Rating': 'LOW', 'Evaluation': '{}'}
+
+        job = self._make_job(evaluate, resume_from_checkpoint=True, retry_failed=True)
+        results_df = job.run()
+
+        self.assertListEqual(calls, ['ApiEnabled', 'ExportReport'])
+        self.assertListEqual(list(results_df['Test Rating']), ['LOW'] * 4)
+        self.assertEqual(len(job.dead_letters), 0)
+        self.assertEqual(len(self._make_job(evaluate).dead_letters), 0)
+
+    def test_concurrent_results_keep_order(self):
+        """Test that concurrent evaluations are yielded in processing order"""
+        import time
+        def evaluate(record):
+            time.sleep(0.05 if record['API Name'] == 'ViewAllData' else 0)
+            return {'Test Rating': 'LOW', 'Evaluation': record['API Name']}
+
+        rows = list(self._make_job(evaluate, concurrency=4).stream())
+        self.assertListEqual([row['Evaluation'] for row in rows], list(self.input_df['API Name']))
+
+    def test_aimd_controller(self):
+        """Test additive increase on healthy calls and multiplicative decrease on throttling"""
+        controller = AIMDController(initial_limit=4, max_limit=8, cooldown=0, min_samples=2)
+        for _ in range(4):
+            controller.on_success(1.0)
+        self.assertEqual(controller.limit, 5)
+
+        controller.record_event('retry', code=429)
+        self.assertEqual(controller.limit, 2)
+
+        controller.on_success(10.0)
+        self.assertEqual(controller.limit, 1)
+        self.assertEqual(controller.latency_spikes, 1)
+
+    def test_chunked_file_input(self):
+        """Test that a CSV input is processed chunk by chunk and can be resumed"""
+        input_path = os.path.join(self.tmp_dir.name, 'input.csv')
+        self.input_df.drop(columns=['Description']).to_csv(input_path, index=False)
+        evaluate = lambda record: {'Test Rating': 'LOW', 'Evaluation': record['Description']}
+
+        job = self._make_job(evaluate, input_df=input_path, chunksize=3, input_defaults={'Description': 'Not provided'})
+        stream = job.stream()
+        self.assertEqual(job.total_records, 4)
+        next(stream)
+        stream.close()
+
+        job = self._make_job(
+            evaluate, input_df=input_path, chunksize=3,
+            input_defaults={'Description': 'Not provided'}, resume_from_checkpoint=True
+        )
+        results_df = job.run()
+        self.assertListEqual(list(results_df['API Name']), list(self.input_df['API Name']))
+        self.assertTrue((results_df['Evaluation'] == 'Not provided').all())
+
+    def test_parquet_checkpoints(self):
+        """Test that Parquet results keep enum columns categorical and resume correctly"""
+        evaluate = lambda record: {'Test Rating': RiskRating.RESTRICTED, 'Evaluation': '{}'}
+        stream = self._make_job(evaluate, checkpoint_interval=1, checkpoint_format='parquet').stream()
+        next(stream)
+        next(stream)
+        stream.close()
+
+        job = self._make_job(evaluate, checkpoint_format='parquet', resume_from_checkpoint=True)
+        results_df = job.run()
+        self.assertListEqual(list(results_df['API Name']), list(self.input_df['API Name']))
+
+        saved_df = pd.read_parquet(job.results_file)
+        self.assertEqual(len(saved_df), 4)
+        self.assertIsInstance(saved_df['Test Rating'].dtype, pd.CategoricalDtype)
+        self.assertEqual(saved_df['Test Rating'].iloc[0], str(RiskRating.RESTRICTED))
+
+    def test_enum_codes_option(self):
+        """Test that rating columns are checkpointed as integer codes"""
+        def evaluate(record):
+            if record['API Name'] == 'ApiEnabled':
+                raise RuntimeError('boom')
+            return {'Test Rating': RiskRating.RESTRICTED, 'Evaluation': '{}'}
+
+        job = self._make_job(evaluate, enum_codes={'Test Rating': RiskRating}, checkpoint_interval=1)
+        results_df = job.run()
+        self.assertListEqual(results_df['Test Rating'].astype(int).tolist(), [4, 4, -1, 4])
+        saved_df = pd.read_csv(job.results_file)
+        self.assertListEqual(saved_df['Test Rating'].tolist(), [4, 4, -1, 4])
+
+    def test_blob_store_option(self):
+        """Test that evaluations are stored as blob references and errors stay inline"""
+        def evaluate(record):
+            if record['API Name'] == 'ApiEnabled':
+                raise RuntimeError('boom')
+            return {'Test Rating': 'LOW', 'Evaluation': f"Long evaluation of {record['API Name']}"}
+
+        store = BlobStore(os.path.join(self.tmp_dir.name, 'blobs'))
+        results_df = self._make_job(evaluate, blob_store=store).run()
+        self.assertTrue(results_df.iloc[0]['Evaluation'].startswith('blob:sha256:'))
+        self.assertEqual(results_df.iloc[2]['Evaluation'], 'Error: boom')
+        self.assertEqual(resolve_blobs(results_df, store).iloc[0]['Evaluation'], 'Long evaluation of ViewAllData')
+
+    def test_arrow_input(self):
+        """Test that an Arrow IPC input file is read in chunks"""
+        input_path = os.path.join(self.tmp_dir.name, 'input.arrow')
+        write_columnar(self.input_df, input_path, format='arrow')
+        evaluate = lambda record: {'Test Rating': 'LOW', 'Evaluation': record['API Name']}
+
+        job = self._make_job(evaluate, input_df=input_path, chunksize=3)
+        self.assertEqual(job.total_records, 4)
+        results_df = job.run()
+        self.assertListEqual(list(results_df['Evaluation']), list(self.input_df['API Name']))
+
+if __name__ == '__main__':
+    unittest.main()
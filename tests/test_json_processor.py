@@ -0,0 +1,86 @@
+import unittest
+import json
+import os
+import tempfile
+import pandas as pd
+from src.processing.json_processor import extract_json_fields, extract_json_fields_from_file
+from src.processing.eval_schemas import STAGE_SCHEMAS, get_schema, extract_typed_fields
+
+class TestJsonProcessor(unittest.TestCase):
+    def test_extract_json_fields(self):
+        """Test bulk extraction of fenced JSON, nested values and bad rows"""
+        df = pd.DataFrame({
+            'API Name': ['ViewAllData', 'ApiEnabled', 'ExportReport'],
+            'Evaluation': [
+                '```json\n{"risk_rating_tier": "Restricted", "weighted_score": 4.1, "scores": {"Auditability": 2}}\n```',
+                'Error: boom',
+                None
+            ]
+        })
+        results_df = extract_json_fields(df, debug=False)
+
+        self.assertEqual(results_df.iloc[0]['Risk Rating Tier'], 'Restricted')
+        self.assertEqual(results_df.iloc[0]['Weighted Score'], 4.1)
+        self.assertEqual(results_df.iloc[0]['Scores'], "{'Auditability': 2}")
+        self.assertEqual(results_df.iloc[0]['Confidence'], '')
+        self.assertIsNone(results_df.iloc[1]['Risk Rating Tier'])
+        self.assertIsNone(results_df.iloc[2]['Rationale'])
+        self.assertTrue(results_df.iloc[0]['Evaluation'].startswith('{'))
+
+    def test_schemas_match_templates(self):
+        """Test that every schema field is documented in its prompt template"""
+        for stage, stage_schema in STAGE_SCHEMAS.items():
+            schema = get_schema(stage)
+            self.assertSetEqual(set(stage_schema['fields']), set(schema['keys']) - {'scores'}, stage)
+            self.assertTrue(schema['scores'], stage)
+
+    def test_extract_typed_fields(self):
+        """Test typed columns, exploded scores and schema errors"""
+        valid = {
+            'risk_rating_tier': 'Restricted', 'risk_rating_score': '4', 'weighted_score': 3.9,
+            'scores': {criterion: 4 for criterion in get_schema('risk')['scores']},
+            'rationale': 'Broad access.', 'confidence': 'high'
+        }
+        invalid = dict(valid, risk_rating_tier='Severe', weighted_score='n/a')
+        invalid['scores'] = dict(valid['scores'], Auditability=9)
+        df = pd.DataFrame({'Evaluation': [
+            '```json\n' + json.dumps(valid) + '\n```', json.dumps(invalid), 'Error: boom'
+        ]})
+        typed_df = extract_typed_fields(df, 'risk')
+
+        self.assertEqual(typed_df['Weighted Score'].dtype, 'float64')
+        self.assertEqual(typed_df['Data_Sensitivity'].dtype, 'float64')
+        self.assertEqual(typed_df['Risk Rating Score'].iloc[0], 4)
+        self.assertEqual(typed_df['Confidence'].iloc[0], 'High')
+        self.assertTrue(typed_df['Risk Rating Tier'].cat.ordered)
+        self.assertEqual(typed_df['Schema Errors'].iloc[0], '')
+        self.assertIn('invalid risk_rating_tier', typed_df['Schema Errors'].iloc[1])
+        self.assertIn('invalid score Auditability', typed_df['Schema Errors'].iloc[1])
+        self.assertTrue(pd.isna(typed_df['Auditability'].iloc[1]))
+        self.assertEqual(typed_df['Schema Errors'].iloc[2], 'invalid JSON')
+        self.assertAlmostEqual(typed_df['Data_Sensitivity'].mean(), 4.0)
+
+    def test_extract_json_fields_from_file(self):
+        """Test chunked extraction to CSV, JSON Lines and Parquet in input order"""
+        df = pd.DataFrame({
+            'API Name': [f'Permission{i}' for i in range(7)],
+            'Evaluation': [json.dumps({'weighted_score': i, 'scores': {'Auditability': i}}) for i in range(6)] + ['bad']
+        })
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            input_path = os.path.join(tmp_dir, 'results.jsonl')
+            df.to_json(input_path, orient='records', lines=True)
+            for output_name, max_workers in (('out.csv', 1), ('out.jsonl', 1), ('out.parquet', 2)):
+                output_path = os.path.join(tmp_dir, output_name)
+                rows = extract_json_fields_from_file(input_path, output_path, chunksize=3, max_workers=max_workers)
+                self.assertEqual(rows, 7)
+                if output_name.endswith('.csv'):
+                    out_df = pd.read_csv(output_path)
+                elif output_name.endswith('.jsonl'):
+                    out_df = pd.read_json(output_path, lines=True)
+                else:
+                    out_df = pd.read_parquet(output_path)
+                self.assertListEqual(list(out_df['API Name']), list(df['API Name']), output_name)
+                self.assertEqual(float(out_df['Weighted Score'].iloc[5]), 5.0, output_name)
+
+if __name__ == '__main__':
+    unittest.main()
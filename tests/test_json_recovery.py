@@ -0,0 +1,40 @@
+import unittest
+from src.processing.json_recovery import recover_json, repair_json_text
+
+class TestJsonRecovery(unittest.TestCase):
+    def test_valid_json_needs_no_repairs(self):
+        """Test that well-formed fenced JSON is parsed directly"""
+        value, repairs = recover_json('```json\n{"confidence": "High"}\n```')
+        self.assertDictEqual(value, {'confidence': 'High'})
+        self.assertListEqual(repairs, ['stripped code fences'])
+
+    def test_repairs(self):
+        """Test recovery of common model output defects"""
+        text = (
+            'Here is the evaluation:\n'
+            '{\n  "rationale": "First line.\nSecond line.",\n'
+            '  “confidence”: “High”,\n'
+            '  "scores": {"Auditability": 3, "Reversibility": 2,},\n}\n'
+            'Let me know if you need more.'
+        )
+        value, repairs = recover_json(text)
+        self.assertEqual(value['rationale'], 'First line.\nSecond line.')
+        self.assertEqual(value['confidence'], 'High')
+        self.assertDictEqual(value['scores'], {'Auditability': 3, 'Reversibility': 2})
+        for repair in ('dropped text before object', 'escaped control characters in strings',
+                       'replaced smart quotes', 'removed trailing commas', 'dropped text after object'):
+            self.assertIn(repair, repairs)
+
+    def test_truncated_object(self):
+        """Test that output cut off mid-string is closed"""
+        value, repairs = recover_json('{"risk_rating_tier": "Sensitive", "rationale": "The permission gra')
+        self.assertEqual(value['risk_rating_tier'], 'Sensitive')
+        self.assertIn('closed truncated object', repairs)
+
+    def test_unrecoverable(self):
+        """Test that text without an object is reported as unrecoverable"""
+        self.assertEqual(recover_json('Error: boom'), (None, []))
+        self.assertIsNone(repair_json_text('no json here')[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from src.scraping.metadata_scraper import find_metadata_files, iter_user_permissions, extract_metadata_permissions
+
+_PERMISSION_SET = '''<?xml version="1.0" encoding="UTF-8"?>
+<PermissionSet xmlns="http://soap.sforce.com/2006/04/metadata">
+    <fieldPermissions>
+        <editable>true</editable>
+        <field>Account.Rating</field>
+        <readable>true</readable>
+    </fieldPermissions>
+    <hasActivationRequired>false</hasActivationRequired>
+    <label>Sales Operations</label>
+    <userPermissions>
+        <enabled>true</enabled>
+        <name>ApiEnabled</name>
+    </userPermissions>
+    <userPermissions>
+        <enabled>true</enabled>
+        <name>ManageUsers</name>
+    </userPermissions>
+</PermissionSet>
+'''
+
+_PROFILE = '''<?xml version="1.0" encoding="UTF-8"?>
+<Profile xmlns="http://soap.sforce.com/2006/04/metadata">
+    <custom>false</custom>
+    <userPermissions>
+        <enabled>true</enabled>
+        <name>ApiEnabled</name>
+    </userPermissions>
+    <userPermissions>
+        <enabled>false</enabled>
+        <name>ViewSetup</name>
+    </userPermissions>
+</Profile>
+'''
+
+class TestMetadataScraper(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        for folder, name, content in [
+            ('permissionsets', 'Sales_Ops.permissionset-meta.xml', _PERMISSION_SET),
+            ('profiles', 'Admin.profile-meta.xml', _PROFILE),
+            ('classes', 'Helper.cls-meta.xml', '<ApexClass/>')
+        ]:
+            os.makedirs(os.path.join(self.tmp_dir.name, folder), exist_ok=True)
+            with open(os.path.join(self.tmp_dir.name, folder, name), 'w', encoding='utf-8') as f:
+                f.write(content)
+        self.paths = find_metadata_files(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_find_metadata_files(self):
+        """Test that only permission set and profile files are found"""
+        self.assertListEqual([os.path.basename(path) for path in self.paths],
+                             ['Sales_Ops.permissionset-meta.xml', 'Admin.profile-meta.xml'])
+
+    def test_iter_user_permissions(self):
+        """Test streaming the userPermissions entries of a permission set"""
+        entries = list(iter_user_permissions(self.paths[0]))
+
+        self.assertListEqual([entry['API Name'] for entry in entries], ['ApiEnabled', 'ManageUsers'])
+        self.assertEqual(entries[0]['Permission Set'], 'Sales_Ops')
+        self.assertEqual(entries[0]['Permission Set Label'], 'Sales Operations')
+        self.assertEqual(entries[0]['Permission Set Type'], 'PermissionSet')
+
+    def test_extract_metadata_permissions(self):
+        """Test membership rows with details filled from reference data"""
+        reference_df = pd.DataFrame({
+            'Permission Name': ['API Enabled'],
+            'API Name': ['apienabled'],
+            'Permission Requirement': [None],
+            'Description': ['Access Salesforce through the API.']
+        })
+        df = extract_metadata_permissions(self.paths, reference_df=reference_df)
+
+        self.assertEqual(len(df), 3)
+        self.assertNotIn('ViewSetup', set(df['API Name']))
+        api_rows = df[df['API Name'] == 'ApiEnabled']
+        self.assertListEqual(sorted(api_rows['Permission Set']), ['Admin', 'Sales_Ops'])
+        self.assertTrue((api_rows['Permission Name'] == 'API Enabled').all())
+        self.assertEqual(df[df['API Name'] == 'ManageUsers'].iloc[0]['Permission Name'], 'ManageUsers')
+
+        with_disabled = extract_metadata_permissions(self.paths, include_disabled=True)
+        self.assertEqual(len(with_disabled), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import base64
+import quopri
+import tempfile
+import unittest
+
+import pandas as pd
+
+from src.scraping.mhtml_reader import iter_html_text, read_html_text
+from src.scraping.permission_scraper import scrape_permissions_from_file, extract_permissions_from_files, extract_permission_data
+
+_HTML = (
+    '<html><head><meta charset="utf-8"></head><body><table>\r\n'
+    '<tr><td><label class="permRowLabel">Manage Café Settings</label>'
+    '<a name="ManageCafeSettings"></a>'
+    '<div class="mouseOverInfo"><div class="body">Requires "View Setup and Configuration" '
+    'and a very long requirement text that the encoder has to wrap with soft line breaks</div></div></td>'
+    '<td><span class="permRowLabel">Allows users to manage café settings.</span></td></tr>\r\n'
+    '</table></body></html>'
+)
+
+def _mhtml(html: str, transfer_encoding: str) -> bytes:
+    """Builds an MHTML archive like the browser saves, with a stylesheet part after the page."""
+    data = html.encode('utf-8')
+    if transfer_encoding == 'quoted-printable':
+        # Hard line breaks become CRLF line ends of the encoded body
+        body = quopri.encodestring(data.replace(b'\r\n', b'\n')).replace(b'\n', b'\r\n')
+    else:
+        body = base64.encodebytes(data).replace(b'\n', b'\r\n')
+    boundary = b'----MultipartBoundary--abc123----'
+    return b''.join([
+        b'From: <Saved by Blink>\r\n',
+        b'Subject: Permission Sets\r\n',
+        b'MIME-Version: 1.0\r\n',
+        b'Content-Type: multipart/related;\r\n',
+        b'\ttype="text/html";\r\n',
+        b'\tboundary="' + boundary + b'"\r\n',
+        b'\r\n\r\n',
+        b'--' + boundary + b'\r\n',
+        b'Content-Type: text/html\r\n',
+        b'Content-ID: <frame-1@mhtml.blink>\r\n',
+        b'Content-Transfer-Encoding: ' + transfer_encoding.encode('ascii') + b'\r\n',
+        b'Content-Location: https://example.my.salesforce.com/setup\r\n',
+        b'\r\n',
+        body,
+        b'\r\n--' + boundary + b'\r\n',
+        b'Content-Type: text/css\r\n',
+        b'Content-Transfer-Encoding: quoted-printable\r\n',
+        b'\r\n',
+        b'.permRowLabel { color: red; }\r\n',
+        b'--' + boundary + b'--\r\n'
+    ])
+
+class TestMhtmlReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def test_decodes_html_part(self):
+        """Test that quoted-printable and base64 HTML parts decode to the original page"""
+        expected = _HTML.replace('\r\n', '\n')
+        for encoding in ('quoted-printable', 'base64'):
+            path = self._write(f'page_{encoding}.mhtml', _mhtml(_HTML, encoding))
+            self.assertEqual(read_html_text(path), expected)
+            self.assertEqual(''.join(iter_html_text(path, chunk_size=16)), expected)
+
+    def test_plain_html(self):
+        """Test that plain HTML files are read unchanged"""
+        path = self._write('page.html', _HTML.encode('utf-8'))
+        self.assertEqual(read_html_text(path), _HTML.replace('\r\n', '\n'))
+
+    def test_scrape_mhtml(self):
+        """Test that API names and texts come out of an MHTML export without artifacts"""
+        path = self._write('perms.mhtml', _mhtml(_HTML, 'quoted-printable'))
+        df = scrape_permissions_from_file([path], output_path=os.path.join(self.tmp_dir.name, 'out.csv'))
+
+        self.assertEqual(len(df), 1)
+        self.assertEqual(df.iloc[0]['Permission Name'], 'Manage Café Settings')
+        self.assertEqual(df.iloc[0]['API Name'], 'ManageCafeSettings')
+        self.assertTrue(df.iloc[0]['Permission Requirement'].endswith('wrap with soft line breaks'))
+        self.assertNotIn('=', df.iloc[0]['Permission Requirement'])
+
+    def test_extract_raw_text(self):
+        """Test that raw quoted-printable text and archive text passed as strings are decoded"""
+        qp_text = quopri.encodestring(_HTML.replace('\r\n', '\n').encode('utf-8')).decode('ascii')
+        self.assertIn('=3D"', qp_text)
+        archive_text = _mhtml(_HTML, 'quoted-printable').decode('utf-8').replace('\r\n', '\n')
+
+        for raw_text in (qp_text, archive_text):
+            df = extract_permission_data(raw_text)
+            self.assertEqual(len(df), 1)
+            self.assertEqual(df.iloc[0]['Permission Name'], 'Manage Café Settings')
+            self.assertEqual(df.iloc[0]['API Name'], 'ManageCafeSettings')
+            self.assertTrue(df.iloc[0]['Permission Requirement'].endswith('wrap with soft line breaks'))
+            self.assertNotIn('=', df.iloc[0]['Permission Requirement'])
+
+    def test_parallel_matches_serial(self):
+        """Test that parsing files in a process pool returns the serial results in input order"""
+        paths = [
+            self._write(f'org{i}.mhtml', _mhtml(_HTML.replace('Café', f'Café {i}'), 'quoted-printable'))
+            for i in range(3)
+        ]
+        serial = extract_permissions_from_files(paths)
+        parallel = extract_permissions_from_files(paths, max_workers=2)
+
+        self.assertEqual(len(parallel), 3)
+        for serial_df, parallel_df in zip(serial, parallel):
+            pd.testing.assert_frame_equal(serial_df, parallel_df)
+        self.assertEqual(parallel[2].iloc[0]['Permission Name'], 'Manage Café 2 Settings')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+import pandas as pd
+
+from src.scraping.permission_catalog import (
+    build_permission_catalog, build_permission_provenance, org_id_from_path
+)
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=['Permission Name', 'API Name', 'Permission Requirement', 'Description'])
+
+class TestPermissionCatalog(unittest.TestCase):
+    def setUp(self):
+        self.frames = [
+            _frame([
+                ('Label', None, None, None),
+                ('Manage Users', 'ManageUsers', None, 'Create  and edit users.'),
+                ('View Setup', 'ViewSetup', 'Requires login', 'See setup.')
+            ]),
+            _frame([
+                ('View Setup', 'ViewSetup', None, 'See setup and configuration.'),
+                ('Manage Users', 'manageusers ', None, 'Create and edit users.')
+            ]),
+            _frame([
+                ('View Setup', 'ViewSetup', None, 'See setup and configuration.'),
+                ('Api Enabled', 'ApiEnabled', None, None)
+            ])
+        ]
+        self.orgs = ['00DgK000001iK7J', '00DHu000002irdp', '00DXX000003abcd']
+
+    def test_one_row_per_api_name(self):
+        """Test that permissions differing only in case, whitespace or text merge into one row"""
+        catalog = build_permission_catalog(self.frames, self.orgs)
+
+        self.assertListEqual(list(catalog['API Name']), ['ManageUsers', 'ViewSetup', 'ApiEnabled'])
+        manage_users = catalog.iloc[0]
+        self.assertEqual(manage_users['Orgs'], '00DHu000002irdp;00DgK000001iK7J')
+        self.assertEqual(manage_users['Org Count'], 2)
+        # Whitespace differences are not variants
+        self.assertEqual(manage_users['Description Variants'], 1)
+
+    def test_canonical_description(self):
+        """Test that the description of the most rows wins and the others are counted as variants"""
+        catalog = build_permission_catalog(self.frames, self.orgs).set_index('API Name')
+
+        self.assertEqual(catalog.loc['ViewSetup', 'Description'], 'See setup and configuration.')
+        self.assertEqual(catalog.loc['ViewSetup', 'Description Variants'], 2)
+        self.assertEqual(catalog.loc['ApiEnabled', 'Description Variants'], 0)
+
+    def test_provenance(self):
+        """Test that provenance keeps one row per permission, org and description variant"""
+        provenance = build_permission_provenance(self.frames, self.orgs)
+
+        view_setup = provenance[provenance['API Key'] == 'viewsetup']
+        self.assertEqual(len(view_setup), 3)
+        self.assertEqual(view_setup['Description Hash'].nunique(), 2)
+        self.assertIsInstance(provenance['Description'].dtype, pd.CategoricalDtype)
+
+    def test_org_id_from_path(self):
+        """Test reading org IDs from export file names"""
+        self.assertEqual(
+            org_id_from_path('data/raw/perm_sets_app_perms_salesforce_00DgK000001iK7J.mhtml'), '00DgK000001iK7J'
+        )
+        self.assertEqual(org_id_from_path('data/raw/sandbox_perms.mhtml'), 'sandbox_perms')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,12 @@ from bs4 import BeautifulSoup
 import os
 from src.scraping.permission_scraper import extract_permission_data, clean_permission_data
 
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
 class TestPermissionScraper(unittest.TestCase):
     def setUp(self):
         # Sample HTML content matching actual Salesforce structure
@@ -60,6 +66,27 @@ class TestPermissionScraper(unittest.TestCase):
         csv_df = pd.read_csv(output_path)
         pd.testing.assert_frame_equal(df, csv_df)
 
+    @unittest.skipUnless(HAS_LXML, "lxml is not installed")
+    def test_lxml_backend_matches_html_parser(self):
+        """Test that the lxml backend returns the same rows as html.parser"""
+        html = self.sample_html.replace(
+            '<label class="permRowLabel">Manage Auth. Providers</label>',
+            '<label class="permRowLabel">Manage <b>Auth.</b> Providers</label>'
+            '<a name="ManageAuthProviders"></a>'
+            '<div class="mouseOverInfo"><div class="body">Requires &quot;View Setup&quot;<!-- note --></div></div>'
+        )
+        expected = extract_permission_data(html, parser='html.parser')
+        actual = extract_permission_data(html, parser='lxml')
+
+        pd.testing.assert_frame_equal(actual, expected)
+        self.assertEqual(actual.iloc[1]['API Name'], 'ManageAuthProviders')
+        self.assertEqual(actual.iloc[1]['Permission Requirement'], 'Requires "View Setup"')
+
+    def test_unknown_parser(self):
+        """Test that an unsupported parser backend is rejected"""
+        with self.assertRaises(ValueError):
+            extract_permission_data(self.sample_html, parser='html5lib')
+
     def test_clean_permission_data(self):
         """Test cleaning of permission data"""
         # Create test DataFrame with duplicates
@@ -0,0 +1,116 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.assignment_engine import AssignmentEngine
+from src.analysis.risk_rollup import (
+    RiskRollup, compute_weighted_scores, parse_criterion_weights, parse_score_tiers, score_ratings
+)
+
+_CRITERIA = ['Data_Sensitivity', 'Scope_of_Impact', 'Configurational_Authority', 'External_Data_Exposure',
+             'Regulatory_Obligation', 'Segregation_of_Duties', 'Auditability', 'Reversibility']
+
+def _risk_df(scores: dict) -> pd.DataFrame:
+    return pd.DataFrame(
+        [[api_name] + list(values) for api_name, values in scores.items()],
+        columns=['API Name'] + _CRITERIA
+    )
+
+class TestRiskScoring(unittest.TestCase):
+    def test_template_tables(self):
+        """Test that the weights and rubric are read from the risk template"""
+        weights = parse_criterion_weights()
+        self.assertListEqual(list(weights.index), _CRITERIA)
+        self.assertAlmostEqual(weights['Data_Sensitivity'], 0.25)
+        self.assertAlmostEqual(weights.sum(), 1.0)
+
+        tiers = parse_score_tiers()
+        self.assertListEqual(list(tiers['Lower Bound']), [1.0, 1.5, 2.5, 3.5, 4.5])
+        self.assertListEqual(list(tiers['Risk Rating Tier']), ['General', 'Controlled', 'Sensitive', 'Restricted', 'Mission Critical'])
+
+    def test_weighted_scores(self):
+        """Test the local weighted score, rounding and rubric mapping"""
+        risk_df = _risk_df({
+            'ModifyAllData': [5, 5, 4, 5, 5, 5, 3, 4],
+            'ViewSetup': [1, 1, 1, 1, 1, 1, 1, 1],
+            'Partial': [4, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, 2]
+        })
+        local_df = compute_weighted_scores(risk_df)
+        # 0.25*5 + 0.2*5 + 0.15*4 + 0.1*(5+5+5) + 0.05*(3+4) = 4.7
+        self.assertListEqual(list(local_df['Weighted Score']), [4.7, 1.0, 3.7])
+        self.assertListEqual(list(local_df['Risk Rating Score']), [5, 1, 4])
+        self.assertListEqual(list(local_df['Risk Rating Tier']), ['Mission Critical', 'General', 'Restricted'])
+
+        # Only Auditability counts
+        weights = {criterion: 0.0 for criterion in _CRITERIA}
+        weights['Auditability'] = 2.0
+        np.testing.assert_array_equal(compute_weighted_scores(risk_df, weights)['Weighted Score'], [3.0, 1.0, np.nan])
+
+    def test_invalid_weights(self):
+        """Test that missing criteria and negative weights are rejected"""
+        risk_df = _risk_df({'ViewSetup': [1] * 8})
+        with self.assertRaises(ValueError):
+            compute_weighted_scores(risk_df.drop(columns=['Auditability']))
+        with self.assertRaises(ValueError):
+            compute_weighted_scores(risk_df, {'Data_Sensitivity': -1.0})
+
+    def test_score_ratings_below_rubric(self):
+        """Test that scores below the rubric stay missing"""
+        ratings = score_ratings(pd.Series([0.5, 4.5, np.nan]))
+        self.assertTrue(pd.isna(ratings['Risk Rating Score'][0]))
+        self.assertEqual(ratings['Risk Rating Score'][1], 5)
+        self.assertTrue(pd.isna(ratings['Risk Rating Tier'][2]))
+
+class TestRiskRollup(unittest.TestCase):
+    def setUp(self):
+        membership = pd.DataFrame({
+            'Permission Set': ['Admin', 'Admin', 'Admin', 'Helpdesk', 'Viewer'],
+            'API Name': ['ModifyAllData', 'ManageUsers', 'ViewSetup', 'ResetPasswords', 'Unscored']
+        })
+        assignments = pd.DataFrame({
+            'User': ['alice', 'bob', 'bob', 'carol'],
+            'Permission Set': ['Admin', 'Helpdesk', 'Viewer', 'Viewer']
+        })
+        self.engine = AssignmentEngine.from_frames(assignments, membership)
+        self.risk_df = _risk_df({
+            'modifyalldata': [5] * 8,
+            'ManageUsers': [4] * 8,
+            'ViewSetup': [1] * 8,
+            'ResetPasswords': [3] * 8
+        })
+
+    def test_rollups(self):
+        """Test max, sum and top-k per permission set and per user"""
+        rollup = RiskRollup(self.engine, self.risk_df)
+        sets = rollup.set_rollup(top_k=2)
+        self.assertEqual(sets.loc['Admin', 'Max Score'], 5.0)
+        self.assertEqual(sets.loc['Admin', 'Max Permission'], 'ModifyAllData')
+        self.assertEqual(sets.loc['Admin', 'Score Sum'], 10.0)
+        self.assertEqual(sets.loc['Admin', 'Top 2 Mean'], 4.5)
+        self.assertEqual(sets.loc['Admin', 'Max Risk Rating Tier'], 'Mission Critical')
+        self.assertEqual(sets.loc['Viewer', 'Scored Permissions'], 0)
+        self.assertTrue(np.isnan(sets.loc['Viewer', 'Max Score']))
+
+        users = rollup.user_rollup(top_k=2, block_size=1)
+        self.assertEqual(users.loc['bob', 'Max Score'], 3.0)
+        self.assertEqual(users.loc['bob', 'Top 2 Mean'], 3.0)
+        self.assertEqual(users.loc['alice', 'Scored Permissions'], 3)
+
+    def test_what_if_weights(self):
+        """Test that re-weighting re-scores without re-aligning the results"""
+        risk_df = self.risk_df.copy()
+        risk_df.loc[risk_df['API Name'] == 'ResetPasswords', 'External_Data_Exposure'] = 5
+        rollup = RiskRollup(self.engine, risk_df)
+        before = rollup.permission_risk().loc['ResetPasswords', 'Weighted Score']
+
+        weights = dict(rollup.weights, External_Data_Exposure=1.0)
+        what_if = rollup.with_weights(weights)
+        after = what_if.permission_risk().loc['ResetPasswords', 'Weighted Score']
+        self.assertEqual(before, 3.2)
+        self.assertGreater(after, before)
+        self.assertEqual(rollup.permission_risk().loc['ResetPasswords', 'Weighted Score'], before)
+        self.assertEqual(what_if.user_rollup().loc['bob', 'Max Score'], after)
+
+if __name__ == '__main__':
+    unittest.main()
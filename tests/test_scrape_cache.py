@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from src.scraping import permission_scraper
+from src.scraping.scrape_cache import ScrapeCache
+from src.scraping.permission_scraper import extract_permissions_from_files
+
+_HTML = '''<html><body><table>
+<tr><td><label>Manage Users</label><a name="ManageUsers"></a></td>
+<td><span>Create and edit users.</span></td></tr>
+<tr><td><label>View Setup</label></td><td></td></tr>
+</table></body></html>'''
+
+class TestScrapeCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, 'cache')
+        self.path = os.path.join(self.tmp_dir.name, 'perms.html')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(_HTML)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        """Test that cached rows load back as the same DataFrame"""
+        df = permission_scraper.extract_permission_data(_HTML)
+        cache = ScrapeCache(self.cache_dir, version='1')
+        digest = cache.file_digest(self.path)
+        self.assertIsNone(cache.get(digest))
+
+        cache.put(digest, df)
+        pd.testing.assert_frame_equal(cache.get(digest), df)
+        self.assertIsNone(ScrapeCache(self.cache_dir, version='2').get(digest))
+
+    def test_unchanged_files_are_not_parsed(self):
+        """Test that a second scrape loads unchanged files from the cache"""
+        first = extract_permissions_from_files([self.path], cache_dir=self.cache_dir)
+
+        with mock.patch.object(permission_scraper, '_extract_file') as extract_file:
+            second = extract_permissions_from_files([self.path], cache_dir=self.cache_dir)
+            extract_file.assert_not_called()
+        pd.testing.assert_frame_equal(second[0], first[0])
+
+        # A changed file is parsed again
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('\n')
+        with mock.patch.object(permission_scraper, '_extract_file', wraps=permission_scraper._extract_file) as extract_file:
+            extract_permissions_from_files([self.path], cache_dir=self.cache_dir)
+            extract_file.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
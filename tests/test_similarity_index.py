@@ -0,0 +1,76 @@
+import tempfile
+import unittest
+
+import pandas as pd
+
+from src.analysis.similarity_index import SimilarityIndex
+from src.llms.job_engine import ClassificationJob
+
+class TestSimilarityIndex(unittest.TestCase):
+    def setUp(self):
+        self.labeled_df = pd.DataFrame({
+            'Permission Name': ['Allows user access to Sales Console', 'Modify All Data', 'Export Reports', 'Broken'],
+            'API Name': ['AccessSalesConsole', 'ModifyAllData', 'ExportReport', 'Broken'],
+            'Description': ['Allows user access to the Sales Console app.',
+                            'Create, edit, and delete all organization data.',
+                            'Export reports to files.', 'Broken'],
+            'Risk Rating': ['2', '5', '3', 'ERROR'],
+            'Evaluation': ['{"a": 1}', '{"b": 2}', '{"c": 3}', 'Error: boom']
+        })
+        self.query_df = pd.DataFrame({
+            'Permission Name': ['Allows user access to Service Console', 'Manage Dashboards'],
+            'API Name': ['AccessServiceConsole', 'ManageDashboards'],
+            'Description': ['Allows user access to the Service Console app.', 'Create and edit dashboards.']
+        })
+
+    def test_nearest(self):
+        """Test that neighbors are ranked by similarity and error rows are not indexed"""
+        index = SimilarityIndex(self.labeled_df)
+        self.assertEqual(len(index), 3)
+
+        nearest = index.nearest(self.query_df, k=2, block_size=1)
+        self.assertEqual(len(nearest), 4)
+        first = nearest[(nearest['Query'] == 0) & (nearest['Rank'] == 1)].iloc[0]
+        self.assertEqual(first['Neighbor API Name'], 'AccessSalesConsole')
+        self.assertGreater(first['Similarity'], 0.5)
+        self.assertTrue((nearest.groupby('Query')['Similarity'].diff().dropna() <= 0).all())
+
+    def test_propagate(self):
+        """Test that only rows above the threshold take over the neighbor's result"""
+        index = SimilarityIndex(self.labeled_df)
+        reused_df, remaining_df = index.propagate(self.query_df, ['Risk Rating', 'Evaluation'], threshold=0.5)
+        self.assertListEqual(list(reused_df['API Name']), ['AccessServiceConsole'])
+        self.assertEqual(reused_df.iloc[0]['Risk Rating'], '2')
+        self.assertEqual(reused_df.iloc[0]['Reused From'], 'AccessSalesConsole')
+        self.assertListEqual(list(remaining_df['API Name']), ['ManageDashboards'])
+
+        self.assertIsNone(index.best_match(self.query_df.iloc[1], threshold=0.5))
+
+    def test_job_reuses_neighbor_results(self):
+        """Test that a classification job skips the model for near-duplicates"""
+        calls = []
+        def evaluate(record):
+            calls.append(record['API Name'])
+            return {'Risk Rating': '4', 'Evaluation': '{}'}
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            results_df = ClassificationJob(
+                input_df=self.query_df,
+                evaluate_record=evaluate,
+                stage='risk',
+                input_columns=['Permission Name', 'API Name', 'Description'],
+                result_columns=['Risk Rating', 'Evaluation'],
+                checkpoint_dir=tmp_dir,
+                job_id='job',
+                reuse_index=SimilarityIndex(self.labeled_df),
+                reuse_threshold=0.5,
+                debug=False
+            ).run()
+
+        self.assertListEqual(calls, ['ManageDashboards'])
+        self.assertListEqual(list(results_df['Risk Rating']), ['2', '4'])
+        self.assertEqual(results_df.iloc[0]['Reused From'], 'AccessSalesConsole')
+        self.assertTrue(pd.isna(results_df.iloc[1]['Reused From']))
+
+if __name__ == '__main__':
+    unittest.main()
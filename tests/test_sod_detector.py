@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.assignment_engine import AssignmentEngine
+from src.analysis.sod_detector import ConflictDetector, load_conflict_rules, seed_conflict_rules
+from src.llms.category_evaluator import CategoryLabel
+from src.llms.risk_evaluator import RiskRating
+
+class TestConflictDetector(unittest.TestCase):
+    def setUp(self):
+        membership = pd.DataFrame({
+            'Permission Set': ['Admin', 'Admin', 'Helpdesk', 'Data_Steward', 'Data_Steward'],
+            'API Name': ['ManageUsers', 'ModifyAllData', 'ResetPasswords', 'ModifyAllData', 'ExportReport']
+        })
+        assignments = pd.DataFrame({
+            'User': ['alice', 'bob', 'bob', 'carol', 'dave'],
+            'Permission Set': ['Admin', 'Helpdesk', 'Data_Steward', 'Data_Steward', 'Helpdesk']
+        })
+        self.engine = AssignmentEngine.from_frames(assignments, membership)
+        self.rules = {
+            'user admin + data admin': [['ManageUsers', 'ResetPasswords'], ['ModifyAllData', 'ViewAllData']]
+        }
+
+    def test_user_and_set_conflicts(self):
+        """Test that conflicts are found within one set and across assigned sets"""
+        detector = ConflictDetector(self.engine, self.rules)
+
+        users = detector.user_conflicts().set_index('User')
+        self.assertListEqual(sorted(users.index), ['alice', 'bob'])
+        self.assertEqual(users.loc['bob', 'Permissions'], 'ModifyAllData;ResetPasswords')
+
+        sets = detector.set_conflicts()
+        self.assertListEqual(list(sets['Permission Set']), ['Admin'])
+
+        summary = detector.rule_summary()
+        self.assertEqual(summary.loc['user admin + data admin', 'Users'], 2)
+        self.assertEqual(summary.loc['user admin + data admin', 'Permission Sets'], 1)
+
+    def test_matches_brute_force(self):
+        """Test the matrix products against a per-user check on random data"""
+        rng = np.random.default_rng(0)
+        membership = pd.DataFrame({
+            'Permission Set': [f"PS{i}" for i in rng.integers(0, 30, 300)],
+            'API Name': [f"Perm{i}" for i in rng.integers(0, 100, 300)]
+        })
+        assignments = pd.DataFrame({
+            'User': [f"U{i}" for i in rng.integers(0, 200, 600)],
+            'Permission Set': [f"PS{i}" for i in rng.integers(0, 30, 600)]
+        })
+        engine = AssignmentEngine.from_frames(assignments, membership)
+        rules = {
+            f"rule {k}": [[f"Perm{i}" for i in rng.integers(0, 100, 3)] for _ in range(3)]
+            for k in range(10)
+        }
+        found = ConflictDetector(engine, rules, min_sides=2).user_conflicts(block_size=32)
+
+        expected = set()
+        for user in engine.users:
+            held = set(engine.effective_permissions(user))
+            for name, sides in rules.items():
+                if sum(bool(held & set(side)) for side in sides) >= 2:
+                    expected.add((user, name))
+        self.assertSetEqual(set(zip(found['User'], found['Rule'])), expected)
+
+    def test_seed_conflict_rules(self):
+        """Test seeding rules from the high-risk list and classifications"""
+        category_df = pd.DataFrame({
+            'API Name': ['AuthorApex', 'CustomizeApplication', 'ViewSetup'],
+            'Category Label': [CategoryLabel.DEVELOPER, CategoryLabel.GENERAL_ADMIN, CategoryLabel.GENERAL_ADMIN]
+        })
+        risk_df = pd.DataFrame({
+            'API Name': ['AuthorApex', 'CustomizeApplication', 'ViewSetup'],
+            'Risk Rating': [RiskRating.MISSION_CRITICAL, RiskRating.RESTRICTED, RiskRating.GENERAL]
+        })
+        rules = seed_conflict_rules(category_df=category_df, risk_df=risk_df)
+
+        self.assertListEqual(rules['user administration + data administration'][0], ['ManageUsers', 'ResetPasswords'])
+        self.assertListEqual(rules['development + configuration'], [['AuthorApex'], ['CustomizeApplication', 'InstallPackaging']])
+
+    def test_load_conflict_rules(self):
+        """Test loading rules from YAML"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            rules_path = os.path.join(tmp_dir, 'rules.yml')
+            with open(rules_path, 'w') as f:
+                f.write("Manage users + modify all data:\n  - [ManageUsers, ResetPasswords]\n  - [ModifyAllData]\n")
+            rules = load_conflict_rules(rules_path)
+
+        self.assertDictEqual(rules, {'Manage users + modify all data': [['ManageUsers', 'ResetPasswords'], ['ModifyAllData']]})
+
+if __name__ == '__main__':
+    unittest.main()